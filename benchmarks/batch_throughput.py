@@ -0,0 +1,57 @@
+# Throughput of `MCDA_method.batch` compared with looping over `__call__`.
+#
+# Usage:
+#     python benchmarks/batch_throughput.py [n] [m]
+
+import sys
+from timeit import default_timer as timer
+
+import numpy as np
+from pymcdm import methods
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+m = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+batch_sizes = [1, 10, 100, 1000, 10000]
+
+rng = np.random.default_rng(0)
+types = np.array([1 if i % 2 == 0 else -1 for i in range(m)])
+bounds = np.array([np.zeros(m), np.ones(m) * 11]).T
+
+cases = [
+    ('TOPSIS', methods.TOPSIS(), (), {}),
+    ('VIKOR', methods.VIKOR(), (), {}),
+    ('COPRAS', methods.COPRAS(), (), {}),
+    ('PROMETHEE_II', methods.PROMETHEE_II('usual'), (), {}),
+    ('SPOTIS', methods.SPOTIS(), (bounds,), {}),
+    ('ARAS', methods.ARAS(), (), {}),
+    ('COCOSO', methods.COCOSO(), (), {}),
+    ('CODAS', methods.CODAS(), (), {}),
+    ('EDAS', methods.EDAS(), (), {}),
+    ('MABAC', methods.MABAC(), (), {}),
+    ('MAIRCA', methods.MAIRCA(), (), {}),
+    ('MARCOS', methods.MARCOS(), (), {}),
+    ('OCRA', methods.OCRA(), (), {}),
+    ('MOORA', methods.MOORA(), (), {}),
+]
+
+
+def best_of(f, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = timer()
+        f()
+        times.append(timer() - start)
+    return min(times)
+
+
+print(f'n = {n}, m = {m}; throughput in problems per second')
+print(f'{"method":>12} | {"B":>6} | {"loop":>12} | {"batch":>12} | {"speedup":>8}')
+for name, method, args, kwargs in cases:
+    for B in batch_sizes:
+        matrices = rng.uniform(1, 10, (B, n, m))
+        weights = rng.dirichlet(np.ones(m), B)
+
+        t_loop = best_of(lambda: [method(x, w, types, *args, **kwargs)
+                                  for x, w in zip(matrices, weights)])
+        t_batch = best_of(lambda: method.batch(matrices, weights, types, *args, **kwargs))
+        print(f'{name:>12} | {B:>6} | {B / t_loop:>12.0f} | {B / t_batch:>12.0f} | {t_loop / t_batch:>7.1f}x')
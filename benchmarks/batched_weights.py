@@ -0,0 +1,43 @@
+# Time of the weighting methods for a stack of B decision matrices with n
+# alternatives and m criteria, compared with calling the method for each matrix,
+# and of `multiple_weights` with all methods, compared with calling each method
+# on the stack separately.
+#
+# Usage:
+#     python benchmarks/batched_weights.py [B] [n] [m]
+
+import sys
+import time
+
+import numpy as np
+from pymcdm import weights
+
+B = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+n = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+m = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+rng = np.random.default_rng(0)
+matrices = rng.uniform(1, 10, (B, n, m))
+types = np.where(np.arange(m) % 2, -1, 1)
+# Single weighting functions and whether they need criteria types
+methods = {function: needs_types for function, (_, needs_types) in weights._KERNELS.items()}
+
+
+def measure(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+print(f'B = {B}, n = {n}, m = {m}, seconds')
+print(f'{"method":>26} | {"loop":>8} | {"stack":>8} | {"speedup":>7}')
+separately = 0
+for method, needs_types in methods.items():
+    args = (types,) if needs_types else ()
+    loop = measure(lambda: [method(matrix, *args) for matrix in matrices])
+    stack = measure(lambda: method(matrices, *args))
+    separately += stack
+    print(f'{method.__name__:>26} | {loop:>8.3f} | {stack:>8.3f} | {loop / stack:>6.1f}x')
+
+shared = measure(lambda: weights.multiple_weights(matrices, methods, types))
+print(f'{"all methods, shared":>26} | {separately:>8.3f} | {shared:>8.3f} | {separately / shared:>6.1f}x')
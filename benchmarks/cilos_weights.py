@@ -0,0 +1,51 @@
+# Time of `cilos_weights` for n alternatives and m criteria, compared with the
+# null space of the dense m x m matrix F found with SVD (`scipy.linalg.null_space`,
+# previous implementation), which is measured only for m up to `svd_limit`.
+#
+# Usage:
+#     python benchmarks/cilos_weights.py [n] [svd_limit]
+
+import sys
+import time
+
+import numpy as np
+from scipy.linalg import null_space
+from pymcdm import weights
+from pymcdm.normalizations import sum_normalization, normalize_matrix
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+svd_limit = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+rng = np.random.default_rng(0)
+
+
+def svd_cilos_weights(matrix, types):
+    # All criteria are profit in this benchmark
+    nmatrix = normalize_matrix(matrix, sum_normalization, None)
+    A = nmatrix[np.argmax(nmatrix, axis=0)]
+    P = (np.diag(A) - A) / np.diag(A)
+    F = P - np.diag(np.sum(P, axis=0))
+    q = null_space(F)
+    return (q / np.sum(q)).flatten()
+
+
+def measure(function, matrix, types):
+    start = time.perf_counter()
+    result = function(matrix, types)
+    return time.perf_counter() - start, result
+
+
+# The first call imports the sparse solvers from SciPy
+weights.cilos_weights(rng.uniform(1, 10, (n, 10)), np.ones(10))
+
+print(f'n = {n}, seconds')
+print(f'{"m":>6} | {"svd":>8} | {"reduced":>8} | {"speedup":>8} | {"max diff":>8}')
+for m in (100, 300, 1000, 2000, 5000, 10000, 30000):
+    matrix = rng.uniform(1, 10, (n, m))
+    types = np.ones(m)
+    new, w = measure(weights.cilos_weights, matrix, types)
+    if m <= svd_limit:
+        old, w_old = measure(svd_cilos_weights, matrix, types)
+        print(f'{m:>6} | {old:>8.3f} | {new:>8.4f} | {old / new:>7.0f}x | {np.max(np.abs(w - w_old)):>8.1e}')
+    else:
+        print(f'{m:>6} | {"":>8} | {new:>8.4f} | {"":>8} | {"":>8}')
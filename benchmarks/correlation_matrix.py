@@ -0,0 +1,37 @@
+# Time of `correlation_matrix` for k rankings of n alternatives, with the
+# matrix forms of the correlations and with the pairwise loop used for custom
+# functions (forced here by wrapping the same correlation). The pairwise loop
+# is measured on at most 200 rankings and extrapolated quadratically.
+#
+# Usage:
+#     python benchmarks/correlation_matrix.py [n] [k]
+
+import sys
+import time
+
+import numpy as np
+from pymcdm import correlations
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+k = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+rng = np.random.default_rng(0)
+rankings = np.array([rng.permutation(n) + 1 for _ in range(k)], dtype='float')
+functions = [correlations.pearson, correlations.spearman,
+             correlations.weighted_spearman, correlations.rank_similarity_coef]
+
+
+def measure(function, rankings):
+    start = time.perf_counter()
+    correlations.correlation_matrix(rankings, function)
+    return time.perf_counter() - start
+
+
+print(f'n = {n}, k = {k}, seconds')
+print(f'{"correlation":>22} | {"pairwise":>10} | {"matrix":>8} | {"speedup":>8}')
+for function in functions:
+    wrapped = lambda x, y, function=function: function(x, y)
+    sample = min(k, 200)
+    pairwise = measure(wrapped, rankings[:sample]) * (k / sample) ** 2
+    matrix = measure(function, rankings)
+    print(f'{function.__name__:>22} | {pairwise:>10.2f} | {matrix:>8.3f} | {pairwise / matrix:>7.0f}x')
@@ -0,0 +1,54 @@
+# Wall-clock time of evaluating all methods with `ensemble`, compared with
+# calling the methods one after another, and time spent in each method.
+#
+# PROMETHEE_II builds n x n preference tables, so it dominates for large n.
+#
+# Usage:
+#     python benchmarks/ensemble_speedup.py [n] [m] [workers]
+
+import sys
+import time
+
+import numpy as np
+from pymcdm import correlations
+from pymcdm.ensemble import default_methods, ensemble
+from pymcdm.helpers import rankdata
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+m = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+rng = np.random.default_rng(0)
+matrix = rng.uniform(1, 10, (n, m))
+weights = rng.dirichlet(np.ones(m))
+types = np.array([1 if i % 2 == 0 else -1 for i in range(m)])
+bounds = np.column_stack((matrix.min(axis=0), matrix.max(axis=0)))
+
+
+def sequential():
+    methods = default_methods()
+    prefs = [method(matrix, weights, types, *((bounds,) if name == 'SPOTIS' else ()))
+             for name, method in methods.items()]
+    rankings = np.array([rankdata(pref, reverse=method.reverse_ranking)
+                         for pref, method in zip(prefs, methods.values())])
+    return correlations.correlation_matrix(rankings, correlations.spearman)
+
+
+cases = [
+    ('sequential calls', sequential),
+    ('ensemble', lambda: ensemble(matrix, weights, types)),
+    ('ensemble, threads', lambda: ensemble(matrix, weights, types, executor='thread', workers=workers)),
+    ('ensemble, processes', lambda: ensemble(matrix, weights, types, executor='process', workers=workers)),
+]
+
+print(f'n = {n}, m = {m}')
+results = {}
+for name, function in cases:
+    start = time.perf_counter()
+    results[name] = function()
+    print(f'{name:>20} | {time.perf_counter() - start:.3f} s')
+
+print()
+print('Time in each method (threads):')
+for name, elapsed in sorted(results['ensemble, threads'].times.items(), key=lambda item: -item[1]):
+    print(f'{name:>40} | {elapsed * 1e3:9.2f} ms')
@@ -0,0 +1,92 @@
+# Accuracy of the float32 pipeline compared with float64.
+#
+# For every (n, m) size a suite of random decision problems is evaluated
+# twice: with `dtype=np.float32` and with `dtype=np.float64`. Reported are
+# the maximum difference of preferences (relative to the range of the float64
+# preferences), the share of problems with identical rankings and the largest
+# shift of an alternative in the ranking. Weights are compared in the same way.
+#
+# Usage:
+#     python benchmarks/float32_accuracy.py [problems]
+
+import sys
+import warnings
+
+import numpy as np
+from pymcdm import methods, weights as mcdm_weights
+
+problems = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+sizes = [(10, 4), (100, 8), (1000, 16)]
+
+cases = [
+    ('TOPSIS', lambda dt: methods.TOPSIS(dtype=dt), False),
+    ('VIKOR', lambda dt: methods.VIKOR(dtype=dt), True),
+    ('COPRAS', lambda dt: methods.COPRAS(dtype=dt), False),
+    ('PROMETHEE_II', lambda dt: methods.PROMETHEE_II('usual', dtype=dt), False),
+    ('SPOTIS', lambda dt: methods.SPOTIS(dtype=dt), True),
+    ('ARAS', lambda dt: methods.ARAS(dtype=dt), False),
+    ('COCOSO', lambda dt: methods.COCOSO(dtype=dt), False),
+    ('CODAS', lambda dt: methods.CODAS(dtype=dt), False),
+    ('EDAS', lambda dt: methods.EDAS(dtype=dt), False),
+    ('MABAC', lambda dt: methods.MABAC(dtype=dt), False),
+    ('MAIRCA', lambda dt: methods.MAIRCA(dtype=dt), False),
+    ('MARCOS', lambda dt: methods.MARCOS(dtype=dt), False),
+    ('OCRA', lambda dt: methods.OCRA(dtype=dt), False),
+    ('MOORA', lambda dt: methods.MOORA(dtype=dt), False),
+]
+
+weights_cases = ['equal_weights', 'entropy_weights', 'standard_deviation_weights', 'merec_weights',
+                 'critic_weights', 'angle_weights', 'gini_weights', 'variance_weights']
+
+
+def ranks(pref, ascending):
+    order = np.argsort(pref if ascending else -pref, kind='stable')
+    r = np.empty(order.shape, dtype=int)
+    r[order] = np.arange(order.shape[0])
+    return r
+
+
+def suite(n, m):
+    rng = np.random.default_rng(n * 1000 + m)
+    types = np.array([1 if i % 2 == 0 else -1 for i in range(m)])
+    for _ in range(problems):
+        matrix = rng.uniform(1, 100, (n, m))
+        weights = rng.dirichlet(np.ones(m))
+        yield matrix, weights, types
+
+
+def compare(p32, p64, ascending):
+    spread = np.ptp(p64)
+    err = np.max(np.abs(p32.astype('float') - p64)) / (spread if spread > 0 else 1)
+    shift = np.max(np.abs(ranks(p32, ascending) - ranks(p64, ascending)))
+    return err, shift
+
+
+warnings.simplefilter('ignore')
+print(f'{problems} problems for each size')
+print(f'{"method":>28} | {"n x m":>9} | {"max rel. error":>14} | {"same ranking":>12} | {"max shift":>9}')
+for name, make, ascending in cases:
+    for n, m in sizes:
+        bounds = np.array([np.zeros(m), np.ones(m) * 101]).T
+        args = (bounds,) if name == 'SPOTIS' else ()
+        errs, shifts = [], []
+        for matrix, weights, types in suite(n, m):
+            p64 = make(np.float64)(matrix, weights, types, *args)
+            p32 = make(np.float32)(matrix.astype(np.float32), weights.astype(np.float32), types, *args)
+            assert p32.dtype == np.float32
+            err, shift = compare(p32, p64, ascending)
+            errs.append(err)
+            shifts.append(shift)
+        same = np.mean(np.array(shifts) == 0)
+        print(f'{name:>28} | {f"{n}x{m}":>9} | {max(errs):>14.2e} | {same:>12.0%} | {max(shifts):>9}')
+
+for name in weights_cases:
+    f = getattr(mcdm_weights, name)
+    for n, m in sizes:
+        errs = []
+        for matrix, weights, types in suite(n, m):
+            w64 = f(matrix, types)
+            w32 = f(matrix.astype(np.float32), types)
+            assert w32.dtype == np.float32
+            errs.append(np.max(np.abs(w32 - w64)))
+        print(f'{name:>28} | {f"{n}x{m}":>9} | {max(errs):>14.2e} | {"-":>12} | {"-":>9}')
@@ -0,0 +1,46 @@
+# Time of `gini_weights` for n alternatives and m criteria, compared with the
+# pairwise O(m n^2) loop (previous implementation), which is measured only
+# for n up to `loop_limit`.
+#
+# Usage:
+#     python benchmarks/gini_weights.py [m] [loop_limit]
+
+import sys
+import time
+
+import numpy as np
+from pymcdm import weights
+
+m = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+loop_limit = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+
+rng = np.random.default_rng(0)
+
+
+def pairwise_gini_weights(matrix):
+    n, m = matrix.shape
+    w = np.zeros(m)
+    for i in range(m):
+        values = np.zeros(n)
+        for j in range(n):
+            values[j] = np.sum(np.abs(matrix[j, i] - matrix[:, i]) / (2 * n ** 2 * (np.sum(matrix[:, i]) / n)))
+        w[i] = np.sum(values)
+    return w / np.sum(w)
+
+
+def measure(function, matrix):
+    start = time.perf_counter()
+    result = function(matrix)
+    return time.perf_counter() - start, result
+
+
+print(f'm = {m}, seconds')
+print(f'{"n":>8} | {"loop":>8} | {"sorted":>8} | {"speedup":>8} | {"max diff":>8}')
+for n in (1000, 3000, 10000, 100000, 1000000):
+    matrix = rng.uniform(1, 10, (n, m))
+    new, w = measure(weights.gini_weights, matrix)
+    if n <= loop_limit:
+        old, w_old = measure(pairwise_gini_weights, matrix)
+        print(f'{n:>8} | {old:>8.3f} | {new:>8.4f} | {old / new:>7.0f}x | {np.max(np.abs(w - w_old)):>8.1e}')
+    else:
+        print(f'{n:>8} | {"":>8} | {new:>8.4f} | {"":>8} | {"":>8}')
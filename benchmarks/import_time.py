@@ -0,0 +1,56 @@
+# Import time of `import pymcdm; pymcdm.methods.TOPSIS` in fresh interpreters,
+# compared with the import of NumPy alone. Time spent over NumPy should stay
+# under `budget` milliseconds and SciPy should not be imported; exit status is 1
+# if either check fails, so the script could be used in CI.
+#
+# Usage:
+#     python benchmarks/import_time.py [budget_ms] [repeats]
+
+import subprocess
+import sys
+
+budget = float(sys.argv[1]) if len(sys.argv) > 1 else 30.0
+repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+TEMPLATE = '''
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed, 'scipy' in sys.modules)
+'''
+
+
+def measure(statement):
+    # Best time of `repeats` fresh interpreters, and if SciPy was imported in any of them
+    times = []
+    scipy = False
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', TEMPLATE.format(statement=statement)],
+                                capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(output[0]))
+        scipy |= output[1] == 'True'
+    return min(times), scipy
+
+
+numpy_time, _ = measure('import numpy')
+cases = {
+    'import pymcdm; pymcdm.methods.TOPSIS': True,
+    'import pymcdm; pymcdm.methods.TOPSIS; pymcdm.normalizations; pymcdm.helpers': False,
+    'import pymcdm; pymcdm.weights; pymcdm.correlations': False,
+    'import pymcdm.ensemble': False,
+}
+
+print(f'import numpy: {numpy_time * 1e3:.1f} ms, best of {repeats}')
+print(f'{"statement":>78} | {"total":>8} | {"over numpy":>10} | scipy')
+failed = False
+for statement, checked in cases.items():
+    elapsed, scipy = measure(statement)
+    over = (elapsed - numpy_time) * 1e3
+    flag = ''
+    if checked and (over > budget or scipy):
+        flag = f'  <- over budget of {budget} ms' if over > budget else '  <- imports scipy'
+        failed = True
+    print(f'{statement:>78} | {elapsed * 1e3:>5.1f} ms | {over:>7.1f} ms | {scipy!s:>5}{flag}')
+
+sys.exit(1 if failed else 0)
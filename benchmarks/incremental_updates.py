@@ -0,0 +1,56 @@
+# Time of updating preferences after a few alternatives are added or removed,
+# with `IncrementalEvaluator` and with a full recomputation by the method.
+#
+# Added alternatives are inside the ranges of the criteria, so no column
+# extreme changes (EDAS is recomputed anyway, because its mean changes).
+#
+# Usage:
+#     python benchmarks/incremental_updates.py [n] [m] [updates]
+
+import sys
+import time
+
+import numpy as np
+from pymcdm import methods
+from pymcdm.incremental import IncrementalEvaluator
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+m = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+updates = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+rng = np.random.default_rng(0)
+matrix = rng.uniform(1, 10, (n, m))
+weights = rng.dirichlet(np.ones(m))
+types = np.array([1 if i % 2 == 0 else -1 for i in range(m)])
+
+cases = [
+    ('TOPSIS', methods.TOPSIS()),
+    ('VIKOR', methods.VIKOR()),
+    ('MABAC', methods.MABAC()),
+    ('EDAS', methods.EDAS()),
+]
+
+print(f'n = {n}, m = {m}, {updates} updates of 5 alternatives, ms per update')
+print(f'{"method":>8} | {"full":>8} | {"incremental":>11} | {"incremental, 5 prefs":>20}')
+for name, method in cases:
+    rows = rng.uniform(2, 9, (updates, 5, m))
+
+    current = matrix
+    start = time.perf_counter()
+    for new in rows:
+        current = np.concatenate((current[5:], new))
+        method(current, weights, types)
+    full = (time.perf_counter() - start) / updates
+
+    evaluator = IncrementalEvaluator(method, matrix, weights, types)
+    evaluator.preferences()
+    results = []
+    for only_new in (False, True):
+        start = time.perf_counter()
+        for new in rows:
+            evaluator.remove_alternatives(evaluator.ids[:5])
+            ids = evaluator.add_alternatives(new)
+            evaluator.preferences(ids if only_new else None)
+        results.append((time.perf_counter() - start) / updates)
+
+    print(f'{name:>8} | {full * 1e3:>8.2f} | {results[0] * 1e3:>11.2f} | {results[1] * 1e3:>20.2f}')
@@ -0,0 +1,64 @@
+# Time of the pairwise hot spots (PROMETHEE II flows, CODAS), of Kendall tau and
+# Goodman-Kruskal gamma and of COMET evaluation with the NumPy implementation
+# and with the numba compiled kernels from `pymcdm.jit` (if numba is installed).
+# Pairwise NumPy implementations are O(n^2), so they are skipped for n larger
+# than `numpy_limit`. Compilation time of the kernels is not included.
+#
+# Usage:
+#     python benchmarks/jit_backends.py [numpy_limit] [repeats]
+
+import sys
+import time
+
+import numpy as np
+from pymcdm import correlations
+from pymcdm import jit
+from pymcdm import methods as mcda
+
+numpy_limit = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+rng = np.random.default_rng(0)
+m = 5
+weights = np.ones(m) / m
+types = np.array([1, -1, 1, -1, 1])
+cvalues = [[0, 0.5, 1]] * m
+comet = mcda.COMET(cvalues, mcda.COMET.topsis_rate_function(weights, types))
+
+
+def measure(function, use_jit):
+    enabled = jit.enabled
+    jit.enabled = use_jit
+    try:
+        # The first call compiles the kernels
+        function()
+        start = time.perf_counter()
+        for _ in range(repeats):
+            function()
+        return (time.perf_counter() - start) / repeats
+    finally:
+        jit.enabled = enabled
+
+
+def fmt(seconds):
+    return f'{"n/a":>10}' if seconds is None else f'{seconds * 1e3:>10.2f}'
+
+
+print(f'numba available: {jit.available}, m = {m}, ms per call')
+print(f'{"case":>22} | {"n":>7} | {"numpy":>10} | {"jit":>10} | {"speedup":>7}')
+for n in (1000, 10000, 100000):
+    matrix = rng.random((n, m))
+    x, y = np.round(rng.random((2, n)), 2)
+    cases = {
+        'PROMETHEE_II usual': (lambda: mcda.PROMETHEE_II('usual')(matrix, weights, types), True),
+        'PROMETHEE_II vshape': (lambda: mcda.PROMETHEE_II('vshape')(matrix, weights, types, p=np.full(m, 0.3)), True),
+        'CODAS': (lambda: mcda.CODAS()(matrix, weights, types), True),
+        'COMET': (lambda: comet(matrix), False),
+        'kendall_tau': (lambda: correlations.kendall_tau(x, y), False),
+        'goodman_kruskal_gamma': (lambda: correlations.goodman_kruskal_gamma(x, y), False),
+    }
+    for name, (function, pairwise) in cases.items():
+        numpy_time = measure(function, False) if not pairwise or n <= numpy_limit else None
+        jit_time = measure(function, True) if jit.available else None
+        speedup = f'{numpy_time / jit_time:>6.1f}x' if numpy_time and jit_time else f'{"":>7}'
+        print(f'{name:>22} | {n:>7} | {fmt(numpy_time)} | {fmt(jit_time)} | {speedup}')
@@ -0,0 +1,39 @@
+# Time of `kendall_tau` and `goodman_kruskal_gamma` for rankings of n
+# alternatives, without ties (permutations) and with many ties (10 distinct
+# values). Both are O(n log n), the numba kernel counting discordant pairs is
+# used if `pymcdm.jit` is enabled.
+#
+# Usage:
+#     python benchmarks/kendall_tau.py [max_n]
+
+import sys
+import time
+
+import numpy as np
+from pymcdm import correlations
+from pymcdm import jit
+
+max_n = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+
+rng = np.random.default_rng(0)
+
+
+def measure(function, x, y):
+    start = time.perf_counter()
+    function(x, y)
+    return time.perf_counter() - start
+
+
+print(f'numba kernels: {jit.enabled}, seconds')
+print(f'{"n":>8} | {"ties":>5} | {"kendall_tau":>11} | {"gamma":>8}')
+n = 1000
+while n <= max_n:
+    for ties in (False, True):
+        if ties:
+            x, y = rng.integers(0, 10, (2, n)).astype('float')
+        else:
+            x, y = rng.permutation(n) + 1.0, rng.permutation(n) + 1.0
+        tau = measure(correlations.kendall_tau, x, y)
+        gamma = measure(correlations.goodman_kruskal_gamma, x, y)
+        print(f'{n:>8} | {ties!s:>5} | {tau:>11.3f} | {gamma:>8.3f}')
+    n *= 10
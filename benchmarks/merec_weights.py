@@ -0,0 +1,45 @@
+# Time of `merec_weights` for n alternatives and m criteria, compared with
+# removing each criterion with `np.delete` and recomputing the logarithms
+# (previous implementation, O(n m^2) with a copy of the matrix per criterion).
+#
+# Usage:
+#     python benchmarks/merec_weights.py [n]
+
+import sys
+import time
+
+import numpy as np
+from pymcdm import weights
+from pymcdm.normalizations import linear_normalization, normalize_matrix
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+rng = np.random.default_rng(0)
+
+
+def delete_merec_weights(matrix, types):
+    n, m = matrix.shape
+    nmatrix = normalize_matrix(matrix, linear_normalization, -types)
+    S = np.log(1 + (1/m * np.sum(np.abs(np.log(nmatrix)), axis=1)))
+    S_prim = np.zeros(nmatrix.shape)
+    for j in range(m):
+        ex_nmatrix = np.delete(nmatrix, j, axis=1)
+        S_prim[:, j] = np.log(1 + (1/m * np.sum(np.abs(np.log(ex_nmatrix)), axis=1)))
+    E = np.sum(np.abs(S_prim.T - S), axis=1)
+    return E / np.sum(E)
+
+
+def measure(function, matrix, types):
+    start = time.perf_counter()
+    result = function(matrix, types)
+    return time.perf_counter() - start, result
+
+
+print(f'n = {n}, seconds')
+print(f'{"m":>6} | {"delete":>8} | {"vectorized":>10} | {"speedup":>8} | {"max diff":>8}')
+for m in (100, 200, 500, 1000, 2000):
+    matrix = rng.uniform(1, 10, (n, m))
+    types = np.where(rng.random(m) < 0.5, 1, -1)
+    old, w_old = measure(delete_merec_weights, matrix, types)
+    new, w = measure(weights.merec_weights, matrix, types)
+    print(f'{m:>6} | {old:>8.3f} | {new:>10.4f} | {old / new:>7.0f}x | {np.max(np.abs(w - w_old)):>8.1e}')
@@ -0,0 +1,38 @@
+# Time of `normalize_matrix` for matrices with many criteria, with the
+# matrix-level kernels and with the per-column fallback used for custom
+# `foo(x, cost)` functions (forced here by wrapping the same normalization).
+#
+# Usage:
+#     python benchmarks/normalize_columns.py [n] [repeats]
+
+import sys
+import time
+
+import numpy as np
+from pymcdm import normalizations
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+rng = np.random.default_rng(0)
+# Normalization functions which are applied to all columns at once
+functions = list(normalizations._MATRIX_NORMALIZATIONS)
+
+
+def measure(matrix, function, types):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        normalizations.normalize_matrix(matrix, function, types)
+    return (time.perf_counter() - start) / repeats
+
+
+print(f'n = {n}, ms per call')
+print(f'{"normalization":>32} | {"m":>5} | {"columns":>8} | {"matrix":>8} | {"speedup":>7}')
+for m in (10, 1000, 5000):
+    matrix = rng.uniform(1, 10, (n, m))
+    types = np.array([1 if i % 2 == 0 else -1 for i in range(m)])
+    for function in functions:
+        wrapped = lambda x, cost=False, function=function: function(x, cost)
+        columns = measure(matrix, wrapped, types)
+        vectorized = measure(matrix, function, types)
+        print(f'{function.__name__:>32} | {m:>5} | {columns * 1e3:>8.2f} | {vectorized * 1e3:>8.2f} | {columns / vectorized:>6.1f}x')
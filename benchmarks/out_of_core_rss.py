@@ -0,0 +1,52 @@
+# Peak memory of `MCDA_method.stream` on memory-mapped decision matrices.
+# Each run is made in a fresh process. Pages of the memory-mapped files are
+# counted in RSS, but they are page cache which the OS could reclaim, so peak
+# of the allocated memory (tracemalloc) and anonymous RSS are reported.
+#
+# Usage:
+#     python benchmarks/out_of_core_rss.py [m] [chunk_size]
+
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+RUN = '''
+import sys, tracemalloc
+import numpy as np
+from pymcdm import methods
+path, out_path, m, chunk_size = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+matrix = np.load(path, mmap_mode='r')
+out = np.lib.format.open_memmap(out_path, mode='w+', shape=(matrix.shape[0],))
+types = np.array([1 if i % 2 == 0 else -1 for i in range(m)])
+weights = np.ones(m) / m
+tracemalloc.start()
+methods.TOPSIS().stream(matrix, weights, types, out=out, chunk_size=chunk_size)
+out.flush()
+anon = [line.split()[1] for line in open('/proc/self/status') if line.startswith('RssAnon')]
+print(tracemalloc.get_traced_memory()[1], anon[0] if anon else 0)
+'''
+
+m = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 65536
+sizes = [10 ** 5, 10 ** 6, 10 ** 7]
+
+print(f'TOPSIS, m = {m}, chunk_size = {chunk_size}')
+print(f'{"n":>10} | {"matrix MiB":>10} | {"peak allocated MiB":>18} | {"anon RSS MiB":>12}')
+with tempfile.TemporaryDirectory() as tmp:
+    for n in sizes:
+        path = os.path.join(tmp, 'matrix.npy')
+        out_path = os.path.join(tmp, 'out.npy')
+        matrix = np.lib.format.open_memmap(path, mode='w+', shape=(n, m))
+        rng = np.random.default_rng(0)
+        for i in range(0, n, chunk_size):
+            matrix[i:i + chunk_size] = rng.uniform(1, 10, matrix[i:i + chunk_size].shape)
+        matrix.flush()
+        del matrix
+
+        result = subprocess.run([sys.executable, '-c', RUN, path, out_path, str(m), str(chunk_size)],
+                                capture_output=True, text=True, check=True)
+        peak, anon = result.stdout.split()
+        print(f'{n:>10} | {n * m * 8 / 2 ** 20:>10.0f} | {int(peak) / 2 ** 20:>18.1f} | {int(anon) / 1024:>12.1f}')
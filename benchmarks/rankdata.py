@@ -0,0 +1,51 @@
+# Time of `helpers.rankdata` for vectors of n values and for K rankings of n
+# alternatives (axis=-1), compared with ranking through `collections.Counter`
+# and a dict lookup per element (the previous implementation), and size of the
+# ranks returned with `method='min', compact=True` compared with float64 ranks.
+#
+# Usage:
+#     python benchmarks/rankdata.py [K]
+
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+from pymcdm import helpers
+
+K = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+rng = np.random.default_rng(0)
+
+
+def counter_rankdata(a):
+    c = Counter(a)
+    rv = {}
+    i = 1
+    for k in sorted(c.keys()):
+        v = c[k]
+        rv[k] = i if v == 1 else (2 * i + v - 1) / 2
+        i += v
+    return np.array([rv[k] for k in a], dtype='float')
+
+
+def measure(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+print(f'{"case":>22} | {"n":>8} | {"counter":>9} | {"argsort":>9} | {"speedup":>7} | {"compact":>9} | {"float64 bytes":>13}')
+for n in (1000, 10000, 100000, 1000000):
+    a = rng.random(n)
+    old, _ = measure(lambda: counter_rankdata(a))
+    new, _ = measure(lambda: helpers.rankdata(a))
+    ranks = helpers.rankdata(a, method='min', compact=True)
+    print(f'{"vector":>22} | {n:>8} | {old:>9.4f} | {new:>9.4f} | {old / new:>6.1f}x | {ranks.nbytes:>9} | {n * 8:>13}')
+
+for n in (100, 1000):
+    batch = rng.random((K, n))
+    old, _ = measure(lambda: np.array([counter_rankdata(row) for row in batch]))
+    new, _ = measure(lambda: helpers.rankdata(batch, axis=-1))
+    ranks = helpers.rankdata(batch, axis=-1, method='min', compact=True)
+    print(f'{f"batch of {K}":>22} | {n:>8} | {old:>9.4f} | {new:>9.4f} | {old / new:>6.1f}x | {ranks.nbytes:>9} | {K * n * 8:>13}')
@@ -0,0 +1,58 @@
+# Time and peak memory of `streaming_weights` (one pass over row chunks of a
+# memmap) for n alternatives and m criteria, compared with loading the whole
+# matrix and calling the in-memory weighting functions, and the largest
+# difference between the weights.
+#
+# Usage:
+#     python benchmarks/streaming_weights.py [n] [m] [chunk_size]
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+from pymcdm import weights
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+m = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+chunk_size = int(sys.argv[3]) if len(sys.argv) > 3 else 65536
+
+methods = [weights.entropy_weights, weights.standard_deviation_weights,
+           weights.variance_weights, weights.critic_weights, weights.angle_weights]
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20, result
+
+
+def in_memory(matrix):
+    matrix = np.array(matrix)
+    return {method.__name__: method(matrix) for method in methods}
+
+
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'matrix.dat')
+    matrix = np.memmap(path, dtype='float64', mode='w+', shape=(n, m))
+    rng = np.random.default_rng(0)
+    for i in range(0, n, chunk_size):
+        matrix[i:i + chunk_size] = rng.uniform(1, 10, matrix[i:i + chunk_size].shape)
+    matrix.flush()
+
+    old, old_peak, w_old = measure(lambda: in_memory(matrix))
+    new, new_peak, w = measure(lambda: weights.streaming_weights(matrix, methods, chunk_size))
+    diff = max(np.max(np.abs(w[name] - w_old[name])) for name in w)
+
+    print(f'n = {n}, m = {m}, matrix {n * m * 8 / 2**20:.0f} MiB, chunk_size = {chunk_size}')
+    print(f'{"":>10} | {"seconds":>8} | {"peak MiB":>8}')
+    print(f'{"in memory":>10} | {old:>8.3f} | {old_peak:>8.1f}')
+    print(f'{"streaming":>10} | {new:>8.3f} | {new_peak:>8.1f}')
+    print(f'max diff: {diff:.1e}')
+    del matrix
@@ -0,0 +1,222 @@
+# Benchmark suite: time and peak memory of every method from `pymcdm.methods`,
+# every function from `pymcdm.weights`, `pymcdm.normalizations` and
+# `pymcdm.correlations`, and of `helpers.rankdata`, over a grid of numbers of
+# alternatives (n) and criteria (m). COMET is measured over a grid of numbers
+# of characteristic values per criterion, both model creation and evaluation.
+#
+# `run` writes results to a JSON file. Time is the best of `repeats` calls,
+# peak memory is the maximal size of memory traced by `tracemalloc` (NumPy
+# arrays included) during one call. `compare` reports benchmarks which became
+# slower (or use more memory) than `threshold` times the old value and exits
+# with status 1 if there are any, so it could be used to detect regressions
+# between commits:
+#
+#     git checkout old && python benchmarks/suite.py run old.json
+#     git checkout new && python benchmarks/suite.py run new.json
+#     python benchmarks/suite.py compare old.json new.json
+#
+# Usage:
+#     python benchmarks/suite.py run [output.json] [repeats] [--quick] [--filter=substring]
+#     python benchmarks/suite.py compare old.json new.json [threshold]
+
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pymcdm
+from pymcdm import correlations
+from pymcdm import helpers
+from pymcdm import methods as mcda
+from pymcdm import normalizations
+from pymcdm import weights as mcda_weights
+
+GRID_N = (100, 1000, 10000)
+GRID_M = (5, 20)
+QUICK_GRID_N = (100, 1000)
+QUICK_GRID_M = (5,)
+COMET_M = (2, 3, 4)
+COMET_CVALUES = (2, 3, 5)
+# Pairwise (O(n^2)) functions are skipped above this number of alternatives
+PAIRWISE_LIMIT = 10000
+
+
+def problem(n, m, seed=0):
+    rng = np.random.default_rng(seed)
+    matrix = rng.uniform(1, 10, (n, m))
+    weights = rng.random(m)
+    weights /= np.sum(weights)
+    types = np.array([1 if i % 2 == 0 else -1 for i in range(m)])
+    return matrix, weights, types
+
+
+def method_cases(n, m):
+    matrix, weights, types = problem(n, m)
+    bounds = np.column_stack((np.min(matrix, axis=0), np.max(matrix, axis=0)))
+    cases = {
+        'TOPSIS': (mcda.TOPSIS(), ()),
+        'VIKOR': (mcda.VIKOR(), ()),
+        'COPRAS': (mcda.COPRAS(), ()),
+        'PROMETHEE_II': (mcda.PROMETHEE_II('usual'), ()),
+        'SPOTIS': (mcda.SPOTIS(), (bounds,)),
+        'ARAS': (mcda.ARAS(), ()),
+        'COCOSO': (mcda.COCOSO(), ()),
+        'CODAS': (mcda.CODAS(), ()),
+        'EDAS': (mcda.EDAS(), ()),
+        'MABAC': (mcda.MABAC(), ()),
+        'MAIRCA': (mcda.MAIRCA(), ()),
+        'MARCOS': (mcda.MARCOS(), ()),
+        'OCRA': (mcda.OCRA(), ()),
+        'MOORA': (mcda.MOORA(), ()),
+    }
+    pairwise = {'PROMETHEE_II', 'CODAS'}
+    for name, (method, args) in cases.items():
+        if name in pairwise and n > PAIRWISE_LIMIT:
+            continue
+        yield f'methods.{name}', lambda method=method, args=args: method(matrix, weights, types, *args)
+
+
+def weights_cases(n, m):
+    matrix, _, types = problem(n, m)
+    # Single weighting functions only, not `multiple_weights` or the streaming API
+    for function in mcda_weights._KERNELS:
+        yield f'weights.{function.__name__}', lambda function=function: function(matrix, types)
+
+
+def normalization_cases(n, m):
+    matrix, _, types = problem(n, m)
+    for name in normalizations.__all__:
+        function = getattr(normalizations, name)
+        if name == 'normalize_matrix' or name == 'Normalizer':
+            continue
+        # Single column, the way functions are called by the methods
+        yield f'normalizations.{name}', lambda function=function: function(matrix[:, 0], True)
+        yield (f'normalizations.normalize_matrix[{name}]',
+               lambda function=function: normalizations.normalize_matrix(matrix, function, types))
+
+
+def correlation_cases(n, m):
+    rng = np.random.default_rng(0)
+    x = helpers.rankdata(rng.random(n))
+    y = helpers.rankdata(rng.random(n))
+    for name in correlations.__all__:
+        if name == 'correlation_matrix':
+            continue
+        function = getattr(correlations, name)
+        yield f'correlations.{name}', lambda function=function: function(x, y)
+    rankings = np.array([helpers.rankdata(rng.random(n)) for _ in range(m)])
+    yield ('correlations.correlation_matrix[spearman]',
+           lambda: correlations.correlation_matrix(rankings, correlations.spearman))
+
+
+def helpers_cases(n, m):
+    a = np.random.default_rng(0).random(n)
+    yield 'helpers.rankdata', lambda: helpers.rankdata(a)
+
+
+def comet_cases(n, m, k):
+    matrix, weights, types = problem(n, m)
+    matrix = (matrix - 1) / 9
+    cvalues = [np.linspace(0, 1, k)] * m
+    rate = mcda.COMET.topsis_rate_function(weights, types)
+    comet = mcda.COMET(cvalues, rate)
+    yield 'methods.COMET.__init__', lambda: mcda.COMET(cvalues, rate)
+    yield 'methods.COMET', lambda: comet(matrix)
+
+
+def measure(function, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), times, peak
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'jit': pymcdm.jit.enabled,
+    }
+
+
+def run(output, repeats, quick, pattern):
+    grid_n = QUICK_GRID_N if quick else GRID_N
+    grid_m = QUICK_GRID_M if quick else GRID_M
+    suites = [method_cases, weights_cases, normalization_cases, correlation_cases, helpers_cases]
+    cases = [(suite, {'n': n, 'm': m}) for n in grid_n for m in grid_m for suite in suites]
+    cases += [(comet_cases, {'n': n, 'm': m, 'k': k})
+              for n in grid_n for m in COMET_M for k in COMET_CVALUES]
+
+    results = []
+    for suite, params in cases:
+        for name, function in suite(**params):
+            if pattern and pattern not in name:
+                continue
+            best, times, peak = measure(function, repeats)
+            results.append({'name': name, 'params': params, 'time': best, 'times': times, 'peak_memory': peak})
+            print(f'{name:>60} | {json.dumps(params):>28} | {best * 1e3:>10.3f} ms | {peak / 2 ** 20:>9.2f} MiB')
+
+    with open(output, 'w') as f:
+        json.dump({'metadata': metadata(), 'results': results}, f, indent=1)
+    print(f'Results saved to {output}')
+
+
+def compare(old, new, threshold):
+    def load(path):
+        with open(path) as f:
+            data = json.load(f)
+        return {(r['name'], json.dumps(r['params'], sort_keys=True)): r for r in data['results']}
+
+    old, new = load(old), load(new)
+    regressions = 0
+    print(f'{"benchmark":>60} | {"params":>28} | {"time":>7} | {"memory":>7}')
+    for key in sorted(old.keys() & new.keys()):
+        time_ratio = new[key]['time'] / old[key]['time']
+        memory_ratio = new[key]['peak_memory'] / max(old[key]['peak_memory'], 1)
+        flag = ''
+        if time_ratio > threshold or memory_ratio > threshold:
+            flag = '  <- regression'
+            regressions += 1
+        print(f'{key[0]:>60} | {key[1]:>28} | {time_ratio:>6.2f}x | {memory_ratio:>6.2f}x{flag}')
+    print(f'{regressions} regressions (threshold {threshold}x), '
+          f'{len(old.keys() - new.keys())} benchmarks removed, {len(new.keys() - old.keys())} added')
+    return regressions
+
+
+if __name__ == '__main__':
+    flags = [a for a in sys.argv[1:] if a.startswith('--')]
+    argv = [a for a in sys.argv[1:] if not a.startswith('--')]
+    command = argv[0] if argv else 'run'
+    if command == 'run':
+        pattern = next((f.split('=', 1)[1] for f in flags if f.startswith('--filter=')), None)
+        run(argv[1] if len(argv) > 1 else 'benchmarks.json',
+            int(argv[2]) if len(argv) > 2 else 3,
+            '--quick' in flags, pattern)
+    elif command == 'compare':
+        threshold = float(argv[3]) if len(argv) > 3 else 1.2
+        sys.exit(1 if compare(argv[1], argv[2], threshold) else 0)
+    else:
+        print(f'Unknown command {command!r}, use "run" or "compare".')
+        sys.exit(2)
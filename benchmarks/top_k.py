@@ -0,0 +1,51 @@
+# Time and memory of finding the best alternatives with `top_k`, compared with
+# calculating all preferences and ranking them with `rrankdata`.
+#
+# Reported memory is the tracemalloc peak, for the chunked evaluation it does
+# not depend on the number of alternatives (only on `k` and the chunk size).
+#
+# Usage:
+#     python benchmarks/top_k.py [n] [m] [k]
+
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from pymcdm import methods
+from pymcdm.helpers import rrankdata
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+m = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+k = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+rng = np.random.default_rng(0)
+matrix = rng.uniform(1, 10, (n, m))
+weights = rng.dirichlet(np.ones(m))
+types = np.array([1 if i % 2 == 0 else -1 for i in range(m)])
+topsis = methods.TOPSIS()
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+cases = [
+    ('rrankdata', lambda: rrankdata(topsis(matrix, weights, types))),
+    ('argsort', lambda: np.argsort(-topsis(matrix, weights, types))[:k]),
+    ('top_k', lambda: topsis.top_k(k, matrix, weights, types)),
+    ('top_k chunked', lambda: topsis.top_k(k, matrix, weights, types, chunk_size=65536)),
+    ('rank_of chunked', lambda: topsis.rank_of(np.arange(k), matrix, weights, types, chunk_size=65536)),
+]
+
+print(f'TOPSIS, n = {n}, m = {m}, k = {k}, matrix size {matrix.nbytes / 2 ** 20:.0f} MiB')
+print(f'{"case":>16} | {"time s":>7} | {"peak MiB":>8}')
+for name, function in cases:
+    elapsed, peak = measure(function)
+    print(f'{name:>16} | {elapsed:>7.3f} | {peak / 2 ** 20:>8.1f}')
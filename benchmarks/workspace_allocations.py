@@ -0,0 +1,74 @@
+# Peak memory allocated by one call of the methods with and without `Workspace`,
+# and of `normalize_matrix` with and without `out`, compared with the size of the
+# decision matrix. Repeated calls of the same shape with the buffers should not
+# allocate arrays of the matrix size: the peak per call should stay under
+# `limit` times `matrix.nbytes` (only vectors of n values and NumPy's internal
+# buffers are allocated then). Exit status is 1 if any call with the buffers is
+# over the limit, so the script could be used in CI. Vectors of n values are
+# 1/m of the matrix, so the number of criteria `m` should not be small.
+#
+# Usage:
+#     python benchmarks/workspace_allocations.py [n] [m] [calls] [limit]
+
+import sys
+import tracemalloc
+
+import numpy as np
+from pymcdm import methods
+from pymcdm import normalizations
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+m = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+calls = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+limit = float(sys.argv[4]) if len(sys.argv) > 4 else 0.25
+
+rng = np.random.default_rng(0)
+matrix = rng.uniform(1, 10, (n, m))
+weights = rng.dirichlet(np.ones(m))
+types = np.array([1 if i % 2 == 0 else -1 for i in range(m)])
+
+cases = []
+for name in methods.find_methods(workspace=True):
+    method = getattr(methods, name)()
+    cases.append((name,
+                  lambda method=method: method(matrix, weights, types),
+                  lambda method=method, workspace=methods.Workspace(), out=np.empty(n):
+                      method(matrix, weights, types, workspace=workspace, out=out)))
+for normalization in normalizations._MATRIX_NORMALIZATIONS:
+    cases.append((normalization.__name__,
+                  lambda normalization=normalization: normalizations.normalize_matrix(matrix, normalization, types),
+                  lambda normalization=normalization, out=np.empty_like(matrix):
+                      normalizations.normalize_matrix(matrix, normalization, types, out=out)))
+
+
+def peak_per_call(call):
+    # The largest peak of traced memory over one call, after warm up calls in which
+    # buffers and internal caches of NumPy are allocated
+    tracemalloc.start()
+    for _ in range(3):
+        call()
+    start = tracemalloc.get_traced_memory()[0]
+    peak = 0
+    for _ in range(calls):
+        tracemalloc.reset_peak()
+        call()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - start)
+    tracemalloc.stop()
+    return peak
+
+
+print(f'n = {n}, m = {m}, {calls} calls, matrix size {matrix.nbytes / 2 ** 10:.0f} KiB, limit {limit} of the matrix size')
+print(f'{"call":>31} | {"peak KiB":>9} | {"with buffers KiB":>16} | {"of matrix":>9}')
+failed = False
+with np.errstate(all='ignore'):
+    for name, call, buffered_call in cases:
+        peak = peak_per_call(call)
+        buffered_peak = peak_per_call(buffered_call)
+        ratio = buffered_peak / matrix.nbytes
+        flag = ''
+        if ratio > limit:
+            flag = '  <- over the limit'
+            failed = True
+        print(f'{name:>31} | {peak / 2 ** 10:>9.1f} | {buffered_peak / 2 ** 10:>16.1f} | {ratio:>9.3f}{flag}')
+
+sys.exit(1 if failed else 0)
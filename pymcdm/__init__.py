@@ -1,5 +1,28 @@
-from . import methods
-from . import correlations
-from . import normalizations
-from . import weights
-from . import helpers
+import importlib as _importlib
+
+# Submodules are imported on the first access, e.g. `pymcdm.weights`,
+# so short scripts import only what they use
+_SUBMODULES = (
+    'methods',
+    'correlations',
+    'normalizations',
+    'weights',
+    'helpers',
+    'smaa',
+    'ensemble',
+    'incremental',
+    'jit',
+    'tracing',
+)
+
+__all__ = list(_SUBMODULES)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return _importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
@@ -2,7 +2,8 @@
 # Copyright (c) 2021 Bartłomiej Kizielewicz
 
 import numpy as np
-from itertools import permutations
+
+from . import jit
 
 __all__ = [
     'spearman',
@@ -102,7 +103,10 @@ def rank_similarity_coef(x, y):
 
 
 def kendall_tau(x, y):
-    """Calculate Kendall Tau correlation between two rankings vectors.
+    """Calculate Kendall Tau (tau-b) correlation between two rankings vectors.
+
+    Ties are handled as in tau-b, for rankings without ties it is equal to tau-a.
+    It is calculated in O(n log n) time.
 
     Parameters
     ----------
@@ -117,17 +121,15 @@ def kendall_tau(x, y):
         float
             Correlation between two rankings vectors.
     """
-    n = len(x)
-    res = 0
-    for j in range(n):
-        for i in range(j):
-            res += np.sign(x[i] - x[j]) * np.sign(y[i] - y[j])
-    return 2/(n*(n-1)) * res
+    S, n0, n1, n2, _ = _pair_counts(x, y)
+    return S / np.sqrt(float(n0 - n1) * float(n0 - n2))
 
 
 def goodman_kruskal_gamma(x, y):
     """Calculate Goodman's and Kruskal's Gamma correlation between two rankings vectors.
 
+    It is calculated in O(n log n) time.
+
     Parameters
     ----------
         x : ndarray
@@ -141,21 +143,79 @@ def goodman_kruskal_gamma(x, y):
         float
             Correlation between two rankings vectors.
     """
-    num = 0
-    den = 0
-    for i, j in permutations(range(len(x)), 2):
-        x_dir = x[i] - x[j]
-        y_dir = y[i] - y[j]
-        sign = np.sign(x_dir * y_dir)
-        num += sign
-        if sign:
-            den += 1
-    return num / float(den)
-
-
-def correlation_matrix(rankings, method, columns=False):
+    S, n0, n1, n2, n3 = _pair_counts(x, y)
+    return S / float(n0 - n1 - n2 + n3)
+
+
+def _pair_counts(x, y):
+    # Knight's algorithm. Returns S = (concordant - discordant pairs), number of all pairs n0,
+    # pairs tied in x (n1), tied in y (n2) and tied in both (n3). Pairs which are not tied
+    # in any vector are concordant or discordant, discordant ones are the inversions of y
+    # ordered by x (and y for ties in x, so pairs tied in x are not inversions).
+    x = np.asarray(x)
+    y = np.asarray(y)
+    order = np.lexsort((y, x))
+    x, y = x[order], y[order]
+
+    n = x.shape[0]
+    n0 = n * (n - 1) // 2
+    n1 = _tied_pairs(_run_lengths(x[1:] != x[:-1]))
+    n3 = _tied_pairs(_run_lengths((x[1:] != x[:-1]) | (y[1:] != y[:-1])))
+    _, ranks = np.unique(y, return_inverse=True)
+    n2 = _tied_pairs(np.bincount(ranks))
+    discordant = jit.inversions(ranks) if jit.enabled else _inversions(ranks)
+    return np.float64(n0 - n1 - n2 + n3 - 2 * discordant), n0, n1, n2, n3
+
+
+def _run_lengths(changes):
+    # Lengths of runs of equal values in the sorted vector, from boundaries between them
+    bounds = np.flatnonzero(np.concatenate(([True], changes, [True])))
+    return np.diff(bounds)
+
+
+def _tied_pairs(counts):
+    # Number of pairs within groups of equal values of given sizes
+    return int(np.sum(counts * (counts - 1) // 2))
+
+
+def _inversions(y):
+    # Number of pairs i < j with y[i] > y[j] for non-negative integers y, counted bit by bit from
+    # the most significant one. Elements are kept in groups with the same higher bits, in their
+    # original order within groups. A pair which first differs at the current bit is an inversion
+    # if its element with the bit set is first. Each level counts these pairs and partitions the
+    # groups by the bit with a counting sort, in linear time, so it takes O(n log max(y)) time.
+    y = np.asarray(y, dtype=np.int64)
+    n = y.shape[0]
+    if n < 2:
+        return 0
+    pos = np.arange(n)
+    top = int(y.max())
+    count = 0
+    for shift in range(top.bit_length() - 1, -1, -1):
+        key = y >> shift
+        bit = key & 1
+        ones_before = np.cumsum(bit) - bit
+        # Positions of the first elements with each key, the group starts at its even key
+        key_start = np.zeros((top >> shift) + 2, dtype=np.int64)
+        np.cumsum(np.bincount(key, minlength=(top >> shift) + 1), out=key_start[1:])
+        start = key_start[key - bit]
+        group_ones_before = ones_before - ones_before[start]
+        count += int(np.sum(group_ones_before, where=bit == 0))
+
+        rank = np.where(bit, group_ones_before, pos - start - group_ones_before)
+        partitioned = np.empty_like(y)
+        partitioned[key_start[key] + rank] = y
+        y = partitioned
+    return count
+
+
+def correlation_matrix(rankings, method, columns=False, block_size=2048):
     """Creates a correlation matrix for given vectors from the numpy array.
 
+    Correlations `pearson`, `spearman`, `weighted_spearman` and `rank_similarity_coef` are calculated
+    in matrix form for blocks of vectors, other symmetric correlations are calculated only
+    for pairs from the upper triangle. Other functions are called for each pair of vectors.
+
     Parameters
     ----------
         rankings : ndarray
@@ -168,16 +228,96 @@ def correlation_matrix(rankings, method, columns=False):
             If the column value is set to true then the correlation matrix will be calculated for the columns.
             Otherwise the matrix will be calculated for the rows.
 
+        block_size : int
+            Number of vectors in blocks of the matrix calculated at once, it limits the size of intermediate arrays.
+
     Returns
     -------
         ndarray
             Correlation between two rankings vectors.
     """
+    rankings = np.asarray(rankings)
     if columns:
         rankings = rankings.T
     n = rankings.shape[0]
     corr = np.zeros((n, n))
+
+    if method in _MATRIX_CORRELATIONS:
+        prepare, kernel, symmetric = _MATRIX_CORRELATIONS[method]
+        N = rankings.shape[1]
+        data = prepare(rankings.astype('float'))
+        for i in range(0, n, block_size):
+            rows = tuple(d[i:i + block_size] for d in data)
+            for j in range(i if symmetric else 0, n, block_size):
+                block = kernel(rows, tuple(d[j:j + block_size] for d in data), N)
+                corr[i:i + block_size, j:j + block_size] = block
+                if symmetric and j != i:
+                    corr[j:j + block_size, i:i + block_size] = block.T
+        return corr
+
+    symmetric = method in _SYMMETRIC_CORRELATIONS
     for i in range(n):
-        for j in range(n):
+        for j in range(i if symmetric else 0, n):
             corr[i, j] = method(rankings[i], rankings[j])
+            if symmetric:
+                corr[j, i] = corr[i, j]
+    return corr
+
+
+# Matrix forms of the correlations: `prepare(rankings)` returns tuple of arrays with values for each vector,
+# `kernel(rows, columns, N)` calculates block of the correlation matrix from parts of these arrays.
+
+def _pearson_prepare(r):
+    z = r - np.mean(r, axis=1, keepdims=True)
+    z /= np.std(r, axis=1, keepdims=True)
+    return z,
+
+
+def _pearson_kernel(rows, columns, N):
+    return rows[0] @ columns[0].T / N
+
+
+def _weighted_spearman_prepare(r):
+    # sum((x - y)^2 * (c - x - y)) = c*sum(x^2) - sum(x^3) + c*sum(y^2) - sum(y^3)
+    #                                - 2c*sum(x*y) + sum(x^2 * y) + sum(x * y^2)
+    # where c = 2(N + 1), terms which depend on one vector are calculated here
+    c = 2 * (r.shape[1] + 1)
+    r2 = r ** 2
+    own = c * np.sum(r2, axis=1) - np.sum(r2 * r, axis=1)
+    return r, r2, own
+
+
+def _weighted_spearman_kernel(rows, columns, N):
+    (x, x2, own_x), (y, y2, own_y) = rows, columns
+    c = 2 * (N + 1)
+    n = own_x[:, np.newaxis] + own_y + (x2 - 2 * c * x) @ y.T + x @ y2.T
+    d = N**4 + N**3 - N**2 - N
+    return 1 - (6 * n / d)
+
+
+def _rank_similarity_prepare(r):
+    N = r.shape[1]
+    w = 2.0**(-1.0 * r) / np.maximum(np.fabs(1 - r), np.fabs(N - r))
+    return r, w
+
+
+def _rank_similarity_kernel(rows, columns, N):
+    # Not symmetric and not linear in `y`, so it is calculated from differences,
+    # in chunks of rows which keep the broadcasted array small
+    (x, w), (y, _) = rows, columns
+    corr = np.empty((x.shape[0], y.shape[0]))
+    step = max(1, 2 ** 22 // max(y.size, 1))
+    for s in range(0, x.shape[0], step):
+        diff = np.fabs(x[s:s + step, np.newaxis] - y)
+        corr[s:s + step] = 1 - np.sum(w[s:s + step, np.newaxis] * diff, axis=-1)
     return corr
+
+
+_MATRIX_CORRELATIONS = {
+    pearson: (_pearson_prepare, _pearson_kernel, True),
+    spearman: (_pearson_prepare, _pearson_kernel, True),
+    weighted_spearman: (_weighted_spearman_prepare, _weighted_spearman_kernel, True),
+    rank_similarity_coef: (_rank_similarity_prepare, _rank_similarity_kernel, False),
+}
+
+_SYMMETRIC_CORRELATIONS = {kendall_tau, goodman_kruskal_gamma}
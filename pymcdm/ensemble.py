@@ -0,0 +1,238 @@
+# Copyright (c) 2021 Andrii Shekhovtsov
+
+from collections import namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import time
+
+import numpy as np
+
+from . import correlations
+from . import helpers
+from . import normalizations
+from . import methods as mcda
+
+__all__ = [
+    'EnsembleResult',
+    'default_methods',
+    'ensemble'
+]
+
+
+EnsembleResult = namedtuple('EnsembleResult', ['names', 'preferences', 'rankings', 'correlations', 'times'])
+EnsembleResult.__doc__ = """Results of `ensemble`.
+
+    Attributes
+    ----------
+        names : list
+            Names of the methods, in the order of rows of the arrays.
+
+        preferences : ndarray
+            Preference values with shape (k, n), one row for each method.
+
+        rankings : ndarray
+            Rankings with shape (k, n), one row for each method.
+
+        correlations : ndarray
+            Correlation matrix of the rankings with shape (k, k).
+
+        times : dict
+            Wall-clock time in seconds spent in each method. Methods which share normalized decision matrix
+            are reported without normalization, time of each shared normalization is reported
+            under key 'normalization: <name of the function>'.
+"""
+
+
+def default_methods():
+    """Create objects of all methods which could be evaluated with decision matrix, weights and types only.
+
+    Returns
+    -------
+        dict
+            Method objects with default parameters, by method name.
+    """
+    return {
+        'TOPSIS': mcda.TOPSIS(),
+        'VIKOR': mcda.VIKOR(),
+        'COPRAS': mcda.COPRAS(),
+        'PROMETHEE_II': mcda.PROMETHEE_II('usual'),
+        'SPOTIS': mcda.SPOTIS(),
+        'ARAS': mcda.ARAS(),
+        'COCOSO': mcda.COCOSO(),
+        'CODAS': mcda.CODAS(),
+        'EDAS': mcda.EDAS(),
+        'MABAC': mcda.MABAC(),
+        'MAIRCA': mcda.MAIRCA(),
+        'MARCOS': mcda.MARCOS(),
+        'OCRA': mcda.OCRA(),
+        'MOORA': mcda.MOORA(),
+    }
+
+
+def ensemble(matrix, weights, types, methods=None, args=None, kwargs=None,
+             correlation=correlations.spearman, executor=None, workers=None):
+    """Evaluate alternatives from `matrix` with many MCDA methods and compare the rankings.
+
+    Methods which start with normalization of the decision matrix (TOPSIS, COCOSO, MABAC, MAIRCA and CODAS)
+    share it: each distinct normalization function is applied once and the normalized matrix
+    is used by all methods with this normalization (unless additional arguments are given for the method).
+    Normalizations and methods are evaluated on the thread or process pool.
+
+    Parameters
+    ----------
+        matrix : ndarray
+            Decision matrix / alternatives data.
+            Alternatives are in rows and Criteria are in columns.
+
+        weights : ndarray
+            Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+
+        types : ndarray
+            Array with definitions of criteria types:
+            1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
+
+        methods : None or dict
+            Method objects by name. If None, `default_methods()` are used.
+
+        args : None or dict
+            Additional positional arguments of the methods by name, e.g. `{'SPOTIS': (bounds,)}`.
+            If bounds for methods which need them (SPOTIS) are not given,
+            minimal and maximal values of the criteria in `matrix` are used.
+
+        kwargs : None or dict
+            Additional keyword arguments of the methods by name, e.g. `{'VIKOR': {'v': 0.3}}`.
+
+        correlation : callable
+            Function used to compare rankings, see `pymcdm.correlations`.
+
+        executor : None or str
+            'thread' or 'process' to evaluate methods on the pool of `workers` threads or processes.
+            If None, methods are evaluated one after another in the current thread.
+
+        workers : None or int
+            Maximal number of workers of the pool.
+
+    Returns
+    -------
+        EnsembleResult
+            Names of the methods, stacked preferences and rankings, correlation matrix and times of the methods.
+    """
+    if methods is None:
+        methods = default_methods()
+    args = dict(args or {})
+    kwargs = dict(kwargs or {})
+    weights = np.asarray(weights)
+    types = np.asarray(types)
+    types = mcda.TOPSIS._validate_input_data(matrix, weights, types)
+    if weights.ndim != 1:
+        raise ValueError(f'Weights should be a vector, but have {weights.ndim} dimensions.')
+
+    for name, method in methods.items():
+        if 'bounds' in mcda.method_info(method).call_args and not args.get(name):
+            args[name] = (np.column_stack((np.min(matrix, axis=0), np.max(matrix, axis=0))),)
+
+    # Methods are grouped by the normalized matrix which they need,
+    # the rest of them are evaluated from the decision matrix
+    shared = {}
+    direct = []
+    for name, method in methods.items():
+        normalization, kernel = _shared_normalization(method)
+        if kernel is None or args.get(name) or kwargs.get(name):
+            direct.append(name)
+            continue
+        key = (normalization, np.dtype(method._float_dtype(matrix)))
+        shared.setdefault(key, []).append(name)
+
+    if executor is None:
+        pool = _SequentialExecutor()
+    elif executor == 'thread':
+        pool = ThreadPoolExecutor(max_workers=workers)
+    elif executor == 'process':
+        pool = ProcessPoolExecutor(max_workers=workers)
+    else:
+        raise ValueError(f"Executor should be None, 'thread' or 'process', but is {executor!r}.")
+
+    results = {}
+    times = {}
+    with pool:
+        norm_futures = {key: pool.submit(_timed, normalizations.normalize_matrix,
+                                         matrix.astype(key[1], copy=False), key[0], types)
+                        for key in shared}
+        futures = {name: pool.submit(_timed, methods[name], matrix, weights, types,
+                                     *args.get(name, ()), **kwargs.get(name, {}))
+                   for name in direct}
+
+        for (normalization, dtype), names in shared.items():
+            nmatrix, elapsed = norm_futures[(normalization, dtype)].result()
+            times[f'normalization: {normalization.__name__}'] = elapsed
+            for name in names:
+                kernel = _shared_normalization(methods[name])[1]
+                futures[name] = pool.submit(_timed, kernel, nmatrix, weights.astype(dtype))
+
+        for name, future in futures.items():
+            results[name], times[name] = future.result()
+
+    names = list(methods)
+    preferences = np.array([results[name] for name in names])
+    rankings = np.array([helpers.rankdata(pref, reverse=methods[name].reverse_ranking)
+                         for name, pref in zip(names, preferences)])
+    corr = correlations.correlation_matrix(rankings, correlation)
+    return EnsembleResult(names, preferences, rankings, corr, times)
+
+
+def _shared_normalization(method):
+    # Normalization function applied to the decision matrix by the method and
+    # kernel which evaluates the method from the normalized matrix
+    for cls, default, kernel in _SHARED:
+        if type(method) is cls:
+            normalization = method.normalization if method.normalization is not None else default
+            return normalization, kernel
+    return None, None
+
+
+def _topsis(nmatrix, weights):
+    return mcda.TOPSIS._topsis(nmatrix, weights)
+
+
+def _cocoso(nmatrix, weights):
+    return mcda.COCOSO._cocoso(nmatrix, weights)
+
+
+def _mabac(nmatrix, weights):
+    return mcda.MABAC._mabac(nmatrix, weights)
+
+
+def _mairca(nmatrix, weights):
+    return mcda.MAIRCA._mairca_score((1 - nmatrix) / nmatrix.shape[-2], weights)
+
+
+def _codas(nmatrix, weights):
+    return mcda.CODAS._codas(nmatrix, weights)
+
+
+_SHARED = [
+    (mcda.TOPSIS, normalizations.minmax_normalization, _topsis),
+    (mcda.COCOSO, normalizations.minmax_normalization, _cocoso),
+    (mcda.MABAC, normalizations.minmax_normalization, _mabac),
+    (mcda.MAIRCA, normalizations.minmax_normalization, _mairca),
+    (mcda.CODAS, normalizations.linear_normalization, _codas),
+]
+
+
+def _timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+class _SequentialExecutor:
+    # Executor which evaluates tasks immediately in the current thread
+    def submit(self, function, *args, **kwargs):
+        future = Future()
+        future.set_result(function(*args, **kwargs))
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
@@ -1,14 +1,18 @@
 # Copyright (c) 2021 Andrii Shekhovtsov
 
 import numpy as np
-from collections import Counter
+
+from . import tracing
 
 __all__ = [
     'rankdata',
-    'rrankdata'
+    'rrankdata',
+    'top_k',
+    'rank_of'
 ]
 
-def rankdata(a, reverse=False):
+@tracing.traced('rank')
+def rankdata(a, reverse=False, axis=-1, method='average', compact=False):
     """
     Assign ranks to data in vector `a`.
 
@@ -16,7 +20,8 @@ def rankdata(a, reverse=False):
 
     Ranking starts from smaller values, e.g. the smaller element get
     the first position. The `reverse` argument reverse posisions, e.g.
-    the largest element get first position.
+    the largest element get first position. NaN values are equal to each
+    other and get the last positions in both directions.
 
     Parameters
     ----------
@@ -27,37 +32,264 @@ def rankdata(a, reverse=False):
         If True, larger elements get first posisions in ranking.
         If False, smaller elements get first positions in ranking.
 
+    axis : int, optional
+        Axis along which elements are ranked, e.g. for `a` with shape (K, n)
+        and `axis=-1` each row is ranked separately.
+
+    method : str, optional
+        Ranks of tied elements:
+        'average' - average of the positions which they take,
+        'min' - the first of these positions,
+        'dense' - the first position, but next elements get the next rank
+        (ranks are consecutive integers),
+        'ordinal' - the positions in the order of appearance in `a`.
+
+    compact : bool, optional
+        If True, ranks of methods 'min', 'dense' and 'ordinal' are returned as
+        integers of the smallest signed type which fits the number of ranked
+        elements (int16, int32 or int64), to save memory for many rankings.
+        Arithmetic on these ranks could overflow (e.g. squared differences
+        of int16 ranks), so they should be converted to floats first.
+        Average ranks are always float64.
+
     Returns
     -------
     ndarray
-        An array of rank scores for the input data.
+        An array of rank scores for the input data, with the shape of `a`,
+        float64 unless `compact` is True.
 
     Examples
     --------
     >>> from pymcdm.helpers import rankdata
     >>> rankdata([0, 3, 2, 5])
-    array([1, 3, 2, 4])
+    array([1., 3., 2., 4.])
     >>> rankdata([0, 3, 2, 5], reverse=True)
-    array([4, 2, 3, 1])
+    array([4., 2., 3., 1.])
     >>> rankdata([0, 3, 2, 3])
     array([1. , 3.5, 2. , 3.5])
     >>> rankdata([0, 3, 2, 3], reverse=True)
     array([4. , 1.5, 3. , 1.5])
+    >>> rankdata([0, 3, 2, 3], method='min')
+    array([1., 3., 2., 3.])
+    >>> rankdata([[0, 3, 2], [5, 1, 1]], method='dense', compact=True)
+    array([[1, 3, 2],
+           [2, 1, 1]], dtype=int16)
     """
-    c = Counter(a)
-    rv = {}
-    i = 1
-    for k in sorted(c.keys(), reverse=reverse):
-        if c[k] == 1:
-            rv[k] = i
-            i += 1
+    if method not in ('average', 'min', 'dense', 'ordinal'):
+        raise ValueError(f"Method should be 'average', 'min', 'dense' or 'ordinal', but is {method!r}.")
+    a = np.asarray(a)
+    if a.ndim == 0:
+        raise ValueError('Ranked data should have at least one dimension.')
+    x = np.moveaxis(a, axis, -1)
+    n = x.shape[-1]
+    # The type depends only on the method and the number of elements, not on ties
+    dtype = _rank_dtype(n) if compact and method != 'average' else np.float64
+    positions = np.arange(n)
+
+    # NaN are sorted to the end, they are made equal to each other
+    order = np.argsort(x, axis=-1, kind='stable')
+    sx = np.take_along_axis(x, order, axis=-1)
+    new = np.ones(x.shape, dtype=bool)
+    new[..., 1:] = sx[..., 1:] != sx[..., :-1]
+    if sx.dtype.kind in 'fc':
+        new[..., 1:] &= ~(np.isnan(sx[..., 1:]) & np.isnan(sx[..., :-1]))
+
+    if reverse:
+        # Groups of equal elements are put in the reverse order (except NaN, which stay last),
+        # order of elements within groups stays the same
+        group = np.empty(x.shape, dtype=np.intp)
+        np.put_along_axis(group, order, np.cumsum(new, axis=-1) - 1, axis=-1)
+        groups = np.sum(new, axis=-1, keepdims=True)
+        if x.dtype.kind in 'fc':
+            nan = np.isnan(x)
+            groups -= np.any(nan, axis=-1, keepdims=True)
+            group = np.where(nan, group, groups - 1 - group)
         else:
-            v = c[k]
-            rv[k] = (2*i + v - 1)/2
-            i += v
-    return np.array([rv[k] for k in a], dtype='float')
+            group = groups - 1 - group
+        order = np.argsort(group, axis=-1, kind='stable')
+        sgroup = np.take_along_axis(group, order, axis=-1)
+        new[..., 1:] = sgroup[..., 1:] != sgroup[..., :-1]
+
+    ties = not np.all(new)
+    if method == 'ordinal' or not ties:
+        sranks = np.broadcast_to(positions + 1, x.shape)
+    elif method == 'dense':
+        sranks = np.cumsum(new, axis=-1)
+    else:
+        start = np.maximum.accumulate(np.where(new, positions, 0), axis=-1)
+        sranks = start + 1
+        if method == 'average':
+            last = np.ones(x.shape, dtype=bool)
+            last[..., :-1] = new[..., 1:]
+            end = np.minimum.accumulate(np.where(last, positions, n - 1)[..., ::-1], axis=-1)[..., ::-1]
+            sranks = (start + end) / 2 + 1
+
+    ranks = np.empty(x.shape, dtype=dtype)
+    np.put_along_axis(ranks, order, sranks, axis=-1)
+    return np.moveaxis(ranks, -1, axis)
 
 
-def rrankdata(a):
+def _rank_dtype(n):
+    # The smallest signed integer type for compact ranks of `n` elements
+    if n <= np.iinfo(np.int16).max:
+        return np.int16
+    if n <= np.iinfo(np.int32).max:
+        return np.int32
+    return np.int64
+
+
+def rrankdata(a, axis=-1, method='average', compact=False):
     """Alias to `rankdata(a, reverse=True)`. See `rankdata` for details."""
-    return rankdata(a, reverse=True)
+    return rankdata(a, reverse=True, axis=axis, method=method, compact=compact)
+
+
+@tracing.traced('rank')
+def top_k(a, k, reverse=False):
+    """
+    Find `k` first positions in ranking of vector `a`, without ranking all elements.
+
+    Elements are selected with `np.argpartition`, only the selected ones are sorted.
+    If elements tie for the last selected position, which of them are returned is
+    not specified, but their positions are the same as given by `rankdata`.
+
+    Parameters
+    ----------
+    a : ndarray
+        Vector of values to be ranked.
+
+    k : int
+        Number of the first positions.
+
+    reverse : bool, optional
+        If True, larger elements get first posisions in ranking.
+        If False, smaller elements get first positions in ranking.
+
+    Returns
+    -------
+    ndarray
+        Indexes of `k` first elements in ranking, from the first one.
+
+    ndarray
+        Positions of these elements, the same as `rankdata(a, reverse)[indexes]`.
+
+    Examples
+    --------
+    >>> from pymcdm.helpers import top_k
+    >>> top_k([0, 3, 2, 5], 2, reverse=True)
+    (array([3, 1]), array([1., 2.]))
+    >>> top_k([0, 3, 2, 3], 2, reverse=True)
+    (array([1, 3]), array([1.5, 1.5]))
+    """
+    top = _TopK(k, reverse)
+    top.push(a)
+    return top.result()
+
+
+@tracing.traced('rank')
+def rank_of(a, indices, reverse=False):
+    """
+    Find positions in ranking of vector `a` of the elements with indexes `indices`, without ranking all elements.
+
+    Positions are calculated from the numbers of better and equal elements.
+
+    Parameters
+    ----------
+    a : ndarray
+        Vector of values to be ranked.
+
+    indices : ndarray
+        Indexes of the elements.
+
+    reverse : bool, optional
+        If True, larger elements get first posisions in ranking.
+        If False, smaller elements get first positions in ranking.
+
+    Returns
+    -------
+    ndarray
+        Positions of the elements, the same as `rankdata(a, reverse)[indices]`.
+
+    Examples
+    --------
+    >>> from pymcdm.helpers import rank_of
+    >>> rank_of([0, 3, 2, 3], [1, 2])
+    array([3.5, 2. ])
+    """
+    a = np.asarray(a)
+    if a.ndim != 1:
+        raise ValueError(f'Values should be a vector, but have {a.ndim} dimensions.')
+    ranks = _RankCounter(a[indices], reverse)
+    ranks.push(a)
+    return ranks.result()
+
+
+class _TopK:
+    # Bounded buffer with `k` first elements of the values pushed so far.
+    # Values are negated for reverse ranking, so smaller keys are always better.
+    def __init__(self, k, reverse=False):
+        if k < 1:
+            raise ValueError(f'Number of the first positions should be positive, but is {k}.')
+        self.k = k
+        self.sign = -1 if reverse else 1
+        self.keys = np.empty(0)
+        self.indices = np.empty(0, dtype='int')
+        self.n = 0
+        # Number of discarded elements equal to the last kept one. The last kept key
+        # never decreases, so discarded elements could tie only with its current value.
+        self.ties = 0
+
+    def push(self, values):
+        values = np.asarray(values)
+        if values.ndim != 1:
+            raise ValueError(f'Values should be a vector, but have {values.ndim} dimensions.')
+        keys = np.concatenate((self.keys, self.sign * values))
+        indices = np.concatenate((self.indices, np.arange(self.n, self.n + values.shape[0])))
+        self.n += values.shape[0]
+        if keys.shape[0] <= self.k:
+            self.keys, self.indices = keys, indices
+            return
+
+        order = np.argpartition(keys, self.k - 1)
+        last = keys[order[self.k - 1]]
+        ties = np.count_nonzero(keys[order[self.k:]] == last)
+        if self.keys.shape[0] == self.k and np.max(self.keys) == last:
+            ties += self.ties
+        self.ties = ties
+        self.keys, self.indices = keys[order[:self.k]], indices[order[:self.k]]
+
+    def result(self):
+        order = np.lexsort((self.indices, self.keys))
+        keys, indices = self.keys[order], self.indices[order]
+
+        # All elements better than the last kept one are kept,
+        # so only its ties are counted among discarded elements
+        better = np.searchsorted(keys, keys, side='left')
+        equal = np.searchsorted(keys, keys, side='right') - better
+        if keys.shape[0]:
+            equal[keys == keys[-1]] += self.ties
+        return indices, better + (equal + 1) / 2
+
+
+class _RankCounter:
+    # Counts better and equal elements for `values` among the values pushed in chunks.
+    def __init__(self, values, reverse=False):
+        self.sign = -1 if reverse else 1
+        self.keys = self.sign * np.asarray(values)
+        self.better = np.zeros(self.keys.shape, dtype='int')
+        self.equal = np.zeros(self.keys.shape, dtype='int')
+
+    def push(self, values):
+        keys = self.sign * np.asarray(values)
+        if self.keys.size <= 16:
+            # Direct comparisons for a few elements
+            for i, key in np.ndenumerate(self.keys):
+                self.better[i] += np.count_nonzero(keys < key)
+                self.equal[i] += np.count_nonzero(keys == key)
+        else:
+            keys = np.sort(keys)
+            left = np.searchsorted(keys, self.keys, side='left')
+            self.better += left
+            self.equal += np.searchsorted(keys, self.keys, side='right') - left
+
+    def result(self):
+        return self.better + (self.equal + 1) / 2
@@ -0,0 +1,408 @@
+# Copyright (c) 2021 Andrii Shekhovtsov
+
+import numpy as np
+
+from . import normalizations
+from .methods import TOPSIS, VIKOR, MABAC, EDAS
+from .methods.vikor import _fake_normalization
+
+__all__ = [
+    'IncrementalEvaluator'
+]
+
+
+class IncrementalEvaluator:
+    def __init__(self, method, matrix, weights, types, v=0.5):
+        """Create evaluator which keeps preferences of alternatives up to date when
+        alternatives or criteria are added or removed.
+
+        Column aggregates (min, max, sum and sum of logarithms) are updated with each change.
+        Values of each criterion (distances, normalized values etc.) are stored for each alternative
+        together with their weighted sums, so adding alternatives costs O(m) per alternative,
+        as long as no column extreme changes. If an extreme (or the mean for EDAS) changes,
+        only the affected columns are recomputed, in O(n) each. Adding or removing a criterion
+        costs O(n). Recomputation is deferred until preferences are requested.
+
+        Supported methods are TOPSIS and MABAC with min-max normalization, VIKOR with default
+        normalization and EDAS.
+
+        Parameters
+        ----------
+            method : MCDA_method
+                Object of the method, e.g. `TOPSIS()`.
+
+            matrix : ndarray
+                Initial decision matrix, alternatives are in rows and criteria are in columns.
+                Alternatives get ids 0, 1, ..., n - 1.
+
+            weights : ndarray
+                Criteria weights. Weights are not normalized when criteria are added or removed,
+                preferences of TOPSIS, VIKOR and EDAS do not depend on the scale of the weights.
+
+            types : ndarray
+                Array with definitions of criteria types:
+                1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
+
+            v : float
+                Weight of the strategy for VIKOR method.
+
+        Raises
+        ------
+            ValueError
+                If the method or its normalization is not supported.
+        """
+        self._method = _method_name(method)
+        matrix = np.asarray(matrix, dtype='float')
+        n, m = matrix.shape
+        if m != len(weights) or m != len(types):
+            raise ValueError('Number of criteria should be same as number of weights and number of types')
+        if n == 0:
+            raise ValueError('Decision matrix should contain at least one alternative.')
+        self.v = v
+
+        capacity = max(n, 16)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._alive[:n] = True
+        self._size = n
+        self._end = n
+        self._free = []
+
+        self._weights = np.array(weights, dtype='float')
+        self._types = np.array(types)
+        self._columns = []
+        for j in range(m):
+            column = np.zeros(capacity)
+            column[:n] = matrix[:, j]
+            self._columns.append(column)
+
+        # Per-criterion values for each alternative and their weighted sums
+        self._cells = [np.zeros((self._n_cells, capacity)) for _ in range(m)]
+        self._acc = np.zeros((self._n_cells, capacity))
+        self._R = np.zeros(capacity)
+        self._R_stale = True
+
+        self._min = np.min(matrix, axis=0)
+        self._max = np.max(matrix, axis=0)
+        self._sum = np.sum(matrix, axis=0)
+        self._logsum = np.zeros(m)
+        self._stale = set(range(m))
+
+    @property
+    def ids(self):
+        """Ids of the alternatives in the evaluator, in ascending order."""
+        return np.flatnonzero(self._alive[:self._end])
+
+    @property
+    def weights(self):
+        """Criteria weights."""
+        return self._weights.copy()
+
+    @property
+    def matrix(self):
+        """Current decision matrix, with alternatives in the order of `ids`."""
+        ids = self.ids
+        return np.array([column[ids] for column in self._columns]).reshape(len(self._columns), -1).T
+
+    def __len__(self):
+        return self._size
+
+    def add_alternatives(self, rows):
+        """Add alternatives to the evaluator.
+
+        Parameters
+        ----------
+            rows : ndarray
+                Alternative or matrix with alternatives in rows.
+
+        Returns
+        -------
+            ndarray
+                Ids of the added alternatives.
+        """
+        rows = np.atleast_2d(np.asarray(rows, dtype='float'))
+        if rows.shape[1] != len(self._columns):
+            raise ValueError(f'Alternatives should have {len(self._columns)} criteria, but have {rows.shape[1]}.')
+        ids = self._allocate(rows.shape[0])
+        for column, values in zip(self._columns, rows.T):
+            column[ids] = values
+        self._alive[ids] = True
+        self._size += len(ids)
+
+        old = self._min, self._max
+        self._min = np.minimum(self._min, np.min(rows, axis=0))
+        self._max = np.maximum(self._max, np.max(rows, axis=0))
+        self._sum = self._sum + np.sum(rows, axis=0)
+        self._mark_stale(*old)
+
+        # Values of the columns which are up to date are computed for new alternatives only
+        self._acc[:, ids] = 0
+        for j, cells in enumerate(self._cells):
+            if j in self._stale:
+                cells[:, ids] = 0
+                continue
+            cells[:, ids] = self._column_cells(j, ids)
+            self._acc[:, ids] += self._factor(j) * cells[:, ids]
+            if self._method == 'MABAC':
+                self._logsum[j] += np.sum(np.log(cells[0, ids]))
+
+        if self._method == 'VIKOR' and not self._R_stale:
+            self._R[ids] = np.max([w * cells[0, ids] for w, cells in zip(self._weights, self._cells)], axis=0)
+        return ids
+
+    def remove_alternatives(self, ids):
+        """Remove alternatives with `ids` from the evaluator.
+
+        Parameters
+        ----------
+            ids : ndarray
+                Ids of the alternatives which should be removed.
+        """
+        ids = np.unique(np.asarray(ids, dtype='int'))
+        if np.any(ids < 0) or np.any(ids >= self._end) or not np.all(self._alive[ids]):
+            raise ValueError('Some of the alternatives are not in the evaluator.')
+        if len(ids) >= self._size:
+            raise ValueError('Evaluator should contain at least one alternative.')
+        self._alive[ids] = False
+        self._size -= len(ids)
+        self._free.extend(ids.tolist())
+
+        values = np.array([column[ids] for column in self._columns]).reshape(len(self._columns), -1)
+        self._sum = self._sum - np.sum(values, axis=1)
+
+        # Extremes are searched again only if the removed alternative had one of them
+        old = self._min.copy(), self._max.copy()
+        alive = self._alive[:self._end]
+        for j, column in enumerate(self._columns):
+            if np.any(values[j] == self._min[j]):
+                self._min[j] = np.min(column[:self._end][alive])
+            if np.any(values[j] == self._max[j]):
+                self._max[j] = np.max(column[:self._end][alive])
+        self._mark_stale(*old)
+
+        if self._method == 'MABAC':
+            for j, cells in enumerate(self._cells):
+                if j not in self._stale:
+                    self._logsum[j] -= np.sum(np.log(cells[0, ids]))
+
+    def add_criterion(self, values, type, weight):
+        """Add criterion to the evaluator.
+
+        Parameters
+        ----------
+            values : ndarray
+                Values of the criterion for the alternatives, in the order of `ids`.
+
+            type : int
+                1 if criterion is profit and -1 if criterion is cost.
+
+            weight : float
+                Weight of the criterion.
+        """
+        values = np.asarray(values, dtype='float')
+        if values.shape != (self._size,):
+            raise ValueError(f'Criterion should have {self._size} values, but has shape {values.shape}.')
+        column = np.zeros(self._alive.shape[0])
+        column[self.ids] = values
+        self._columns.append(column)
+        self._cells.append(np.zeros((self._n_cells, column.shape[0])))
+        self._weights = np.append(self._weights, weight)
+        self._types = np.append(self._types, type)
+        self._min = np.append(self._min, np.min(values))
+        self._max = np.append(self._max, np.max(values))
+        self._sum = np.append(self._sum, np.sum(values))
+        self._logsum = np.append(self._logsum, 0)
+        self._stale.add(len(self._columns) - 1)
+        self._R_stale = True
+
+    def remove_criterion(self, index):
+        """Remove criterion with index `index` from the evaluator.
+
+        Parameters
+        ----------
+            index : int
+                Index of the criterion.
+        """
+        m = len(self._columns)
+        if not -m <= index < m:
+            raise ValueError(f'Criterion index {index} is out of range for {m} criteria.')
+        if m == 1:
+            raise ValueError('Evaluator should contain at least one criterion.')
+        index = index % m
+
+        # Weighted sums contain current values of the column, even if it is stale
+        self._acc -= self._factor(index) * self._cells[index]
+        del self._columns[index]
+        del self._cells[index]
+        self._weights = np.delete(self._weights, index)
+        self._types = np.delete(self._types, index)
+        self._min = np.delete(self._min, index)
+        self._max = np.delete(self._max, index)
+        self._sum = np.delete(self._sum, index)
+        self._logsum = np.delete(self._logsum, index)
+        self._stale = {j - (j > index) for j in self._stale if j != index}
+        self._R_stale = True
+
+    def set_weights(self, weights):
+        """Replace criteria weights, weighted sums are recomputed in O(nm).
+
+        Parameters
+        ----------
+            weights : ndarray
+                New criteria weights.
+        """
+        weights = np.array(weights, dtype='float')
+        if weights.shape != self._weights.shape:
+            raise ValueError(f'Weights should have shape {self._weights.shape}, but have shape {weights.shape}.')
+        self._weights = weights
+        self._acc[:] = 0
+        for j, cells in enumerate(self._cells):
+            self._acc += self._factor(j) * cells
+        self._R_stale = True
+
+    def preferences(self, ids=None):
+        """Calculate preferences of the alternatives.
+
+        Parameters
+        ----------
+            ids : None or ndarray
+                Ids of the alternatives. If None, preferences of all alternatives are returned in the order of `ids`.
+
+        Returns
+        -------
+            ndarray
+                Preference values, the same as returned by the method for the current decision matrix.
+        """
+        self._refresh()
+        alive = self.ids
+        if ids is None:
+            sel = alive
+        else:
+            sel = np.asarray(ids, dtype='int')
+            if np.any(sel < 0) or np.any(sel >= self._end) or not np.all(self._alive[sel]):
+                raise ValueError('Some of the alternatives are not in the evaluator.')
+
+        if self._method == 'TOPSIS':
+            Dp = np.sqrt(np.maximum(self._acc[0, sel], 0))
+            Dm = np.sqrt(np.maximum(self._acc[1, sel], 0))
+            return Dm / (Dm + Dp)
+
+        if self._method == 'MABAC':
+            G = np.exp(self._logsum / self._size)
+            return self._acc[0, sel] - self._weights @ G
+
+        # VIKOR and EDAS normalize preferences by the extremes over all alternatives
+        if self._method == 'VIKOR':
+            equal = self._min == self._max
+            if np.any(equal):
+                raise ValueError(
+                    f'Criteria with indexes {np.flatnonzero(equal)} contains equal values for all alternatives. VIKOR method could not be applied in this case. Consider removing this criteria from the decision matrix or use another MCDA method.'
+                )
+            S, R = self._acc[0, alive], self._R[alive]
+            Q = self.v * (S - np.min(S)) / (np.max(S) - np.min(S)) \
+              + (1 - self.v) * (R - np.min(R)) / (np.max(R) - np.min(R))
+            pref = Q
+        else:
+            sp, sn = self._acc[0, alive], self._acc[1, alive]
+            pref = (sp / np.max(sp) + 1 - sn / np.max(sn)) / 2
+        return pref if ids is None else pref[np.searchsorted(alive, sel)]
+
+    @property
+    def _n_cells(self):
+        return 2 if self._method in ('TOPSIS', 'EDAS') else 1
+
+    def _factor(self, j):
+        # TOPSIS distances are sums of squared weighted differences
+        return self._weights[j] ** 2 if self._method == 'TOPSIS' else self._weights[j]
+
+    def _allocate(self, k):
+        reused = [self._free.pop() for _ in range(min(k, len(self._free)))]
+        k -= len(reused)
+        if self._end + k > self._alive.shape[0]:
+            self._grow(max(2 * self._alive.shape[0], self._end + k))
+        ids = np.array(reused + list(range(self._end, self._end + k)), dtype='int')
+        self._end += k
+        return ids
+
+    def _grow(self, capacity):
+        def grow(a):
+            new = np.zeros(a.shape[:-1] + (capacity,), dtype=a.dtype)
+            new[..., :a.shape[-1]] = a
+            return new
+        self._alive = grow(self._alive)
+        self._columns = [grow(column) for column in self._columns]
+        self._cells = [grow(cells) for cells in self._cells]
+        self._acc = grow(self._acc)
+        self._R = grow(self._R)
+
+    def _mark_stale(self, old_min, old_max):
+        # Values of the criterion depend on its extremes (EDAS: on its mean,
+        # which changes with every alternative)
+        if self._method == 'EDAS':
+            changed = range(len(self._columns))
+        else:
+            changed = np.flatnonzero((self._min != old_min) | (self._max != old_max)).tolist()
+        if len(changed):
+            self._stale.update(changed)
+            self._R_stale = True
+
+    def _refresh(self):
+        end = self._end
+        alive = self._alive[:end]
+        for j in sorted(self._stale):
+            cells = self._cells[j]
+            new = self._column_cells(j, slice(0, end))
+            self._acc[:, :end] += self._factor(j) * (new - cells[:, :end])
+            cells[:, :end] = new
+            if self._method == 'MABAC':
+                self._logsum[j] = np.sum(np.log(new[0, alive]))
+        self._stale.clear()
+
+        if self._method == 'VIKOR' and self._R_stale:
+            self._R[:end] = np.max([w * cells[0, :end] for w, cells in zip(self._weights, self._cells)], axis=0)
+            self._R_stale = False
+
+    def _column_cells(self, j, idx):
+        x = self._columns[j][idx]
+        profit = self._types[j] == 1
+        xmin, xmax = self._min[j], self._max[j]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self._method in ('TOPSIS', 'MABAC'):
+                # Min-max normalization, PIS is 1 and NIS is 0 unless all values are equal
+                if xmin == xmax:
+                    nx = np.ones(x.shape)
+                else:
+                    nx = (x - xmin) / (xmax - xmin) if profit else (xmax - x) / (xmax - xmin)
+                if self._method == 'MABAC':
+                    return (nx + 1)[np.newaxis]
+                if xmin == xmax:
+                    return np.zeros((2,) + x.shape)
+                return np.array([(1 - nx) ** 2, nx ** 2])
+
+            if self._method == 'VIKOR':
+                ff = (xmax - x) / (xmax - xmin) if profit else (x - xmin) / (xmax - xmin)
+                return ff[np.newaxis]
+
+            # EDAS, distances from the average solution
+            avg = self._sum[j] / self._size
+            d = (x - avg) / avg
+            if self._types[j] == -1:
+                d = -d
+            return np.array([np.maximum(d, 0), np.maximum(-d, 0)])
+
+
+def _method_name(method):
+    if isinstance(method, TOPSIS):
+        if method.normalization not in (None, normalizations.minmax_normalization):
+            raise ValueError('IncrementalEvaluator supports TOPSIS only with minmax_normalization.')
+        return 'TOPSIS'
+    if isinstance(method, MABAC):
+        if method.normalization not in (None, normalizations.minmax_normalization):
+            raise ValueError('IncrementalEvaluator supports MABAC only with minmax_normalization.')
+        return 'MABAC'
+    if isinstance(method, VIKOR):
+        if method.normalization is not _fake_normalization:
+            raise ValueError('IncrementalEvaluator supports VIKOR only with default normalization.')
+        return 'VIKOR'
+    if isinstance(method, EDAS):
+        return 'EDAS'
+    raise ValueError(f'IncrementalEvaluator does not support {type(method).__name__} method. Supported methods are TOPSIS, VIKOR, MABAC and EDAS.')
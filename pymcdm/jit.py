@@ -0,0 +1,176 @@
+# Copyright (c) 2021 Andrii Shekhovtsov
+
+"""Optional JIT compiled kernels for the pairwise parts of the methods and correlations.
+
+Kernels are compiled with numba if it is installed. They are used automatically
+while `enabled` is True, otherwise (or if numba is not available) the NumPy
+implementations are used. Set environment variable `PYMCDM_JIT=0` (or
+`pymcdm.jit.enabled = False`) to always use NumPy.
+"""
+
+import os
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+__all__ = [
+    'available',
+    'enabled'
+]
+
+# True if numba is installed
+available = numba is not None
+
+# Kernels are used only if this flag is True
+enabled = available and os.environ.get('PYMCDM_JIT', '1') != '0'
+
+if available:
+    _kernel = numba.njit(cache=True)
+    _parallel_kernel = numba.njit(cache=True, parallel=True)
+    prange = numba.prange
+else:
+    # Kernels stay plain Python functions, they are not used by the package then
+    def _kernel(function):
+        return function
+    _parallel_kernel = _kernel
+    prange = range
+
+
+# Codes of the PROMETHEE preference functions
+PREFERENCE_FUNCTIONS = {
+    'usual': 0,
+    'ushape': 1,
+    'vshape': 2,
+    'level': 3,
+    'vshape_2': 4,
+}
+
+
+@_kernel
+def _preference(kind, d, q, p):
+    if kind == 0:
+        return 1.0 if d > 0 else 0.0
+    if kind == 1:
+        return 1.0 if d > q else 0.0
+    if kind == 2:
+        if 0 < d <= p:
+            return d / p
+    elif kind == 3:
+        if q < d <= p:
+            return 0.5
+    elif q < d <= p:
+        return (d - q) / (p - q)
+    return 1.0 if d > p else 0.0
+
+
+@_parallel_kernel
+def promethee_flows(crits, profit, kind, q, p):
+    """Positive and negative flows of each alternative for each criterion.
+
+    `crits` has criteria in rows (m, n), preference degrees of both directions
+    are computed from one difference and summed without pairwise tables.
+    Returns array with shape (2, n, m), the same as `PROMETHEE_II._promethee_fit`.
+    """
+    m, n = crits.shape
+    flows = np.zeros((2, n, m), dtype=crits.dtype)
+    for i in prange(n):
+        for c in range(m):
+            xi = crits[c, i]
+            plus = 0.0
+            minus = 0.0
+            for j in range(n):
+                d = xi - crits[c, j] if profit[c] else crits[c, j] - xi
+                plus += _preference(kind, d, q[c], p[c])
+                minus += _preference(kind, -d, q[c], p[c])
+            flows[0, i, c] = plus / (n - 1)
+            flows[1, i, c] = minus / (n - 1)
+    return flows
+
+
+@_parallel_kernel
+def codas_scores(E, T, tau):
+    """Sums of the rows of the CODAS relative assessment matrix, computed without the matrix."""
+    n = E.shape[0]
+    scores = np.empty(n, dtype=E.dtype)
+    for i in prange(n):
+        s = 0.0
+        for j in range(n):
+            dE = E[i] - E[j]
+            s += dE
+            if abs(dE) >= tau:
+                s += T[i] - T[j]
+        scores[i] = s
+    return scores
+
+
+@_parallel_kernel
+def comet_preferences(alts, cvalues, offsets, p):
+    """Preferences of alternatives, evaluated only from the characteristic objects of their cells.
+
+    Characteristic values of criterion `c` are `cvalues[offsets[c]:offsets[c + 1]]`, `p` are preferences
+    of characteristic objects in the order of `itertools.product` of characteristic values.
+    """
+    n, m = alts.shape
+    strides = np.ones(m, dtype=np.int64)
+    for c in range(m - 2, -1, -1):
+        strides[c] = strides[c + 1] * (offsets[c + 2] - offsets[c + 1])
+
+    prefs = np.zeros(n, dtype=alts.dtype)
+    for i in prange(n):
+        index = np.empty(m, dtype=np.int64)
+        lower = np.empty(m)
+        upper = np.empty(m)
+        inside = True
+        for c in range(m):
+            cv = cvalues[offsets[c]:offsets[c + 1]]
+            x = alts[i, c]
+            if not (cv[0] <= x <= cv[-1]):
+                inside = False
+                break
+            k = min(np.searchsorted(cv, x, side='right') - 1, cv.shape[0] - 2)
+            index[c] = k
+            lower[c] = (cv[k + 1] - x) / (cv[k + 1] - cv[k])
+            upper[c] = (x - cv[k]) / (cv[k + 1] - cv[k])
+        if not inside:
+            continue
+
+        s = 0.0
+        for corner in range(1 << m):
+            w = 1.0
+            flat = 0
+            for c in range(m):
+                if (corner >> c) & 1:
+                    w *= upper[c]
+                    flat += (index[c] + 1) * strides[c]
+                else:
+                    w *= lower[c]
+                    flat += index[c] * strides[c]
+            if w != 0:
+                s += w * p[flat]
+        prefs[i] = s
+    return prefs
+
+
+@_kernel
+def inversions(y):
+    """Number of pairs i < j with y[i] > y[j], for `y` with values 0..k-1, counted with Fenwick tree."""
+    n = y.shape[0]
+    tree = np.zeros(np.max(y) + 2 if n else 1, dtype=np.int64)
+    count = 0
+    for j in range(n):
+        # Number of earlier values not greater than y[j]
+        not_greater = 0
+        i = y[j] + 1
+        while i > 0:
+            not_greater += tree[i]
+            i -= i & -i
+        count += j - not_greater
+        i = y[j] + 1
+        while i < tree.shape[0]:
+            tree[i] += 1
+            i += i & -i
+    return count
@@ -1,15 +1,42 @@
-from .topsis import TOPSIS
-from .vikor import VIKOR
-from .copras import COPRAS
-from .promethee import PROMETHEE_II
-from .comet import COMET
-from .spotis import SPOTIS
-from .aras import ARAS
-from .cocoso import COCOSO
-from .codas import CODAS
-from .edas import EDAS
-from .mabac import MABAC
-from .mairca import MAIRCA
-from .marcos import MARCOS
-from .ocra import OCRA
-from .moora import MOORA
+import importlib
+
+# Method classes (and the registry of their capabilities) are imported
+# on the first access, e.g. `pymcdm.methods.TOPSIS`, from these submodules
+_ATTRIBUTES = {
+    'TOPSIS': 'topsis',
+    'VIKOR': 'vikor',
+    'COPRAS': 'copras',
+    'PROMETHEE_II': 'promethee',
+    'COMET': 'comet',
+    'SPOTIS': 'spotis',
+    'ARAS': 'aras',
+    'COCOSO': 'cocoso',
+    'CODAS': 'codas',
+    'EDAS': 'edas',
+    'MABAC': 'mabac',
+    'MAIRCA': 'mairca',
+    'MARCOS': 'marcos',
+    'OCRA': 'ocra',
+    'MOORA': 'moora',
+    'Workspace': 'workspace',
+    'MethodInfo': 'registry',
+    'REGISTRY': 'registry',
+    'method_info': 'registry',
+    'find_methods': 'registry',
+}
+
+__all__ = list(_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _ATTRIBUTES:
+        value = getattr(importlib.import_module(f'.{_ATTRIBUTES[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    if name in _ATTRIBUTES.values() or name == 'mcda_method':
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_ATTRIBUTES))
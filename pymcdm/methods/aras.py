@@ -6,7 +6,7 @@ from .mcda_method import MCDA_method
 
 
 class ARAS(MCDA_method):
-    def __init__(self, normalization_function=normalizations.sum_normalization):
+    def __init__(self, normalization_function=normalizations.sum_normalization, dtype=None):
         """Create ARAS method object, using normaliztion `normalization_function`.
 
         Parameters
@@ -15,10 +15,15 @@ class ARAS(MCDA_method):
                 Function which should be used to normalize `matrix` columns. It should match signature `foo(x, cost)`,
                 where `x` is a vector which should be normalized and `cost` is a bool variable which says if `x` is a
                 cost or profit criterion.
+
+            dtype : None or data-type
+                Floating point type of the computations, e.g. `np.float32`.
+                If None, type of the decision matrix is used (float64 for integer matrices).
         """
         self.normalization = normalization_function
+        self.dtype = dtype
 
-    def __call__(self, matrix, weights, types, *args, **kwargs):
+    def __call__(self, matrix, weights, types, *args, out=None, workspace=None, **kwargs):
         """Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
         Parameters
@@ -29,43 +34,124 @@ class ARAS(MCDA_method):
 
             weights : ndarray
                 Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+                Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+                in this case preferences are returned with shape (K, n).
 
-            types : ndarray
+            types : ndarray or list
                 Array with definitions of criteria types:
                 1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
 
+            out : None or ndarray
+                Array for preferences with shape (n,) or (K, n). If None, new array is created.
+
+            workspace : None or Workspace
+                Workspace with buffers for large intermediate arrays, which are reused between calls.
+                See `pymcdm.methods.Workspace`.
+
             *args and **kwargs are necessary for methods which reqiure some additional data.
 
         Returns
         -------
             ndarray
                 Preference values for alternatives. Better alternatives have higher values.
+
+        Examples
+        --------
+            Criteria types could be given as a list:
+
+            >>> import numpy as np
+            >>> from pymcdm.methods import ARAS
+            >>> matrix = np.array([[1., 2, 3], [3, 1, 2], [2, 3, 1]])
+            >>> weights = np.array([0.5, 0.3, 0.2])
+            >>> np.allclose(ARAS()(matrix, weights, [1, -1, 1]), ARAS()(matrix, weights, np.array([1, -1, 1])))
+            True
+        """
+        types = ARAS._validate_input_data(matrix, weights, types)
+        matrix, weights = self._as_float(matrix, weights)
+        nmatrix = ARAS._aras_fit(matrix, types, self.normalization, workspace)
+        return ARAS._write_out(ARAS._aras_score(nmatrix, weights), out)
+
+    def batch(self, matrices, weights, types, *args, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`, with criteria weights `weights` and criteria
+        types `types`.
+
+        Parameters
+        ----------
+            matrices : ndarray
+                Stack of decision matrices with shape (B, n, m).
+                Alternatives are in rows and Criteria are in columns of each matrix.
+
+            weights : ndarray
+                Criteria weights for each problem with shape (B, m).
+
+            types : ndarray
+                Array with definitions of criteria types, shared by all problems:
+                1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+        Returns
+        -------
+            ndarray
+                Preference values with shape (B, n). Better alternatives have higher values.
+        """
+        types = ARAS._validate_batch_input_data(matrices, weights, types)
+        matrices, weights = self._as_float(matrices, weights)
+        return ARAS._aras(matrices, weights, types, self.normalization)
+
+    def fit(self, matrix, types, *args, **kwargs):
+        """Extend decision matrix `matrix` with the optimal alternative and normalize it.
+        See `MCDA_method.fit` for details.
         """
-        ARAS._validate_input_data(matrix, weights, types)
-        return ARAS._aras(matrix, weights, types, self.normalization)
+        types = ARAS._validate_fit_input_data(matrix, types)
+        matrix = matrix.astype(self._float_dtype(matrix), copy=False)
+        self._set_fitted(ARAS._aras_fit(matrix, types, self.normalization), matrix.shape[1], matrix.dtype)
+        return self
+
+    def score(self, weights, rows=None, *args, **kwargs):
+        """Rank alternatives from the fitted decision matrix, with criteria weights `weights`.
+        See `MCDA_method.score` for details.
+        """
+        return ARAS._aras_score(*self._get_fitted(weights), rows)
+
+    def _stream_chunks(self, matrix, weights, types, *args, chunk_size=65536, **kwargs):
+        types = ARAS._validate_input_data(matrix, weights, types)
+        weights = np.asarray(weights, dtype=self._float_dtype(matrix))
+        stats = normalizations._chunked_column_stats(matrix, chunk_size)
+
+        # Optimal alternative extends the decision matrix, so it is included in the statistics
+        optimal = np.where(types == 1, stats['max'], stats['min'])[np.newaxis]
+        stats = normalizations._merge_column_stats(stats, normalizations._column_stats(optimal))
+        n_optimal = normalizations._normalize_with_stats(optimal, self.normalization, types, stats, weights.dtype)
+
+        for i in range(0, matrix.shape[0], chunk_size):
+            nmatrix = normalizations._normalize_with_stats(matrix[i:i + chunk_size], self.normalization, types, stats, weights.dtype)
+            yield i, ARAS._aras_score(np.concatenate((n_optimal, nmatrix)), weights)
 
     @staticmethod
     def _aras(matrix, weights, types, normalization):
-        n, m = matrix.shape
+        return ARAS._aras_score(ARAS._aras_fit(matrix, types, normalization), weights)
 
-        # Extended initial decision matrix
-        exmatrix = np.zeros((n + 1, m))
-        exmatrix[1:] = matrix
+    @staticmethod
+    def _aras_fit(matrix, types, normalization, workspace=None):
+        *b, n, m = matrix.shape
+
+        # Extended initial decision matrix, it is normalized in place
+        exmatrix = ARAS._buffer(workspace, 'exmatrix', (*b, n + 1, m), matrix.dtype)
+        exmatrix[..., 1:, :] = matrix
+        exmatrix[..., 0, :] = np.where(types == 1, np.max(matrix, axis=-2), np.min(matrix, axis=-2))
 
-        for i in range(m):
-            if types[i] == 1:
-                exmatrix[0, i] = np.max(matrix[:, i])
-            else:
-                exmatrix[0, i] = np.min(matrix[:, i])
+        return normalizations.normalize_matrix(exmatrix, normalization, types, out=exmatrix)
 
-        # Every row of nmatrix is multiplayed by weights
-        nmatrix = normalizations.normalize_matrix(exmatrix, normalization, types)
-        weighted_matrix = nmatrix * weights
+    @staticmethod
+    def _aras_score(nmatrix, weights, rows=None):
+        alts = nmatrix[..., 1:, :]
+        if rows is not None:
+            alts = alts[..., rows, :]
 
-        # Values of optimality function
-        S = weighted_matrix.sum(axis=1)
+        # Values of optimality function for the optimal alternative and the others
+        S0 = ARAS._weighted_sum(nmatrix[..., :1, :], weights)
+        S = ARAS._weighted_sum(alts, weights)
 
         # Utility degree
-        K = S[1:] / S[0]
+        K = S / S0
 
         return K
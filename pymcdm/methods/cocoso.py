@@ -6,7 +6,7 @@ from .mcda_method import MCDA_method
 
 
 class COCOSO(MCDA_method):
-    def __init__(self, normalization_function=normalizations.minmax_normalization):
+    def __init__(self, normalization_function=normalizations.minmax_normalization, dtype=None):
         """Create COCOSO method object, using normaliztion `normalization_function`.
 
         Parameters
@@ -15,10 +15,15 @@ class COCOSO(MCDA_method):
                 Function which should be used to normalize `matrix` columns. It should match signature `foo(x, cost)`,
                 where `x` is a vector which should be normalized and `cost` is a bool variable which says if `x` is
                 a cost or profit criterion.
+
+            dtype : None or data-type
+                Floating point type of the computations, e.g. `np.float32`.
+                If None, type of the decision matrix is used (float64 for integer matrices).
         """
         self.normalization = normalization_function
+        self.dtype = dtype
 
-    def __call__(self, matrix, weights, types, l=0.5, *args, **kwargs):
+    def __call__(self, matrix, weights, types, l=0.5, *args, out=None, **kwargs):
         """Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
         Parameters
@@ -29,6 +34,8 @@ class COCOSO(MCDA_method):
 
             weights : ndarray
                 Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+                Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+                in this case preferences are returned with shape (K, n).
 
             types : ndarray
                 Array with definitions of criteria types:
@@ -37,6 +44,9 @@ class COCOSO(MCDA_method):
             l: value
                 The value of balanced compromise. It must be from the interval [0, 1].
 
+            out : None or ndarray
+                Array for preferences with shape (n,) or (K, n). If None, new array is created.
+
             *args and **kwargs are necessary for methods which reqiure some additional data.
 
         Returns
@@ -44,23 +54,79 @@ class COCOSO(MCDA_method):
             ndarray
                 Preference values for alternatives. Better alternatives have higher values.
         """
-        COCOSO._validate_input_data(matrix, weights, types)
+        types = COCOSO._validate_input_data(matrix, weights, types)
+        matrix, weights = self._as_float(matrix, weights)
+        if self.normalization is not None:
+            nmatrix = normalizations.normalize_matrix(matrix, self.normalization, types)
+        else:
+            nmatrix = normalizations.normalize_matrix(matrix, normalizations.minmax_normalization, types)
+        return COCOSO._write_out(COCOSO._cocoso(nmatrix, weights, l), out)
+
+    def batch(self, matrices, weights, types, l=0.5, *args, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`, with criteria weights `weights` and criteria
+        types `types`.
+
+        Parameters
+        ----------
+            matrices : ndarray
+                Stack of decision matrices with shape (B, n, m).
+                Alternatives are in rows and Criteria are in columns of each matrix.
+
+            weights : ndarray
+                Criteria weights for each problem with shape (B, m).
+
+            types : ndarray
+                Array with definitions of criteria types, shared by all problems:
+                1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+            l: value
+                The value of balanced compromise. It must be from the interval [0, 1].
+
+        Returns
+        -------
+            ndarray
+                Preference values with shape (B, n). Better alternatives have higher values.
+        """
+        types = COCOSO._validate_batch_input_data(matrices, weights, types)
+        matrices, weights = self._as_float(matrices, weights)
+        if self.normalization is not None:
+            nmatrices = normalizations.normalize_matrix(matrices, self.normalization, types)
+        else:
+            nmatrices = normalizations.normalize_matrix(matrices, normalizations.minmax_normalization, types)
+        return COCOSO._cocoso(nmatrices, weights, l)
+
+    def fit(self, matrix, types, *args, **kwargs):
+        """Normalize decision matrix `matrix` for later scoring.
+        See `MCDA_method.fit` for details.
+        """
+        types = COCOSO._validate_fit_input_data(matrix, types)
+        matrix = matrix.astype(self._float_dtype(matrix), copy=False)
         if self.normalization is not None:
             nmatrix = normalizations.normalize_matrix(matrix, self.normalization, types)
         else:
             nmatrix = normalizations.normalize_matrix(matrix, normalizations.minmax_normalization, types)
-        return COCOSO._cocoso(nmatrix, weights, l)
+        self._set_fitted(nmatrix, matrix.shape[1], matrix.dtype)
+        return self
+
+    def score(self, weights, rows=None, l=0.5, *args, **kwargs):
+        """Rank alternatives from the fitted decision matrix, with criteria weights `weights`.
+        See `MCDA_method.score` for details, `l` is the same as in `__call__`.
+        """
+        # Score strategies are relative to all alternatives, so all of them are scored
+        ksi = COCOSO._cocoso(*self._get_fitted(weights), l)
+        return ksi if rows is None else ksi[..., rows]
 
     @staticmethod
     def _cocoso(nmatrix, weights, l=0.5):
         # Vectors of S and P
-        S = np.sum(nmatrix * weights, axis=1)
-        P = np.sum(nmatrix ** weights, axis=1)
+        S = COCOSO._weighted_sum(nmatrix, weights)
+        P = np.sum(nmatrix ** weights[..., np.newaxis, :], axis=-1)
 
         # Calculate score strategies
-        ksi_a = (P + S) / np.sum(P + S, axis=0)
-        ksi_b = S / np.min(S) + P / np.min(P)
-        ksi_c = (l * S + (1 - l) * P) / (l * np.max(S) + (1 - l) * np.max(P))
+        ksi_a = (P + S) / np.sum(P + S, axis=-1, keepdims=True)
+        ksi_b = S / np.min(S, axis=-1, keepdims=True) + P / np.min(P, axis=-1, keepdims=True)
+        ksi_c = (l * S + (1 - l) * P) / (l * np.max(S, axis=-1, keepdims=True)
+                                         + (1 - l) * np.max(P, axis=-1, keepdims=True))
 
         # Compute the prefomance score
         ksi = np.power(ksi_a * ksi_b * ksi_c, 1/3) + 1/3 * (ksi_a + ksi_b + ksi_c)
@@ -1,18 +1,19 @@
 # Copyright (c) 2021 Bartłomiej Kizielewicz
 
 import numpy as np
+from .. import jit
 from .. import normalizations
 from .mcda_method import MCDA_method
 
+_TAU = 0.02
 
-def _psi(x, tau=0.02):
-    if np.abs(x) >= tau:
-        return 1
-    return 0
+
+def _psi(x, tau=_TAU):
+    return (np.abs(x) >= tau).astype(x.dtype)
 
 
 class CODAS(MCDA_method):
-    def __init__(self, normalization_function=normalizations.linear_normalization):
+    def __init__(self, normalization_function=normalizations.linear_normalization, dtype=None):
         """Create CODAS method object, using normaliztion `normalization_function`.
 
         Parameters
@@ -21,10 +22,15 @@ class CODAS(MCDA_method):
                 Function which should be used to normalize `matrix` columns. It should match signature `foo(x, cost)`,
                 where `x` is a vector which should be normalized and `cost` is a bool variable which says if `x` is a
                 cost or profit criterion.
+
+            dtype : None or data-type
+                Floating point type of the computations, e.g. `np.float32`.
+                If None, type of the decision matrix is used (float64 for integer matrices).
         """
         self.normalization = normalization_function
+        self.dtype = dtype
 
-    def __call__(self, matrix, weights, types, *args, **kwargs):
+    def __call__(self, matrix, weights, types, *args, out=None, **kwargs):
         """Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
         Parameters
@@ -35,11 +41,16 @@ class CODAS(MCDA_method):
 
             weights : ndarray
                 Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+                Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+                in this case preferences are returned with shape (K, n).
 
             types : ndarray
                 Array with definitions of criteria types:
                 1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
 
+            out : None or ndarray
+                Array for preferences with shape (n,) or (K, n). If None, new array is created.
+
             *args and **kwargs are necessary for methods which reqiure some additional data.
 
         Returns
@@ -47,30 +58,93 @@ class CODAS(MCDA_method):
             ndarray
                 Preference values for alternatives. Better alternatives have higher values.
         """
-        CODAS._validate_input_data(matrix, weights, types)
+        types = CODAS._validate_input_data(matrix, weights, types)
+        matrix, weights = self._as_float(matrix, weights)
         if self.normalization is not None:
             nmatrix = normalizations.normalize_matrix(matrix, self.normalization, types)
         else:
             nmatrix = normalizations.normalize_matrix(matrix, normalizations.linear_normalization, types)
-        return CODAS._codas(nmatrix, weights)
+        return CODAS._write_out(CODAS._codas(nmatrix, weights), out)
+
+    def batch(self, matrices, weights, types, *args, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`, with criteria weights `weights` and criteria
+        types `types`.
+
+        Parameters
+        ----------
+            matrices : ndarray
+                Stack of decision matrices with shape (B, n, m).
+                Alternatives are in rows and Criteria are in columns of each matrix.
+
+            weights : ndarray
+                Criteria weights for each problem with shape (B, m).
+
+            types : ndarray
+                Array with definitions of criteria types, shared by all problems:
+                1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+        Returns
+        -------
+            ndarray
+                Preference values with shape (B, n). Better alternatives have higher values.
+        """
+        types = CODAS._validate_batch_input_data(matrices, weights, types)
+        matrices, weights = self._as_float(matrices, weights)
+        if self.normalization is not None:
+            nmatrices = normalizations.normalize_matrix(matrices, self.normalization, types)
+        else:
+            nmatrices = normalizations.normalize_matrix(matrices, normalizations.linear_normalization, types)
+        return CODAS._codas(nmatrices, weights)
+
+    def fit(self, matrix, types, *args, **kwargs):
+        """Normalize decision matrix `matrix` and compute distances of alternatives to NIS for each criterion.
+        See `MCDA_method.fit` for details.
+        """
+        types = CODAS._validate_fit_input_data(matrix, types)
+        matrix = matrix.astype(self._float_dtype(matrix), copy=False)
+        if self.normalization is not None:
+            nmatrix = normalizations.normalize_matrix(matrix, self.normalization, types)
+        else:
+            nmatrix = normalizations.normalize_matrix(matrix, normalizations.linear_normalization, types)
+        self._set_fitted(CODAS._codas_fit(nmatrix), matrix.shape[1], matrix.dtype)
+        return self
+
+    def score(self, weights, rows=None, *args, **kwargs):
+        """Rank alternatives from the fitted decision matrix, with criteria weights `weights`.
+        See `MCDA_method.score` for details.
+        """
+        return CODAS._codas_score(*self._get_fitted(weights), rows)
 
     @staticmethod
     def _codas(nmatrix, weights):
-        # Every row of nmatrix is multiplayed by weights
-        weighted_matrix = nmatrix * weights
-        n, m = weighted_matrix.shape
+        return CODAS._codas_score(CODAS._codas_fit(nmatrix), weights)
 
-        # Vector of NIS
-        nis = np.min(weighted_matrix, axis=0)
-
-        # Euclidean and Taxicab distances from negative-ideal solution
-        E = np.sqrt(np.sum((weighted_matrix - nis) ** 2, axis=1))
-        T = np.sum(np.abs(weighted_matrix - nis), axis=1)
+    @staticmethod
+    def _codas_fit(nmatrix):
+        # Vector of NIS. Weights are non-negative, so NIS of the weighted
+        # matrix is weighted NIS of `nmatrix`
+        nis = np.min(nmatrix, axis=-2, keepdims=True)
+        return (nmatrix - nis) ** 2, np.abs(nmatrix - nis)
 
-        # Construct the relative assessment matrix
-        h = np.zeros((n, n))
-        for i in range(n):
-            for j in range(n):
-                h[i, j] = (E[i] - E[j]) + (_psi(E[i] - E[j]) * (T[i] - T[j]))
+    @staticmethod
+    def _codas_score(state, weights, rows=None):
+        E2, T1 = state
 
-        return np.sum(h, axis=1)
\ No newline at end of file
+        # Euclidean and Taxicab distances from negative-ideal solution
+        E = np.sqrt(CODAS._weighted_sum(E2, weights ** 2))
+        T = CODAS._weighted_sum(T1, weights)
+
+        if jit.enabled and E.ndim == 1 and rows is None:
+            return jit.codas_scores(E, T, _TAU)
+
+        # Construct the relative assessment matrix, only for selected alternatives.
+        # It is built for blocks of rows, so it is never stored whole
+        Ei, Ti = (E, T) if rows is None else (E[..., rows], T[..., rows])
+        pref = np.empty(Ei.shape, dtype=E.dtype)
+        block = max(1, 2 ** 22 // E.size)
+        for s in range(0, Ei.shape[-1], block):
+            dE = Ei[..., s:s + block, np.newaxis] - E[..., np.newaxis, :]
+            dT = Ti[..., s:s + block, np.newaxis] - T[..., np.newaxis, :]
+            h = dE + _psi(dE) * dT
+            pref[..., s:s + block] = np.sum(h, axis=-1)
+        return pref
\ No newline at end of file
@@ -1,17 +1,17 @@
 # Copyright (c) 2020 Andrii Shekhovtsov
 
 from itertools import product
-from functools import reduce
 
 import numpy as np
 
+from .. import jit
 from .mcda_method import MCDA_method
 from .topsis import TOPSIS
 
 
 def _TFN(a, m, b):
     def tfn(x):
-        res = np.zeros(x.shape)
+        res = np.zeros(x.shape, dtype=x.dtype)
         mask = x == m
         res[mask] = 1
 
@@ -25,7 +25,7 @@ def _TFN(a, m, b):
 
 
 class COMET(MCDA_method):
-    def __init__(self, cvalues, rate_function=None, expert_function=None):
+    def __init__(self, cvalues, rate_function=None, expert_function=None, dtype=None):
         """Initialize COMET model. It creates CO and rank them using `ranking_method`.
 
 Parameters
@@ -48,6 +48,10 @@ Parameters
            if this CO are equaly prefered return 0.5
 
     If both ranking_method and expert_function are provided, expert_function is preffered.
+
+    dtype : None or data-type
+        Floating point type of the computations, e.g. `np.float32`.
+        If None, type of the decision matrix is used (float64 for integer matrices).
 """
         # Validate input
         for i, cv in enumerate(cvalues):
@@ -86,13 +90,14 @@ Parameters
             p[ind] = (k - i) / (k - 1)
             sj[ind] = 0
 
+        self.dtype = dtype
         self.criterion_number = len(cvalues)
         self.cvalues = cvalues
         self.p = p
         self.tfns = [COMET._make_tfns(chv) for chv in cvalues]
 
 
-    def __call__(self, alts, *args, **kwargs):
+    def __call__(self, alts, *args, out=None, **kwargs):
         """Rank alternatives from decision matrix `alts`, with criteria weights `weights` and criteria types `types`.
 
 Parameters
@@ -101,6 +106,9 @@ Parameters
         Decision matrix / alternatives data.
         Alternatives are in rows and Criteria are in columns.
 
+    out : None or ndarray
+        Array for preferences with shape (n,). If None, new array is created.
+
     *args and **kwargs are necessary for methods which reqiure some additional data.
 
 Returns
@@ -113,16 +121,83 @@ Returns
                     'Number of criteria in decision matrix must be equal to number of criteria in characteristic values.'
                 )
 
-        tfns = self.tfns
+        alts = alts.astype(self._float_dtype(alts), copy=False)
+        if jit.enabled:
+            cvalues = np.concatenate(self.cvalues).astype(alts.dtype)
+            offsets = np.cumsum([0] + [len(cv) for cv in self.cvalues])
+            pref = jit.comet_preferences(alts, cvalues, offsets, self.p.astype(alts.dtype))
+        else:
+            pref = COMET._comet(alts, self.cvalues, self.p.astype(alts.dtype))
+        return COMET._write_out(pref, out)
 
-        pref_level_vectors = [[tfn(values) for tfn in tfns_icrit]
-                              for values, tfns_icrit in zip(alts.T, tfns)]
+    def batch(self, matrices, *args, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`.
 
-        tfns_values_product = product(*pref_level_vectors)
-        multiplayed_co = (reduce(lambda a, b: a*b, co_values) * p
-                          for p, co_values in zip(self.p, tfns_values_product))
-        return sum(multiplayed_co)
+Parameters
+----------
+    matrices : ndarray
+        Stack of decision matrices with shape (B, n, m).
+        Alternatives are in rows and Criteria are in columns of each matrix.
 
+    *args and **kwargs are necessary for methods which reqiure some additional data.
+
+Returns
+-------
+    ndarray
+        Preference values with shape (B, n). Better alternatives have higher values.
+"""
+        if matrices.ndim != 3:
+            raise ValueError(f'Stack of decision matrices should have 3 dimensions (B, n, m), but has {matrices.ndim}.')
+
+        # Preference of each alternative depends only on its own values,
+        # so all problems are evaluated at once as one big decision matrix
+        B, n, m = matrices.shape
+        return self(matrices.reshape(B * n, m)).reshape(B, n)
+
+    def stream(self, alts, *args, out=None, chunk_size=65536, **kwargs):
+        """Rank alternatives from decision matrix `alts`, processing it in row chunks.
+COMET does not need column statistics, so `alts` is read once. See `MCDA_method.stream` for details.
+"""
+        if out is None:
+            out = np.empty(alts.shape[0], dtype=self._float_dtype(alts))
+        for i, pref in self._stream_chunks(alts, chunk_size=chunk_size):
+            out[i:i + chunk_size] = pref
+        return out
+
+    def _stream_chunks(self, alts, *args, chunk_size=65536, **kwargs):
+        for i in range(0, alts.shape[0], chunk_size):
+            yield i, self(alts[i:i + chunk_size])
+
+    @staticmethod
+    def _comet(alts, cvalues, p):
+        # Each alternative has nonzero membership only to two TFNs of each criterion, which are
+        # adjacent characteristic values of the cell containing it. So only 2^m characteristic
+        # objects in the corners of the cell are evaluated, instead of all of them.
+        n, m = alts.shape
+        index = np.empty((n, m), dtype=int)
+        lower = np.empty((n, m), dtype=alts.dtype)
+        upper = np.empty((n, m), dtype=alts.dtype)
+        inside = np.ones(n, dtype=bool)
+        for c, cv in enumerate(cvalues):
+            cv = np.asarray(cv, dtype=alts.dtype)
+            x = alts[:, c]
+            inside &= (cv[0] <= x) & (x <= cv[-1])
+            k = np.clip(np.searchsorted(cv, x, side='right') - 1, 0, cv.shape[0] - 2)
+            span = cv[k + 1] - cv[k]
+            index[:, c] = k
+            lower[:, c] = (cv[k + 1] - x) / span
+            upper[:, c] = (x - cv[k]) / span
+
+        # Characteristic objects are ordered as in `product` of characteristic values
+        sizes = [len(cv) for cv in cvalues]
+        strides = np.array([int(np.prod(sizes[c + 1:])) for c in range(m)])
+        pref = np.zeros(n, dtype=alts.dtype)
+        for corner in product((0, 1), repeat=m):
+            corner = np.array(corner, dtype=bool)
+            w = np.prod(np.where(corner, upper, lower), axis=1)
+            pref += w * p[(index + corner) @ strides]
+        pref[~inside] = 0
+        return pref
 
     @staticmethod
     def _build_mej(co, expert_function):
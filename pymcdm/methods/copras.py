@@ -1,14 +1,22 @@
 # Copyright (c) 2020 Andrii Shekhovtsov
 
 import numpy as np
+from .. import normalizations
 from .mcda_method import MCDA_method
 
 class COPRAS(MCDA_method):
-    def __init__(self):
-        """Create COPRAS method object."""
-        pass
+    def __init__(self, dtype=None):
+        """Create COPRAS method object.
 
-    def __call__(self, matrix, weights, types, *args, **kwargs):
+Parameters
+----------
+    dtype : None or data-type
+        Floating point type of the computations, e.g. `np.float32`.
+        If None, type of the decision matrix is used (float64 for integer matrices).
+"""
+        self.dtype = dtype
+
+    def __call__(self, matrix, weights, types, *args, out=None, **kwargs):
         """Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
 Parameters
@@ -19,11 +27,16 @@ Parameters
 
     weights : ndarray
         Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+        Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+        in this case preferences are returned with shape (K, n).
 
     types : ndarray
         Array with definitions of criteria types:
         1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
 
+    out : None or ndarray
+        Array for preferences with shape (n,) or (K, n). If None, new array is created.
+
     *args and **kwargs are necessary for methods which reqiure some additional data.
 
 Returns
@@ -31,22 +44,118 @@ Returns
     ndarray
         Preference values for alternatives. Better alternatives have higher values.
 """
-        COPRAS._validate_input_data(matrix, weights, types)
+        types = COPRAS._validate_input_data(matrix, weights, types)
+        matrix, weights = self._as_float(matrix, weights)
+        COPRAS._validate_types(types)
+        return COPRAS._write_out(COPRAS._copras(matrix, weights, types), out)
+
+    def batch(self, matrices, weights, types, *args, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`, with criteria weights `weights` and criteria types `types`.
+
+Parameters
+----------
+    matrices : ndarray
+        Stack of decision matrices with shape (B, n, m).
+        Alternatives are in rows and Criteria are in columns of each matrix.
+
+    weights : ndarray
+        Criteria weights for each problem with shape (B, m).
+
+    types : ndarray
+        Array with definitions of criteria types, shared by all problems:
+        1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+Returns
+-------
+    ndarray
+        Preference values with shape (B, n). Better alternatives have higher values.
+"""
+        types = COPRAS._validate_batch_input_data(matrices, weights, types)
+        matrices, weights = self._as_float(matrices, weights)
+        COPRAS._validate_types(types)
+        return COPRAS._copras(matrices, weights, types)
+
+    def fit(self, matrix, types, *args, **kwargs):
+        """Normalize decision matrix `matrix` by the sums of criteria values.
+See `MCDA_method.fit` for details.
+"""
+        types = COPRAS._validate_fit_input_data(matrix, types)
+        matrix = matrix.astype(self._float_dtype(matrix), copy=False)
+        COPRAS._validate_types(types)
+        self._set_fitted((COPRAS._copras_fit(matrix), types), matrix.shape[1], matrix.dtype)
+        return self
+
+    def score(self, weights, rows=None, *args, **kwargs):
+        """Rank alternatives from the fitted decision matrix, with criteria weights `weights`.
+See `MCDA_method.score` for details.
+"""
+        (nmatrix, types), weights = self._get_fitted(weights)
+        # Relative significance depends on all alternatives, so all of them are scored
+        Q = COPRAS._copras_score(nmatrix, weights, types)
+        return Q if rows is None else Q[..., rows]
+
+    def _stream_chunks(self, matrix, weights, types, *args, chunk_size=65536, **kwargs):
+        # Relative significance depends on sums over all alternatives and it is normalized by its maximum,
+        # so `matrix` is read in two more passes, for the sums and for the maximum
+        types = COPRAS._validate_input_data(matrix, weights, types)
+        weights = np.asarray(weights, dtype=self._float_dtype(matrix))
+        COPRAS._validate_types(types)
+        stats = normalizations._chunked_column_stats(matrix, chunk_size)
+        sums = stats['sum'].astype(weights.dtype)
+
+        def chunk_sums(i):
+            return COPRAS._copras_sums(matrix[i:i + chunk_size].astype(weights.dtype) / sums, weights, types)
+
+        n = matrix.shape[0]
+        Sm_min, Sm_sum, Sm_inv_sum = None, 0, 0
+        for i in range(0, n, chunk_size):
+            _, Sm = chunk_sums(i)
+            chunk_min = np.min(Sm, axis=-1, keepdims=True)
+            Sm_min = chunk_min if Sm_min is None else np.minimum(Sm_min, chunk_min)
+            Sm_sum = Sm_sum + np.sum(Sm, axis=-1, keepdims=True)
+            Sm_inv_sum = Sm_inv_sum + np.sum(1 / Sm, axis=-1, keepdims=True)
+
+        Q_max = None
+        for i in range(0, n, chunk_size):
+            Q = COPRAS._copras_q(*chunk_sums(i), Sm_min, Sm_sum, Sm_inv_sum)
+            chunk_max = np.max(Q, axis=-1, keepdims=True)
+            Q_max = chunk_max if Q_max is None else np.maximum(Q_max, chunk_max)
+
+        for i in range(0, n, chunk_size):
+            yield i, COPRAS._copras_q(*chunk_sums(i), Sm_min, Sm_sum, Sm_inv_sum) / Q_max
+
+    @staticmethod
+    def _validate_types(types):
         if np.all(types == 1.0):
             raise ValueError('types array contains only profit criteria. COPRAS method requires at least one cost criteria.')
-        return COPRAS._copras(matrix, weights, types)
 
     @staticmethod
     def _copras(matrix, weights, cryteria_types):
-        nmatrix = matrix / np.sum(matrix, axis=0)
+        return COPRAS._copras_score(COPRAS._copras_fit(matrix), weights, cryteria_types)
+
+    @staticmethod
+    def _copras_fit(matrix):
+        return matrix / np.sum(matrix, axis=-2, keepdims=True)
 
-        # Difficult normalized decision making matrix
-        wmatrix = nmatrix * weights
+    @staticmethod
+    def _copras_score(nmatrix, weights, cryteria_types):
+        Sp, Sm = COPRAS._copras_sums(nmatrix, weights, cryteria_types)
+
+        Sm_min = np.min(Sm, axis=-1, keepdims=True)
+        Q = COPRAS._copras_q(Sp, Sm, Sm_min, np.sum(Sm, axis=-1, keepdims=True), np.sum(1 / Sm, axis=-1, keepdims=True))
 
-        Sp = np.sum(wmatrix[:, cryteria_types == 1], axis=1)
-        Sm = np.sum(wmatrix[:, cryteria_types == -1], axis=1)
+        return Q / np.max(Q, axis=-1, keepdims=True)
 
-        Q = Sp + ((np.min(Sm) * np.sum(Sm))\
-                / (Sm * np.sum(np.min(Sm) / Sm)))
+    @staticmethod
+    def _copras_sums(nmatrix, weights, cryteria_types):
+        # Sums of weighted normalized profit and cost criteria
+        profit = cryteria_types == 1
+        cost = cryteria_types == -1
+        Sp = COPRAS._weighted_sum(nmatrix[..., profit], weights[..., profit])
+        Sm = COPRAS._weighted_sum(nmatrix[..., cost], weights[..., cost])
+        return Sp, Sm
 
-        return Q / np.max(Q)
+    @staticmethod
+    def _copras_q(Sp, Sm, Sm_min, Sm_sum, Sm_inv_sum):
+        # Relative significance, sum(Sm_min / Sm) is computed as Sm_min * sum(1 / Sm)
+        return Sp + ((Sm_min * Sm_sum) / (Sm * Sm_min * Sm_inv_sum))
@@ -1,15 +1,23 @@
 # Copyright (c) 2021 Bartłomiej Kizielewicz
 
 import numpy as np
+from .. import normalizations
 from .mcda_method import MCDA_method
 
 
 class EDAS(MCDA_method):
-    def __init__(self):
-        """Create EDAS method object."""
-        pass
-
-    def __call__(self, matrix, weights, types, *args, **kwargs):
+    def __init__(self, dtype=None):
+        """Create EDAS method object.
+
+        Parameters
+        ----------
+            dtype : None or data-type
+                Floating point type of the computations, e.g. `np.float32`.
+                If None, type of the decision matrix is used (float64 for integer matrices).
+        """
+        self.dtype = dtype
+
+    def __call__(self, matrix, weights, types, *args, out=None, **kwargs):
         """Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
     Parameters
@@ -20,11 +28,16 @@ class EDAS(MCDA_method):
 
         weights : ndarray
             Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+            Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+            in this case preferences are returned with shape (K, n).
 
         types : ndarray
             Array with definitions of criteria types:
             1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
 
+        out : None or ndarray
+            Array for preferences with shape (n,) or (K, n). If None, new array is created.
+
         *args and **kwargs are necessary for methods which reqiure some additional data.
 
     Returns
@@ -32,33 +45,106 @@ class EDAS(MCDA_method):
         ndarray
             Preference values for alternatives. Better alternatives have higher values.
     """
-        EDAS._validate_input_data(matrix, weights, types)
-        return EDAS._edas(matrix, weights, types)
+        types = EDAS._validate_input_data(matrix, weights, types)
+        matrix, weights = self._as_float(matrix, weights)
+        return EDAS._write_out(EDAS._edas(matrix, weights, types), out)
+
+    def batch(self, matrices, weights, types, *args, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`, with criteria weights `weights` and criteria
+        types `types`.
+
+        Parameters
+        ----------
+            matrices : ndarray
+                Stack of decision matrices with shape (B, n, m).
+                Alternatives are in rows and Criteria are in columns of each matrix.
+
+            weights : ndarray
+                Criteria weights for each problem with shape (B, m).
+
+            types : ndarray
+                Array with definitions of criteria types, shared by all problems:
+                1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+        Returns
+        -------
+            ndarray
+                Preference values with shape (B, n). Better alternatives have higher values.
+        """
+        types = EDAS._validate_batch_input_data(matrices, weights, types)
+        matrices, weights = self._as_float(matrices, weights)
+        return EDAS._edas(matrices, weights, types)
+
+    def fit(self, matrix, types, *args, **kwargs):
+        """Compute positive and negative distances of alternatives from the average solution.
+        See `MCDA_method.fit` for details.
+        """
+        types = EDAS._validate_fit_input_data(matrix, types)
+        matrix = matrix.astype(self._float_dtype(matrix), copy=False)
+        self._set_fitted(EDAS._edas_fit(matrix, types), matrix.shape[1], matrix.dtype)
+        return self
+
+    def score(self, weights, rows=None, *args, **kwargs):
+        """Rank alternatives from the fitted decision matrix, with criteria weights `weights`.
+        See `MCDA_method.score` for details.
+        """
+        # Weighted sums are normalized by their maximums over all alternatives
+        pref = EDAS._edas_score(*self._get_fitted(weights))
+        return pref if rows is None else pref[..., rows]
+
+    def _stream_chunks(self, matrix, weights, types, *args, chunk_size=65536, **kwargs):
+        # Weighted sums are normalized by their maximums over all alternatives, which are found in one more pass
+        types = EDAS._validate_input_data(matrix, weights, types)
+        weights = np.asarray(weights, dtype=self._float_dtype(matrix))
+        stats = normalizations._chunked_column_stats(matrix, chunk_size)
+        amatrix = (stats['sum'] / stats['n']).astype(weights.dtype)
+
+        def sums(i):
+            chunk = matrix[i:i + chunk_size].astype(weights.dtype)
+            return EDAS._edas_sums(EDAS._edas_distances(chunk, amatrix, types), weights)
+
+        n = matrix.shape[0]
+        sp_max = sn_max = None
+        for i in range(0, n, chunk_size):
+            sp, sn = sums(i)
+            sp, sn = np.max(sp, axis=-1, keepdims=True), np.max(sn, axis=-1, keepdims=True)
+            sp_max = sp if sp_max is None else np.maximum(sp_max, sp)
+            sn_max = sn if sn_max is None else np.maximum(sn_max, sn)
+
+        for i in range(0, n, chunk_size):
+            yield i, EDAS._edas_pref(*sums(i), sp_max, sn_max)
 
     @staticmethod
     def _edas(matrix, weights, types):
-        _, m = matrix.shape
-        amatrix = np.mean(matrix, axis=0)
-
-        pda = np.zeros(matrix.shape)
-        nda = np.zeros(matrix.shape)
+        return EDAS._edas_score(EDAS._edas_fit(matrix, types), weights)
 
-        for j in range(m):
-            if types[j] == -1:
-                pda[:, j] = (amatrix[j] - matrix[:, j]) / amatrix[j]
-                nda[:, j] = (matrix[:, j] - amatrix[j]) / amatrix[j]
+    @staticmethod
+    def _edas_fit(matrix, types):
+        return EDAS._edas_distances(matrix, np.mean(matrix, axis=-2, keepdims=True), types)
 
-            else:
-                pda[:, j] = (matrix[:, j] - amatrix[j]) / amatrix[j]
-                nda[:, j] = (amatrix[j] - matrix[:, j]) / amatrix[j]
+    @staticmethod
+    def _edas_distances(matrix, amatrix, types):
+        cost = np.asarray(types) == -1
+        pda = np.where(cost, amatrix - matrix, matrix - amatrix) / amatrix
+        nda = np.where(cost, matrix - amatrix, amatrix - matrix) / amatrix
 
         pda = np.where(pda >= 0, pda, 0)
         nda = np.where(nda >= 0, nda, 0)
+        return pda, nda
 
-        sp = np.sum(weights * pda, axis=1)
-        sn = np.sum(weights * nda, axis=1)
+    @staticmethod
+    def _edas_score(state, weights):
+        sp, sn = EDAS._edas_sums(state, weights)
+        return EDAS._edas_pref(sp, sn, np.max(sp, axis=-1, keepdims=True), np.max(sn, axis=-1, keepdims=True))
+
+    @staticmethod
+    def _edas_sums(state, weights):
+        pda, nda = state
+        return EDAS._weighted_sum(pda, weights), EDAS._weighted_sum(nda, weights)
 
-        nsp = sp / np.max(sp, axis=0)
-        nsn = 1 - sn / np.max(sn, axis=0)
+    @staticmethod
+    def _edas_pref(sp, sn, sp_max, sn_max):
+        nsp = sp / sp_max
+        nsn = 1 - sn / sn_max
 
         return (nsp + nsn) / 2
@@ -6,7 +6,7 @@ from .mcda_method import MCDA_method
 
 
 class MABAC(MCDA_method):
-    def __init__(self, normalization_function=normalizations.minmax_normalization):
+    def __init__(self, normalization_function=normalizations.minmax_normalization, dtype=None):
         """Create MABAC method object, using normaliztion `normalization_function`.
 
         Parameters
@@ -15,10 +15,15 @@ class MABAC(MCDA_method):
                 Function which should be used to normalize `matrix` columns. It should match signature `foo(x, cost)`,
                 where `x` is a vector which should be normalized and `cost` is a bool variable which says if `x` is a
                 cost or profit criterion.
+
+            dtype : None or data-type
+                Floating point type of the computations, e.g. `np.float32`.
+                If None, type of the decision matrix is used (float64 for integer matrices).
         """
         self.normalization = normalization_function
+        self.dtype = dtype
 
-    def __call__(self, matrix, weights, types, *args, **kwargs):
+    def __call__(self, matrix, weights, types, *args, out=None, **kwargs):
         """Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
         Parameters
@@ -29,11 +34,16 @@ class MABAC(MCDA_method):
 
             weights : ndarray
                 Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+                Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+                in this case preferences are returned with shape (K, n).
 
             types : ndarray
                 Array with definitions of criteria types:
                 1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
 
+            out : None or ndarray
+                Array for preferences with shape (n,) or (K, n). If None, new array is created.
+
             *args and **kwargs are necessary for methods which reqiure some additional data.
 
         Returns
@@ -41,23 +51,103 @@ class MABAC(MCDA_method):
             ndarray
                 Preference values for alternatives. Better alternatives have higher values.
         """
-        MABAC._validate_input_data(matrix, weights, types)
+        types = MABAC._validate_input_data(matrix, weights, types)
+        matrix, weights = self._as_float(matrix, weights)
         if self.normalization is not None:
             nmatrix = normalizations.normalize_matrix(matrix, self.normalization, types)
         else:
             nmatrix = normalizations.normalize_matrix(matrix, normalizations.minmax_normalization, types)
-        return MABAC._mabac(nmatrix, weights)
+        return MABAC._write_out(MABAC._mabac(nmatrix, weights), out)
+
+    def batch(self, matrices, weights, types, *args, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`, with criteria weights `weights` and criteria
+        types `types`.
+
+        Parameters
+        ----------
+            matrices : ndarray
+                Stack of decision matrices with shape (B, n, m).
+                Alternatives are in rows and Criteria are in columns of each matrix.
+
+            weights : ndarray
+                Criteria weights for each problem with shape (B, m).
+
+            types : ndarray
+                Array with definitions of criteria types, shared by all problems:
+                1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+        Returns
+        -------
+            ndarray
+                Preference values with shape (B, n). Better alternatives have higher values.
+        """
+        types = MABAC._validate_batch_input_data(matrices, weights, types)
+        matrices, weights = self._as_float(matrices, weights)
+        if self.normalization is not None:
+            nmatrices = normalizations.normalize_matrix(matrices, self.normalization, types)
+        else:
+            nmatrices = normalizations.normalize_matrix(matrices, normalizations.minmax_normalization, types)
+        return MABAC._mabac(nmatrices, weights)
+
+    def fit(self, matrix, types, *args, **kwargs):
+        """Normalize decision matrix `matrix` and compute distances of alternatives to the border approximation area.
+        See `MCDA_method.fit` for details.
+        """
+        types = MABAC._validate_fit_input_data(matrix, types)
+        matrix = matrix.astype(self._float_dtype(matrix), copy=False)
+        if self.normalization is not None:
+            nmatrix = normalizations.normalize_matrix(matrix, self.normalization, types)
+        else:
+            nmatrix = normalizations.normalize_matrix(matrix, normalizations.minmax_normalization, types)
+        self._set_fitted(MABAC._mabac_fit(nmatrix), matrix.shape[1], matrix.dtype)
+        return self
+
+    def score(self, weights, rows=None, *args, **kwargs):
+        """Rank alternatives from the fitted decision matrix, with criteria weights `weights`.
+        See `MCDA_method.score` for details.
+        """
+        return MABAC._mabac_score(*self._get_fitted(weights), rows)
+
+    def _stream_chunks(self, matrix, weights, types, *args, chunk_size=65536, **kwargs):
+        # The border approximation area requires one more pass over `matrix`
+        types = MABAC._validate_input_data(matrix, weights, types)
+        weights = np.asarray(weights, dtype=self._float_dtype(matrix))
+        normalization = self.normalization
+        if normalization is None:
+            normalization = normalizations.minmax_normalization
+        stats = normalizations._chunked_column_stats(matrix, chunk_size)
+
+        # Geometric mean of the weighted matrix columns is computed from sums of logarithms
+        n = matrix.shape[0]
+        logsum = 0
+        for i in range(0, n, chunk_size):
+            nmatrix = normalizations._normalize_with_stats(matrix[i:i + chunk_size], normalization, types, stats, weights.dtype)
+            logsum = logsum + np.sum(np.log(nmatrix + 1), axis=0, dtype='float')
+        G = np.exp(logsum / n).astype(weights.dtype)
+
+        for i in range(0, n, chunk_size):
+            nmatrix = normalizations._normalize_with_stats(matrix[i:i + chunk_size], normalization, types, stats, weights.dtype)
+            yield i, MABAC._mabac_score(nmatrix + 1 - G, weights)
 
     @staticmethod
     def _mabac(nmatrix, weights):
-        n, m = nmatrix.shape
-        # Calculation of the elements from the weighted matrix
-        weighted_matrix = (nmatrix + 1) * weights
+        return MABAC._mabac_score(MABAC._mabac_fit(nmatrix), weights)
+
+    @staticmethod
+    def _mabac_fit(nmatrix):
+        # Elements of the weighted matrix are (nmatrix + 1) * weights
+        matrix = nmatrix + 1
 
-        # Determining the border approximation area matrix
-        G = np.product(weighted_matrix, axis=0) ** (1 / n)
+        # Determining the border approximation area matrix,
+        # weights are factored out of the geometric mean. It is computed
+        # from logarithms, because the product overflows for many alternatives
+        G = np.exp(np.mean(np.log(matrix), axis=-2, keepdims=True))
+        return matrix - G
 
-        # Calculation of the distance border approximation area
-        Q = weighted_matrix - G
+    @staticmethod
+    def _mabac_score(Q, weights, rows=None):
+        if rows is not None:
+            Q = Q[..., rows, :]
 
-        return np.sum(Q, axis=1)
+        # Calculation of the distance border approximation area
+        return MABAC._weighted_sum(Q, weights)
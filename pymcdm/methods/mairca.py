@@ -6,7 +6,7 @@ from .mcda_method import MCDA_method
 
 
 class MAIRCA(MCDA_method):
-    def __init__(self, normalization_function=normalizations.minmax_normalization):
+    def __init__(self, normalization_function=normalizations.minmax_normalization, dtype=None):
         """Create MAIRCA method object, using normaliztion `normalization_function`.
 
         Parameters
@@ -15,10 +15,15 @@ class MAIRCA(MCDA_method):
                 Function which should be used to normalize `matrix` columns. It should match signature `foo(x, cost)`,
                 where `x` is a vector which should be normalized and `cost` is a bool variable which says if `x` is a
                 cost or profit criterion.
+
+            dtype : None or data-type
+                Floating point type of the computations, e.g. `np.float32`.
+                If None, type of the decision matrix is used (float64 for integer matrices).
         """
         self.normalization = normalization_function
+        self.dtype = dtype
 
-    def __call__(self, matrix, weights, types, *args, **kwargs):
+    def __call__(self, matrix, weights, types, *args, out=None, **kwargs):
         """Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
         Parameters
@@ -29,11 +34,16 @@ class MAIRCA(MCDA_method):
 
             weights : ndarray
                 Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+                Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+                in this case preferences are returned with shape (K, n).
 
             types : ndarray
                 Array with definitions of criteria types:
                 1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
 
+            out : None or ndarray
+                Array for preferences with shape (n,) or (K, n). If None, new array is created.
+
             *args and **kwargs are necessary for methods which reqiure some additional data.
 
         Returns
@@ -41,22 +51,79 @@ class MAIRCA(MCDA_method):
             ndarray
                 Preference values for alternatives. Better alternatives have higher values.
         """
-        MAIRCA._validate_input_data(matrix, weights, types)
-        return MAIRCA._mairca(matrix, weights, types, self.normalization)
+        types = MAIRCA._validate_input_data(matrix, weights, types)
+        matrix, weights = self._as_float(matrix, weights)
+        return MAIRCA._write_out(MAIRCA._mairca(matrix, weights, types, self.normalization), out)
+
+    def batch(self, matrices, weights, types, *args, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`, with criteria weights `weights` and criteria
+        types `types`.
+
+        Parameters
+        ----------
+            matrices : ndarray
+                Stack of decision matrices with shape (B, n, m).
+                Alternatives are in rows and Criteria are in columns of each matrix.
+
+            weights : ndarray
+                Criteria weights for each problem with shape (B, m).
+
+            types : ndarray
+                Array with definitions of criteria types, shared by all problems:
+                1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+        Returns
+        -------
+            ndarray
+                Preference values with shape (B, n). Better alternatives have higher values.
+        """
+        types = MAIRCA._validate_batch_input_data(matrices, weights, types)
+        matrices, weights = self._as_float(matrices, weights)
+        return MAIRCA._mairca(matrices, weights, types, self.normalization)
+
+    def fit(self, matrix, types, *args, **kwargs):
+        """Normalize decision matrix `matrix` and compute gaps between theoretical and real ratings without weights.
+        See `MCDA_method.fit` for details.
+        """
+        types = MAIRCA._validate_fit_input_data(matrix, types)
+        matrix = matrix.astype(self._float_dtype(matrix), copy=False)
+        self._set_fitted(MAIRCA._mairca_fit(matrix, types, self.normalization), matrix.shape[1], matrix.dtype)
+        return self
+
+    def score(self, weights, rows=None, *args, **kwargs):
+        """Rank alternatives from the fitted decision matrix, with criteria weights `weights`.
+        See `MCDA_method.score` for details.
+        """
+        return MAIRCA._mairca_score(*self._get_fitted(weights), rows)
+
+    def _stream_chunks(self, matrix, weights, types, *args, chunk_size=65536, **kwargs):
+        types = MAIRCA._validate_input_data(matrix, weights, types)
+        weights = np.asarray(weights, dtype=self._float_dtype(matrix))
+        stats = normalizations._chunked_column_stats(matrix, chunk_size)
+
+        for i in range(0, matrix.shape[0], chunk_size):
+            nmatrix = normalizations._normalize_with_stats(matrix[i:i + chunk_size], self.normalization, types, stats, weights.dtype)
+            yield i, MAIRCA._mairca_score((1 - nmatrix) / stats['n'], weights)
 
     @staticmethod
     def _mairca(martrix, weights, types, normalization):
-        n, _ = martrix.shape
+        return MAIRCA._mairca_score(MAIRCA._mairca_fit(martrix, types, normalization), weights)
 
-        # Creating theoretical ranking matrix
-        Tp = 1 / n * weights
+    @staticmethod
+    def _mairca_fit(martrix, types, normalization):
+        n = martrix.shape[-2]
 
         # Creating real rating matrix
         nmatrix = normalizations.normalize_matrix(martrix, normalization, types)
-        Tr = nmatrix * Tp
 
-        # Calculation of Total Gap Matrix
-        G = Tp - Tr
+        # Theoretical ranking matrix is weights / n and Total Gap Matrix is
+        # Tp - nmatrix * Tp, so gaps are (1 - nmatrix) / n times weights
+        return (1 - nmatrix) / n
+
+    @staticmethod
+    def _mairca_score(G, weights, rows=None):
+        if rows is not None:
+            G = G[..., rows, :]
 
         # Calculation the final values of criteria functions
-        return np.sum(G, axis=1)
\ No newline at end of file
+        return MAIRCA._weighted_sum(G, weights)
\ No newline at end of file
@@ -12,7 +12,7 @@ def _marcos_normalization(x, cost=False):
 
 
 class MARCOS(MCDA_method):
-    def __init__(self, normalization_function=_marcos_normalization):
+    def __init__(self, normalization_function=_marcos_normalization, dtype=None):
         """Create MARCOS method object, using normaliztion `normalization_function`.
 
         Parameters
@@ -21,10 +21,15 @@ class MARCOS(MCDA_method):
                 Function which should be used to normalize `matrix` columns. It should match signature `foo(x, cost)`,
                 where `x` is a vector which should be normalized and `cost` is a bool variable which says if `x` is a
                 cost or profit criterion.
+
+            dtype : None or data-type
+                Floating point type of the computations, e.g. `np.float32`.
+                If None, type of the decision matrix is used (float64 for integer matrices).
         """
         self.normalization = normalization_function
+        self.dtype = dtype
 
-    def __call__(self, matrix, weights, types, *args, **kwargs):
+    def __call__(self, matrix, weights, types, *args, out=None, workspace=None, **kwargs):
         """Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
         Parameters
@@ -35,11 +40,20 @@ class MARCOS(MCDA_method):
 
             weights : ndarray
                 Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+                Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+                in this case preferences are returned with shape (K, n).
 
             types : ndarray
                 Array with definitions of criteria types:
                 1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
 
+            out : None or ndarray
+                Array for preferences with shape (n,) or (K, n). If None, new array is created.
+
+            workspace : None or Workspace
+                Workspace with buffers for large intermediate arrays, which are reused between calls.
+                See `pymcdm.methods.Workspace`.
+
             *args and **kwargs are necessary for methods which reqiure some additional data.
 
         Returns
@@ -47,38 +61,111 @@ class MARCOS(MCDA_method):
             ndarray
                 Preference values for alternatives. Better alternatives have higher values.
         """
-        MARCOS._validate_input_data(matrix, weights, types)
-        return MARCOS._marcos(matrix, weights, types, self.normalization)
+        types = MARCOS._validate_input_data(matrix, weights, types)
+        matrix, weights = self._as_float(matrix, weights)
+        n_exmatrix = MARCOS._marcos_fit(matrix, types, self.normalization, workspace)
+        return MARCOS._write_out(MARCOS._marcos_score(n_exmatrix, weights), out)
+
+    def batch(self, matrices, weights, types, *args, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`, with criteria weights `weights` and criteria
+        types `types`.
+
+        Parameters
+        ----------
+            matrices : ndarray
+                Stack of decision matrices with shape (B, n, m).
+                Alternatives are in rows and Criteria are in columns of each matrix.
+
+            weights : ndarray
+                Criteria weights for each problem with shape (B, m).
+
+            types : ndarray
+                Array with definitions of criteria types, shared by all problems:
+                1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+        Returns
+        -------
+            ndarray
+                Preference values with shape (B, n). Better alternatives have higher values.
+        """
+        types = MARCOS._validate_batch_input_data(matrices, weights, types)
+        matrices, weights = self._as_float(matrices, weights)
+        return MARCOS._marcos(matrices, weights, types, self.normalization)
+
+    def fit(self, matrix, types, *args, **kwargs):
+        """Extend decision matrix `matrix` with the ideal and anti-ideal solutions and normalize it.
+        See `MCDA_method.fit` for details.
+        """
+        types = MARCOS._validate_fit_input_data(matrix, types)
+        matrix = matrix.astype(self._float_dtype(matrix), copy=False)
+        self._set_fitted(MARCOS._marcos_fit(matrix, types, self.normalization), matrix.shape[1], matrix.dtype)
+        return self
+
+    def score(self, weights, rows=None, *args, **kwargs):
+        """Rank alternatives from the fitted decision matrix, with criteria weights `weights`.
+        See `MCDA_method.score` for details.
+        """
+        return MARCOS._marcos_score(*self._get_fitted(weights), rows)
+
+    def _stream_chunks(self, matrix, weights, types, *args, chunk_size=65536, **kwargs):
+        types = MARCOS._validate_input_data(matrix, weights, types)
+        weights = np.asarray(weights, dtype=self._float_dtype(matrix))
+        stats = normalizations._chunked_column_stats(matrix, chunk_size)
+
+        # Ideal and anti-ideal solutions extend the decision matrix, so they are included in the statistics
+        profit = np.asarray(types) == 1
+        ideals = np.array([np.where(profit, stats['max'], stats['min']),
+                           np.where(profit, stats['min'], stats['max'])])
+        stats = normalizations._merge_column_stats(stats, normalizations._column_stats(ideals))
+
+        # Default normalization divides by the ideal solution, which is the same as linear normalization
+        normalization = self.normalization
+        if normalization is _marcos_normalization:
+            normalization = normalizations.linear_normalization
+        n_ideals = normalizations._normalize_with_stats(ideals, normalization, types, stats, weights.dtype)
+
+        for i in range(0, matrix.shape[0], chunk_size):
+            nmatrix = normalizations._normalize_with_stats(matrix[i:i + chunk_size], normalization, types, stats, weights.dtype)
+            yield i, MARCOS._marcos_score(np.concatenate((nmatrix, n_ideals)), weights)
 
     @staticmethod
     def _marcos(matrix, weights, types, normalization):
-        n, m = matrix.shape
+        return MARCOS._marcos_score(MARCOS._marcos_fit(matrix, types, normalization), weights)
 
-        # Extended initial decision matrix
-        exmatrix = np.zeros((n + 2, m))
-        exmatrix[:-2] = matrix
+    @staticmethod
+    def _marcos_fit(matrix, types, normalization, workspace=None):
+        *b, n, m = matrix.shape
+
+        # Extended initial decision matrix, it is normalized in place
+        exmatrix = MARCOS._buffer(workspace, 'exmatrix', (*b, n + 2, m), matrix.dtype)
+        exmatrix[..., :-2, :] = matrix
 
-        max_maxes = matrix.max(axis=0)
-        min_values = matrix.min(axis=0)
+        max_maxes = matrix.max(axis=-2)
+        min_values = matrix.min(axis=-2)
 
-        for i in range(m):
-            if types[i] == 1:
-                exmatrix[-2, i] = max_maxes[i]
-                exmatrix[-1, i] = min_values[i]
-            else:
-                exmatrix[-2, i] = min_values[i]
-                exmatrix[-1, i] = max_maxes[i]
+        profit = np.asarray(types) == 1
+        exmatrix[..., -2, :] = np.where(profit, max_maxes, min_values)
+        exmatrix[..., -1, :] = np.where(profit, min_values, max_maxes)
 
         # Normalization
-        n_exmatrix = normalizations.normalize_matrix(exmatrix, normalization, types)
+        if normalization is _marcos_normalization:
+            ideal = exmatrix[..., -2:-1, :].copy()
+            np.divide(exmatrix, ideal, out=exmatrix, where=profit)
+            np.divide(ideal, exmatrix, out=exmatrix, where=~profit)
+            return exmatrix
+        return normalizations.normalize_matrix(exmatrix, normalization, types, out=exmatrix)
 
-        # Weighting
-        weighted_matrix = n_exmatrix * weights
+    @staticmethod
+    def _marcos_score(n_exmatrix, weights, rows=None):
+        alts = n_exmatrix[..., :-2, :]
+        if rows is not None:
+            alts = alts[..., rows, :]
 
         # Utility degree
-        S = weighted_matrix.sum(axis=1)
-        k_neg = (S / S[-1])[:-2]
-        k_pos = (S / S[-2])[:-2]
+        S = MARCOS._weighted_sum(alts, weights)
+        S_ideal = MARCOS._weighted_sum(n_exmatrix[..., -2:, :], weights)
+        k_neg = S / S_ideal[..., -1:]
+        k_pos = S / S_ideal[..., -2:-1]
 
         # Utility functions
         f_k_pos = k_neg / (k_pos + k_neg)
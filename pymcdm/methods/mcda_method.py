@@ -2,7 +2,26 @@
 
 from abc import ABC
 
+import numpy as np
+from .. import helpers
+from .. import normalizations
+from .. import tracing
+
 class MCDA_method(ABC):
+    # Floating point type of the computations, None means the type of the decision matrix
+    # (float64 for integer matrices). Methods set it with the `dtype` argument of the constructor.
+    dtype = None
+
+    # True if better alternatives have higher preference values, so they are ranked with `rrankdata`
+    reverse_ranking = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Evaluations of the method are reported as 'aggregate' spans, see `pymcdm.tracing`
+        for entry in ('__call__', 'batch', 'fit', 'score', 'stream'):
+            if entry in cls.__dict__:
+                setattr(cls, entry, tracing.traced('aggregate')(cls.__dict__[entry]))
+
     def __call__(self, matrix, weights, types, *args, **kwargs):
         """Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
@@ -14,16 +33,311 @@ Parameters
 
     weights : ndarray
         Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+        Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+        in this case preferences are returned with shape (K, n).
 
     types : ndarray
         Array with definitions of criteria types:
         1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
 
+    out : None or ndarray
+        Array for preferences with shape (n,) or (K, n). If None, new array is created.
+
     *args and **kwargs are necessary for methods which reqiure some additional data.
 """
         pass
 
+    def batch(self, matrices, weights, types, *args, **kwargs):
+        """Rank alternatives in a stack of independent decision problems of the same shape.
+
+Parameters
+----------
+    matrices : ndarray
+        Stack of decision matrices with shape (B, n, m).
+        Alternatives are in rows and Criteria are in columns of each matrix.
+
+    weights : ndarray
+        Criteria weights for each problem with shape (B, m).
+
+    types : ndarray
+        Array with definitions of criteria types, shared by all problems:
+        1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+    *args and **kwargs are passed to the method as in `__call__`.
+
+Returns
+-------
+    ndarray
+        Preference values with shape (B, n), one row for each problem.
+"""
+        types = MCDA_method._validate_batch_input_data(matrices, weights, types)
+        return np.array([self(matrix, w, types, *args, **kwargs)
+                         for matrix, w in zip(matrices, weights)])
+
+    def fit(self, matrix, types, *args, **kwargs):
+        """Prepare the method for scoring alternatives from decision matrix `matrix` with criteria types `types`.
+
+All computations which do not depend on criteria weights (validation, normalization, ideal solutions etc.)
+are done once and stored in the method object. Use `score` to rank alternatives with given weights.
+
+Parameters
+----------
+    matrix : ndarray
+        Decision matrix / alternatives data.
+        Alternatives are in rows and Criteria are in columns.
+
+    types : ndarray
+        Array with definitions of criteria types:
+        1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
+
+    *args and **kwargs are necessary for methods which reqiure some additional data.
+
+Returns
+-------
+    MCDA_method
+        The method object itself.
+"""
+        types = MCDA_method._validate_fit_input_data(matrix, types)
+        self._set_fitted((matrix, types, args, kwargs), matrix.shape[1])
+        return self
+
+    def score(self, weights, rows=None, *args, **kwargs):
+        """Rank alternatives from the decision matrix passed to `fit`, with criteria weights `weights`.
+
+Parameters
+----------
+    weights : ndarray
+        Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+        Matrix with shape (K, m) could be passed to evaluate K weight vectors at once.
+
+    rows : None, slice or ndarray
+        Indexes of alternatives which should be scored. If None all alternatives are scored.
+        Preferences are calculated with respect to all alternatives passed to `fit`.
+
+    *args and **kwargs are necessary for methods which reqiure some additional data.
+
+Returns
+-------
+    ndarray
+        Preference values for alternatives, with shape (n,) or (K, n).
+"""
+        (matrix, types, fit_args, fit_kwargs), weights = self._get_fitted(weights)
+        pref = self(matrix, weights, types, *fit_args, *args, **fit_kwargs, **kwargs)
+        return pref if rows is None else pref[..., rows]
+
+    @tracing.traced('aggregate')
+    def stream(self, matrix, weights, types, *args, out=None, chunk_size=65536, **kwargs):
+        """Rank alternatives from decision matrix `matrix`, processing it in row chunks.
+
+Decision matrix could be bigger than available memory (e.g. `np.memmap` of the `.npy` file),
+only one chunk of rows is loaded at a time. The first pass over `matrix` gathers column statistics
+(min, max, sum, sum of squares etc.) required by the normalization, the second pass writes preferences to `out`.
+Only methods in which preference of an alternative depends on the column statistics
+and its own values could be evaluated this way.
+
+Parameters
+----------
+    matrix : ndarray
+        Decision matrix / alternatives data.
+        Alternatives are in rows and Criteria are in columns.
+
+    weights : ndarray
+        Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+        Matrix with shape (K, m) could be passed to evaluate K weight vectors at once.
+
+    types : ndarray
+        Array with definitions of criteria types:
+        1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
+
+    out : None or ndarray
+        Array for preferences with shape (n,) or (K, n), e.g. `np.memmap`. If None, new array is created.
+
+    chunk_size : int
+        Number of rows processed at once.
+
+    *args and **kwargs are necessary for methods which reqiure some additional data.
+
+Returns
+-------
+    ndarray
+        `out` filled with preference values for alternatives.
+
+Raises
+------
+    ValueError
+        If the method could not be evaluated in row chunks.
+"""
+        chunks = self._stream_chunks(matrix, weights, types, *args, chunk_size=chunk_size, **kwargs)
+        out = self._stream_output(matrix, np.asarray(weights, dtype=self._float_dtype(matrix)), out)
+        for i, pref in chunks:
+            out[..., i:i + pref.shape[-1]] = pref
+        return out
+
+    @tracing.traced('rank')
+    def top_k(self, k, *args, chunk_size=None, **kwargs):
+        """Find `k` best alternatives, without sorting preferences of all alternatives.
+
+Parameters
+----------
+    k : int
+        Number of the best alternatives.
+
+    chunk_size : None or int
+        If given, alternatives are evaluated in row chunks as in `stream` and only `k` best of them are kept
+        in memory. Otherwise preferences of all alternatives are calculated at once.
+
+    *args and **kwargs are passed to the method as in `__call__`, e.g. `matrix, weights, types`.
+    Preferences should be a vector (one weights vector).
+
+Returns
+-------
+    ndarray
+        Indexes of the `k` best alternatives, from the best one.
+
+    ndarray
+        Positions of these alternatives in the ranking, the same as given by `rankdata` for all alternatives
+        (average positions for ties).
+"""
+        top = helpers._TopK(k, reverse=self.reverse_ranking)
+        for i, pref in self._preference_chunks(args, kwargs, chunk_size):
+            top.push(pref)
+        return top.result()
+
+    @tracing.traced('rank')
+    def rank_of(self, indices, *args, chunk_size=None, **kwargs):
+        """Find positions in the ranking of alternatives with indexes `indices`, without ranking all alternatives.
+
+Parameters
+----------
+    indices : ndarray
+        Indexes of the alternatives.
+
+    chunk_size : None or int
+        If given, alternatives are evaluated in row chunks as in `stream`, the decision matrix is processed twice.
+        Otherwise preferences of all alternatives are calculated at once.
+
+    *args and **kwargs are passed to the method as in `__call__`, e.g. `matrix, weights, types`.
+    Preferences should be a vector (one weights vector).
+
+Returns
+-------
+    ndarray
+        Positions in the ranking, the same as given by `rankdata` for all alternatives (average positions for ties).
+"""
+        if chunk_size is None:
+            pref = next(self._preference_chunks(args, kwargs, chunk_size))[1]
+            return helpers.rank_of(pref, indices, reverse=self.reverse_ranking)
+
+        # Preferences of the alternatives are found in the first pass,
+        # better and equal alternatives are counted in the second one
+        indices = np.asarray(indices, dtype='int')
+        values = np.empty(indices.shape)
+        for i, pref in self._preference_chunks(args, kwargs, chunk_size):
+            inside = (indices >= i) & (indices < i + pref.shape[-1])
+            values[inside] = pref[indices[inside] - i]
+        ranks = helpers._RankCounter(values, reverse=self.reverse_ranking)
+        for i, pref in self._preference_chunks(args, kwargs, chunk_size):
+            ranks.push(pref)
+        return ranks.result()
+
+    def _stream_chunks(self, matrix, weights, types, *args, chunk_size=65536, **kwargs):
+        # Generator of (first row, preferences) pairs for consecutive row chunks of `matrix`.
+        # Methods which could be evaluated in row chunks override it.
+        raise ValueError(f'{type(self).__name__} method could not be evaluated in row chunks, because preferences of alternatives depend on each other.')
+
+    def _preference_chunks(self, args, kwargs, chunk_size):
+        if chunk_size is None:
+            chunks = [(0, self(*args, **kwargs))]
+        else:
+            chunks = self._stream_chunks(*args, chunk_size=chunk_size, **kwargs)
+        for i, pref in chunks:
+            if not isinstance(pref, np.ndarray) or pref.ndim != 1:
+                raise ValueError(f'Preferences should be a vector, one weights vector should be used.')
+            yield i, pref
+
+    def _float_dtype(self, matrix):
+        return normalizations._float_dtype(self.dtype, matrix)
+
+    def _as_float(self, matrix, weights):
+        # Decision matrix (or stack) and weights converted to the type of the computations
+        dtype = self._float_dtype(matrix)
+        return matrix.astype(dtype, copy=False), np.asarray(weights, dtype=dtype)
+
     @staticmethod
+    def _buffer(workspace, name, shape, dtype):
+        # Array for intermediate values, reused from `workspace` if it is given
+        if workspace is None:
+            return np.empty(shape, dtype=dtype)
+        return workspace.get(name, shape, dtype)
+
+    @staticmethod
+    def _write_out(pref, out):
+        if out is None:
+            return pref
+        out[...] = pref
+        return out
+
+    @staticmethod
+    def _stream_output(matrix, weights, out):
+        shape = weights.shape[:-1] + (matrix.shape[0],)
+        if out is None:
+            return np.empty(shape, dtype=weights.dtype)
+        if out.shape != shape:
+            raise ValueError(f'Output array should have shape {shape}, but has shape {out.shape}.')
+        return out
+
+    def _set_fitted(self, state, criteria, dtype='float'):
+        self._fitted = state
+        self._criteria = criteria
+        self._fitted_dtype = dtype
+
+    def _get_fitted(self, weights):
+        if getattr(self, '_fitted', None) is None:
+            raise ValueError(f'{type(self).__name__} object is not fitted. Call `fit(matrix, types)` before `score(weights)`.')
+        if weights.shape[-1] != self._criteria or weights.ndim > 2:
+            raise ValueError(f'Weights should have {self._criteria} criteria as the fitted decision matrix, but have shape {weights.shape}.')
+        return self._fitted, np.asarray(weights, dtype=self._fitted_dtype)
+
+    @staticmethod
+    @tracing.traced('validate')
     def _validate_input_data(matrix, weights, types):
-        if matrix.shape[1] != weights.shape[0] and weights.shape[0] != len(types):
+        # Validators return criteria types as ndarray, they could be given as a list
+        types = np.asarray(types)
+        if matrix.shape[1] != weights.shape[-1] or weights.shape[-1] != len(types):
+            raise ValueError(f'Number of criteria should be same as number of weights and number of types')
+        if weights.ndim > 2:
+            raise ValueError(f'Weights should be a vector or a matrix with one weights vector in each row, but have {weights.ndim} dimensions.')
+        return types
+
+    @staticmethod
+    @tracing.traced('validate')
+    def _validate_fit_input_data(matrix, types):
+        types = np.asarray(types)
+        if matrix.ndim != 2:
+            raise ValueError(f'Decision matrix should have 2 dimensions, but has {matrix.ndim}.')
+        if matrix.shape[1] != len(types):
+            raise ValueError(f'Number of criteria should be same as number of types')
+        return types
+
+    @staticmethod
+    @tracing.traced('validate')
+    def _validate_batch_input_data(matrices, weights, types):
+        types = np.asarray(types)
+        if matrices.ndim != 3:
+            raise ValueError(f'Stack of decision matrices should have 3 dimensions (B, n, m), but has {matrices.ndim}.')
+        if weights.shape != (matrices.shape[0], matrices.shape[2]):
+            raise ValueError(f'Weights should have shape {(matrices.shape[0], matrices.shape[2])}, but have shape {weights.shape}.')
+        if matrices.shape[2] != len(types):
             raise ValueError(f'Number of criteria should be same as number of weights and number of types')
+        return types
+
+    @staticmethod
+    @tracing.traced('weight')
+    def _weighted_sum(matrix, weights):
+        # Weighted sum of criteria values for each alternative.
+        # For 2-D `matrix` weights could be a vector or a (K, m) matrix of
+        # weight vectors, which is evaluated as one matrix product.
+        # For (B, n, m) stack weights have shape (B, m).
+        if matrix.ndim == 2:
+            return weights @ matrix.T
+        return np.matmul(matrix, weights[..., np.newaxis])[..., 0]
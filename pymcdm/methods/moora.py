@@ -1,15 +1,23 @@
 # Copyright (c) 2021 Bartłomiej Kizielewicz
 
 import numpy as np
+from .. import normalizations
 from .mcda_method import MCDA_method
 
 
 class MOORA(MCDA_method):
-    def __init__(self):
-        """Create COPRAS method object."""
-        pass
+    def __init__(self, dtype=None):
+        """Create MOORA method object.
 
-    def __call__(self, matrix, weights, types, *args, **kwargs):
+Parameters
+----------
+    dtype : None or data-type
+        Floating point type of the computations, e.g. `np.float32`.
+        If None, type of the decision matrix is used (float64 for integer matrices).
+"""
+        self.dtype = dtype
+
+    def __call__(self, matrix, weights, types, *args, out=None, **kwargs):
         """Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
 Parameters
@@ -20,11 +28,16 @@ Parameters
 
     weights : ndarray
         Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+        Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+        in this case preferences are returned with shape (K, n).
 
     types : ndarray
         Array with definitions of criteria types:
         1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
 
+    out : None or ndarray
+        Array for preferences with shape (n,) or (K, n). If None, new array is created.
+
     *args and **kwargs are necessary for methods which reqiure some additional data.
 
 Returns
@@ -32,18 +45,86 @@ Returns
     ndarray
         Preference values for alternatives. Better alternatives have higher values.
 """
-        MOORA._validate_input_data(matrix, weights, types)
+        types = MOORA._validate_input_data(matrix, weights, types)
+        matrix, weights = self._as_float(matrix, weights)
+        MOORA._validate_types(types)
+        return MOORA._write_out(MOORA._moora(matrix, weights, types), out)
+
+    def batch(self, matrices, weights, types, *args, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`, with criteria weights `weights` and criteria types `types`.
+
+Parameters
+----------
+    matrices : ndarray
+        Stack of decision matrices with shape (B, n, m).
+        Alternatives are in rows and Criteria are in columns of each matrix.
+
+    weights : ndarray
+        Criteria weights for each problem with shape (B, m).
+
+    types : ndarray
+        Array with definitions of criteria types, shared by all problems:
+        1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+Returns
+-------
+    ndarray
+        Preference values with shape (B, n). Better alternatives have higher values.
+"""
+        types = MOORA._validate_batch_input_data(matrices, weights, types)
+        matrices, weights = self._as_float(matrices, weights)
+        MOORA._validate_types(types)
+        return MOORA._moora(matrices, weights, types)
+
+    def fit(self, matrix, types, *args, **kwargs):
+        """Normalize decision matrix `matrix` and negate cost criteria for later scoring.
+See `MCDA_method.fit` for details.
+"""
+        types = MOORA._validate_fit_input_data(matrix, types)
+        matrix = matrix.astype(self._float_dtype(matrix), copy=False)
+        MOORA._validate_types(types)
+        self._set_fitted(MOORA._moora_fit(matrix, types), matrix.shape[1], matrix.dtype)
+        return self
+
+    def score(self, weights, rows=None, *args, **kwargs):
+        """Rank alternatives from the fitted decision matrix, with criteria weights `weights`.
+See `MCDA_method.score` for details.
+"""
+        return MOORA._moora_score(*self._get_fitted(weights), rows)
+
+    def _stream_chunks(self, matrix, weights, types, *args, chunk_size=65536, **kwargs):
+        types = MOORA._validate_input_data(matrix, weights, types)
+        weights = np.asarray(weights, dtype=self._float_dtype(matrix))
+        MOORA._validate_types(types)
+        stats = normalizations._chunked_column_stats(matrix, chunk_size)
+        signs = ((types == 1).astype(int) - (types == -1)).astype(weights.dtype)
+
+        for i in range(0, matrix.shape[0], chunk_size):
+            nmatrix = matrix[i:i + chunk_size].astype(weights.dtype) / np.sqrt(stats['sumsq']).astype(weights.dtype)
+            yield i, MOORA._moora_score(nmatrix * signs, weights)
+
+    @staticmethod
+    def _validate_types(types):
         if np.all(types == 1.0):
-            raise ValueError('types array contains only profit criteria. COPRAS method requires at least one cost criteria.')
-        return MOORA._moora(matrix, weights, types)
+            raise ValueError('types array contains only profit criteria. MOORA method requires at least one cost criteria.')
 
     @staticmethod
     def _moora(matrix, weights, cryteria_types):
-        nmatrix = matrix / np.sqrt(np.sum(matrix ** 2, axis=0))
+        return MOORA._moora_score(MOORA._moora_fit(matrix, cryteria_types), weights)
 
-        # Difficult normalized decision making matrix
-        wmatrix = nmatrix * weights
+    @staticmethod
+    def _moora_fit(matrix, cryteria_types):
+        nmatrix = matrix / np.sqrt(np.sum(matrix ** 2, axis=-2, keepdims=True))
+
+        # Cost criteria are subtracted from the composite score
+        signs = (cryteria_types == 1).astype(int) - (cryteria_types == -1)
+        return nmatrix * signs.astype(nmatrix.dtype)
+
+    @staticmethod
+    def _moora_score(nmatrix, weights, rows=None):
+        if rows is not None:
+            nmatrix = nmatrix[..., rows, :]
 
         # Calculate the composite score
-        cscore = np.sum(wmatrix[:, cryteria_types == 1], axis=1) - np.sum(wmatrix[:, cryteria_types == -1], axis=1)
+        cscore = MOORA._weighted_sum(nmatrix, weights)
         return cscore
\ No newline at end of file
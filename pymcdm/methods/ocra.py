@@ -1,6 +1,7 @@
 # Copyright (c) 2021 Bartłomiej Kizielewicz
 
 import numpy as np
+from .. import normalizations
 from .mcda_method import MCDA_method
 
 
@@ -11,7 +12,7 @@ def _ocra_normalization(x, cost=False):
 
 
 class OCRA(MCDA_method):
-    def __init__(self, normalization_function=_ocra_normalization):
+    def __init__(self, normalization_function=_ocra_normalization, dtype=None):
         """Create OCRA method object, using normaliztion `normalization_function`.
 
         Parameters
@@ -20,10 +21,15 @@ class OCRA(MCDA_method):
                 Function which should be used to normalize `matrix` columns. It should match signature `foo(x, cost)`,
                 where `x` is a vector which should be normalized and `cost` is a bool variable which says if `x` is a
                 cost or profit criterion.
+
+            dtype : None or data-type
+                Floating point type of the computations, e.g. `np.float32`.
+                If None, type of the decision matrix is used (float64 for integer matrices).
         """
         self.normalization = normalization_function
+        self.dtype = dtype
 
-    def __call__(self, matrix, weights, types, *args, **kwargs):
+    def __call__(self, matrix, weights, types, *args, out=None, **kwargs):
         """Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
         Parameters
@@ -34,11 +40,16 @@ class OCRA(MCDA_method):
 
             weights : ndarray
                 Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+                Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+                in this case preferences are returned with shape (K, n).
 
             types : ndarray
                 Array with definitions of criteria types:
                 1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
 
+            out : None or ndarray
+                Array for preferences with shape (n,) or (K, n). If None, new array is created.
+
             *args and **kwargs are necessary for methods which reqiure some additional data.
 
         Returns
@@ -46,25 +57,120 @@ class OCRA(MCDA_method):
             ndarray
                 Preference values for alternatives. Better alternatives have higher values.
         """
-        OCRA._validate_input_data(matrix, weights, types)
-        return OCRA._ocra(matrix, weights, types, self.normalization)
+        types = OCRA._validate_input_data(matrix, weights, types)
+        matrix, weights = self._as_float(matrix, weights)
+        return OCRA._write_out(OCRA._ocra(matrix, weights, types, self.normalization), out)
+
+    def batch(self, matrices, weights, types, *args, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`, with criteria weights `weights` and criteria
+        types `types`.
+
+        Parameters
+        ----------
+            matrices : ndarray
+                Stack of decision matrices with shape (B, n, m).
+                Alternatives are in rows and Criteria are in columns of each matrix.
+
+            weights : ndarray
+                Criteria weights for each problem with shape (B, m).
+
+            types : ndarray
+                Array with definitions of criteria types, shared by all problems:
+                1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+        Returns
+        -------
+            ndarray
+                Preference values with shape (B, n). Better alternatives have higher values.
+        """
+        types = OCRA._validate_batch_input_data(matrices, weights, types)
+        matrices, weights = self._as_float(matrices, weights)
+        return OCRA._ocra(matrices, weights, types, self.normalization)
+
+    def fit(self, matrix, types, *args, **kwargs):
+        """Normalize decision matrix `matrix` for later scoring.
+        See `MCDA_method.fit` for details.
+        """
+        types = OCRA._validate_fit_input_data(matrix, types)
+        matrix = matrix.astype(self._float_dtype(matrix), copy=False)
+        self._set_fitted(OCRA._ocra_fit(matrix, types, self.normalization), matrix.shape[1], matrix.dtype)
+        return self
+
+    def score(self, weights, rows=None, *args, **kwargs):
+        """Rank alternatives from the fitted decision matrix, with criteria weights `weights`.
+        See `MCDA_method.score` for details.
+        """
+        # Preference ratings are shifted by their minimums over all alternatives
+        pref = OCRA._ocra_score(*self._get_fitted(weights))
+        return pref if rows is None else pref[..., rows]
+
+    def _stream_chunks(self, matrix, weights, types, *args, chunk_size=65536, **kwargs):
+        # Preference ratings are shifted by their minimums over all alternatives, which are found in one more pass
+        types = OCRA._validate_input_data(matrix, weights, types)
+        weights = np.asarray(weights, dtype=self._float_dtype(matrix))
+        cost = types == -1
+        stats = normalizations._chunked_column_stats(matrix, chunk_size)
+
+        def ratings(i):
+            chunk = matrix[i:i + chunk_size].astype(weights.dtype)
+            if self.normalization is _ocra_normalization:
+                nmatrix = OCRA._ocra_ratings(chunk, cost, stats['min'].astype(weights.dtype), stats['max'].astype(weights.dtype))
+            else:
+                nmatrix = normalizations._normalize_with_stats(chunk, self.normalization, np.where(cost, -1, 1), stats, weights.dtype)
+            return OCRA._ocra_sums((nmatrix, cost), weights)
+
+        n = matrix.shape[0]
+        minimums = None
+        for i in range(0, n, chunk_size):
+            I, O = ratings(i)
+            chunk_minimums = [np.min(x, axis=-1, keepdims=True) for x in (I, O, I + O)]
+            if minimums is None:
+                minimums = chunk_minimums
+            else:
+                minimums = [np.minimum(a, b) for a, b in zip(minimums, chunk_minimums)]
+
+        for i in range(0, n, chunk_size):
+            yield i, OCRA._ocra_pref(*ratings(i), *minimums)
 
     @staticmethod
     def _ocra(martrix, weights, types, normalization):
-        n, m = martrix.shape
+        return OCRA._ocra_score(OCRA._ocra_fit(martrix, types, normalization), weights)
+
+    @staticmethod
+    def _ocra_fit(martrix, types, normalization):
+        cost = np.asarray(types) == -1
 
         # Calculate preference ratings for cost and profit criteria
-        I = np.zeros(n)
-        O = np.zeros(n)
-        for j in range(m):
-            if types[j] == -1:
-                I += weights[j] * normalization(martrix[:, j], cost=True)
-            else:
-                O += weights[j] * normalization(martrix[:, j], cost=False)
+        if normalization is _ocra_normalization:
+            xmin = np.min(martrix, axis=-2, keepdims=True)
+            xmax = np.max(martrix, axis=-2, keepdims=True)
+            nmatrix = OCRA._ocra_ratings(martrix, cost, xmin, xmax)
+        else:
+            nmatrix = normalizations.normalize_matrix(martrix, normalization, np.where(cost, -1, 1))
+        return nmatrix, cost
 
+    @staticmethod
+    def _ocra_ratings(martrix, cost, xmin, xmax):
+        return np.where(cost, xmax - martrix, martrix - xmin) / xmin
+
+    @staticmethod
+    def _ocra_score(state, weights):
+        I, O = OCRA._ocra_sums(state, weights)
+        minimums = (np.min(x, axis=-1, keepdims=True) for x in (I, O, I + O))
+        return OCRA._ocra_pref(I, O, *minimums)
+
+    @staticmethod
+    def _ocra_sums(state, weights):
+        nmatrix, cost = state
+        I = OCRA._weighted_sum(nmatrix[..., cost], weights[..., cost])
+        O = OCRA._weighted_sum(nmatrix[..., ~cost], weights[..., ~cost])
+        return I, O
+
+    @staticmethod
+    def _ocra_pref(I, O, I_min, O_min, IO_min):
         # Calculate linear preference ratings for cost and profit criteria
-        I -= np.min(I)
-        O -= np.min(O)
+        I = I - I_min
+        O = O - O_min
 
-        # Calculate overall preference rating
-        return (I + O) - np.min(I + O)
+        # Calculate overall preference rating, the minimum of I + O is shifted as I and O
+        return (I + O) - (IO_min - I_min - O_min)
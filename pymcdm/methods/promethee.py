@@ -3,22 +3,28 @@
 from functools import partial
 import numpy as np
 
+from .. import jit
 from .. import normalizations
 from .mcda_method import MCDA_method
 
 
 class PROMETHEE_II(MCDA_method):
-    def __init__(self, preference_function):
+    def __init__(self, preference_function, dtype=None):
         """Create PROMEHTEE_II method object, with `preference_function`.
 
 Parameters
 ----------
     preference_function: str
         Name of the preference function ('usual', 'ushape', 'vshape', 'level', 'vshape_2')
+
+    dtype : None or data-type
+        Floating point type of the computations, e.g. `np.float32`.
+        If None, type of the decision matrix is used (float64 for integer matrices).
 """
         self.pf = getattr(PROMETHEE_II._PreferenceFunctions, preference_function)
+        self.dtype = dtype
 
-    def __call__(self, matrix, weights, types, *args, p=None, q=None, promethee_I=False, **kwargs):
+    def __call__(self, matrix, weights, types, *args, p=None, q=None, promethee_I=False, out=None, **kwargs):
         """
 Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
@@ -30,6 +36,8 @@ Parameters
 
     weights : ndarray
         Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+        Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+        in this case preferences are returned with shape (K, n).
 
     types : ndarray
         Array with definitions of criteria types:
@@ -44,6 +52,10 @@ Parameters
     promethee_I : bool
         If True then returns F+ and F- (like in promethee I).
 
+    out : None or ndarray
+        Array for FI preferences with shape (n,) or (K, n). If None, new array is created.
+        It is not used if `promethee_I` is True.
+
     *args and **kwargs are necessary for methods which reqiure some additional data.
 
 Returns
@@ -59,17 +71,93 @@ Returns
     ndarray
         Preference values of alternatives. Better alternatives have higher values.
 """
+        matrix, weights = self._as_float(matrix, weights)
+        types = np.asarray(types)
+        pfs = self._preference_functions(matrix.shape[1], p, q, matrix.dtype)
+        Fp, Fm, FI = PROMETHEE_II._promethee(matrix, weights, types, pfs)
+        if promethee_I:
+            return Fp, Fm
+        else:
+            return PROMETHEE_II._write_out(FI, out)
+
+    def batch(self, matrices, weights, types, *args, p=None, q=None, promethee_I=False, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`, with criteria weights `weights` and criteria types `types`.
+
+Parameters
+----------
+    matrices : ndarray
+        Stack of decision matrices with shape (B, n, m).
+        Alternatives are in rows and Criteria are in columns of each matrix.
+
+    weights : ndarray
+        Criteria weights for each problem with shape (B, m).
+
+    types : ndarray
+        Array with definitions of criteria types, shared by all problems:
+        1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+    p : ndarray
+        p values for each criterion
+
+    q : ndarray
+        q values for each criterion
+
+    promethee_I : bool
+        If True then returns F+ and F- (like in promethee I).
+
+Returns
+-------
+    If `promethee_I` is True:
+    ndarray
+        Positive flows with shape (B, n)
+
+    ndarray
+        Negative flows with shape (B, n)
+
+    If `promethee_I` is False:
+    ndarray
+        Preference values with shape (B, n). Better alternatives have higher values.
+"""
+        types = PROMETHEE_II._validate_batch_input_data(matrices, weights, types)
+        matrices, weights = self._as_float(matrices, weights)
+        pfs = self._preference_functions(matrices.shape[2], p, q, matrices.dtype)
+        Fp, Fm, FI = PROMETHEE_II._promethee(matrices, weights, types, pfs)
+        if promethee_I:
+            return Fp, Fm
+        else:
+            return FI
+
+    def _preference_functions(self, m, p, q, dtype):
         pf = self.pf
+        # Thresholds are converted, so preference tables keep the type of the matrix
+        if p is not None:
+            p = np.asarray(p, dtype=dtype)
+        if q is not None:
+            q = np.asarray(q, dtype=dtype)
         if p is None and q is None:
-            pfs = (partial(pf, p=None, q=None) for i in range(matrix.shape[1]))
+            return (partial(pf, p=None, q=None) for i in range(m))
         elif p is None and q is not None:
-            pfs = (partial(pf, p=None, q=q_) for q_ in q)
+            return (partial(pf, p=None, q=q_) for q_ in q)
         elif p is not None and q is None:
-            pfs = (partial(pf, p=p_, q=None) for p_ in p)
+            return (partial(pf, p=p_, q=None) for p_ in p)
         else:
-            pfs = (partial(pf, p=p_, q=q_) for p_, q_ in zip(p, q))
+            return (partial(pf, p=p_, q=q_) for p_, q_ in zip(p, q))
 
-        Fp, Fm, FI = PROMETHEE_II._promethee(matrix, weights, types, pfs)
+    def fit(self, matrix, types, *args, p=None, q=None, **kwargs):
+        """Compute positive and negative preference flows of alternatives for each criterion separately.
+`p` and `q` are the same as in `__call__`. See `MCDA_method.fit` for details.
+"""
+        types = PROMETHEE_II._validate_fit_input_data(matrix, types)
+        matrix = matrix.astype(self._float_dtype(matrix), copy=False)
+        pfs = self._preference_functions(matrix.shape[1], p, q, matrix.dtype)
+        self._set_fitted(PROMETHEE_II._promethee_fit(matrix, types, pfs), matrix.shape[1], matrix.dtype)
+        return self
+
+    def score(self, weights, rows=None, *args, promethee_I=False, **kwargs):
+        """Rank alternatives from the fitted decision matrix, with criteria weights `weights`.
+`promethee_I` is the same as in `__call__`. See `MCDA_method.score` for details.
+"""
+        Fp, Fm, FI = PROMETHEE_II._promethee_score(*self._get_fitted(weights), rows)
         if promethee_I:
             return Fp, Fm
         else:
@@ -77,18 +165,57 @@ Returns
 
     @staticmethod
     def _promethee(matrix, weights, criteria_types, pref_functions):
+        flows = PROMETHEE_II._promethee_fit(matrix, criteria_types, pref_functions)
+        return PROMETHEE_II._promethee_score(flows, weights)
+
+    @staticmethod
+    def _promethee_fit(matrix, criteria_types, pref_functions):
         # N - number of alternatives
         # M - number of criteria
-        N, M = matrix.shape
+        N, M = matrix.shape[-2:]
+
+        pref_functions = list(pref_functions)
+        if jit.enabled and matrix.ndim == 2:
+            thresholds = PROMETHEE_II._jit_thresholds(pref_functions)
+            if thresholds is not None:
+                profit = np.array([ct == 1 for ct in criteria_types])
+                return jit.promethee_flows(np.ascontiguousarray(matrix.T), profit, *thresholds)
+
+        # Criteria are moved to the first axis, so every `crit` is a vector
+        # of alternatives values (or a stack of such vectors)
+        crits = np.moveaxis(matrix, -1, 0)
 
-        c_tables = (np.tile(crit.reshape(N, 1), (1, N)) for crit in matrix.T)
-        diff_tables = ((c - crit if ct == 1 else crit - c)
-                       for crit, c, ct in zip(matrix.T, c_tables, criteria_types))
+        # Flows are linear in weights, so positive and negative flows are
+        # calculated for each criterion and only then weighted.
+        # Preference tables are built for blocks of rows, so they are never stored whole
+        flows = np.zeros((2,) + matrix.shape, dtype=matrix.dtype)
+        block = max(1, 2 ** 22 // crits[0].size)
+        for c, (crit, ct, pf) in enumerate(zip(crits, criteria_types, pref_functions)):
+            for s in range(0, N, block):
+                d = crit[..., s:s + block, np.newaxis] - crit[..., np.newaxis, :]
+                pt = pf(d if ct == 1 else -d)
+                flows[0, ..., s:s + block, c] = np.sum(pt, axis=-1, dtype=matrix.dtype)
+                flows[1, ..., c] += np.sum(pt, axis=-2, dtype=matrix.dtype)
+        return flows / (N-1)
 
-        pi_table = sum(w * pf(d) for w, d, pf in zip(weights, diff_tables, pref_functions))
+    @staticmethod
+    def _jit_thresholds(pref_functions):
+        # Code of the preference function and its q and p for each criterion, missing thresholds are nan.
+        # None if a threshold required by the function is missing, NumPy implementation raises an error then.
+        kind = jit.PREFERENCE_FUNCTIONS[pref_functions[0].func.__name__]
+        q, p = (np.array([np.nan if pf.keywords[t] is None else pf.keywords[t] for pf in pref_functions], dtype='float')
+                for t in ('q', 'p'))
+        if (kind in (1, 3, 4) and np.any(np.isnan(q))) or (kind in (2, 3, 4) and np.any(np.isnan(p))):
+            return None
+        return kind, q, p
+
+    @staticmethod
+    def _promethee_score(flows, weights, rows=None):
+        if rows is not None:
+            flows = flows[..., rows, :]
 
-        F_plus = np.sum(pi_table, axis=1) / (N-1)
-        F_minus = np.sum(pi_table, axis=0) / (N-1)
+        F_plus = PROMETHEE_II._weighted_sum(flows[0], weights)
+        F_minus = PROMETHEE_II._weighted_sum(flows[1], weights)
 
         FI = F_plus - F_minus
 
@@ -0,0 +1,154 @@
+# Copyright (c) 2021 Andrii Shekhovtsov
+
+from collections import namedtuple
+
+__all__ = [
+    'MethodInfo',
+    'REGISTRY',
+    'method_info',
+    'find_methods'
+]
+
+
+MethodInfo = namedtuple('MethodInfo', [
+    'name', 'time', 'memory', 'pairwise', 'row_independent', 'reverse_ranking',
+    'batchable', 'fittable', 'streamable', 'incremental', 'workspace',
+    'init_args', 'call_args', 'call_kwargs'
+])
+MethodInfo.__doc__ = """Capabilities of the MCDA method, see `REGISTRY`.
+
+    Attributes
+    ----------
+        name : str
+            Name of the method class in `pymcdm.methods`.
+
+        time : str
+            Asymptotic time of the evaluation for n alternatives and m criteria.
+
+        memory : str
+            Asymptotic size of the intermediate arrays.
+
+        pairwise : bool
+            True if alternatives are compared in pairs, so time grows quadratically with n.
+
+        row_independent : bool
+            True if preference of the alternative depends only on its own values
+            (and arguments of the method), not on other alternatives.
+
+        reverse_ranking : bool
+            True if better alternatives have higher preference values (ranked descending),
+            False if they have smaller ones (ranked ascending). The same as `reverse_ranking` of the class.
+
+        batchable : bool
+            True if a stack of decision matrices could be evaluated at once with `batch`.
+
+        fittable : bool
+            True if the method supports `fit(matrix, types)` and `score(weights)`.
+
+        streamable : bool
+            True if the method supports `stream` (and `top_k` and `rank_of` with `chunk_size`),
+            evaluating the decision matrix in row chunks.
+
+        incremental : bool
+            True if the method is supported by `pymcdm.incremental.IncrementalEvaluator`.
+
+        workspace : bool
+            True if `__call__` accepts `workspace` with reusable buffers.
+
+        init_args : tuple
+            Required arguments of the constructor.
+
+        call_args : tuple
+            Required positional arguments of `__call__` after the decision matrix.
+
+        call_kwargs : tuple
+            Optional keyword arguments of `__call__`, specific for the method.
+"""
+
+
+def _info(name, time='O(nm)', memory='O(nm)', pairwise=False, row_independent=False, reverse_ranking=True,
+          batchable=True, fittable=True, streamable=False, incremental=False, workspace=False,
+          init_args=(), call_args=('weights', 'types'), call_kwargs=()):
+    return MethodInfo(name, time, memory, pairwise, row_independent, reverse_ranking,
+                      batchable, fittable, streamable, incremental, workspace,
+                      init_args, call_args, call_kwargs)
+
+
+# Capabilities of all methods by class name. Method modules are not imported here.
+# Pairwise tables of PROMETHEE II and CODAS are built in blocks of rows, so their memory is linear in n.
+REGISTRY = {info.name: info for info in [
+    _info('TOPSIS', streamable=True, incremental=True, workspace=True),
+    _info('VIKOR', reverse_ranking=False, streamable=True, incremental=True, workspace=True,
+          call_kwargs=('v', 'return_all')),
+    _info('COPRAS', streamable=True),
+    _info('PROMETHEE_II', time='O(n^2 m)', pairwise=True, init_args=('preference_function',),
+          call_kwargs=('p', 'q', 'promethee_I')),
+    _info('COMET', time='O(n m 2^m)', memory='O(nm + k^m)', row_independent=True,
+          streamable=True, init_args=('cvalues',), call_args=()),
+    _info('SPOTIS', row_independent=True, reverse_ranking=False, streamable=True,
+          call_args=('weights', 'types', 'bounds')),
+    _info('ARAS', streamable=True, workspace=True),
+    _info('COCOSO', call_kwargs=('l',)),
+    _info('CODAS', time='O(nm + n^2)', pairwise=True),
+    _info('EDAS', streamable=True, incremental=True),
+    _info('MABAC', streamable=True, incremental=True),
+    _info('MAIRCA', streamable=True),
+    _info('MARCOS', streamable=True, workspace=True),
+    _info('OCRA', streamable=True),
+    _info('MOORA', streamable=True),
+]}
+
+
+def method_info(method):
+    """Get capabilities of the method.
+
+    Parameters
+    ----------
+        method : str, type or MCDA_method
+            Name of the method, method class or method object.
+            For subclasses, capabilities of the nearest registered base class are returned.
+
+    Returns
+    -------
+        MethodInfo
+            Capabilities of the method.
+
+    Raises
+    ------
+        ValueError
+            If method is not registered.
+    """
+    if isinstance(method, str):
+        names = [method]
+    else:
+        cls = method if isinstance(method, type) else type(method)
+        names = [c.__name__ for c in cls.__mro__ if c.__module__.startswith(__package__)]
+    for name in names:
+        if name in REGISTRY:
+            return REGISTRY[name]
+    raise ValueError(f'Method {method!r} is not registered. Registered methods: {", ".join(REGISTRY)}.')
+
+
+def find_methods(**capabilities):
+    """Find names of the methods with given capabilities.
+
+    Parameters
+    ----------
+        **capabilities
+            Required values of `MethodInfo` attributes, e.g. `streamable=True, pairwise=False`.
+
+    Returns
+    -------
+        list
+            Names of the matching methods, in the order of `REGISTRY`.
+
+    Examples
+    --------
+    >>> find_methods(reverse_ranking=False)
+    ['VIKOR', 'SPOTIS']
+    """
+    unknown = set(capabilities) - set(MethodInfo._fields)
+    if unknown:
+        raise ValueError(f'Unknown capabilities: {", ".join(sorted(unknown))}. Available: {", ".join(MethodInfo._fields)}.')
+    return [name for name, info in REGISTRY.items()
+            if all(getattr(info, key) == value for key, value in capabilities.items())]
@@ -5,11 +5,21 @@ from .. import normalizations
 from .mcda_method import MCDA_method
 
 class SPOTIS(MCDA_method):
-    def __init__(self):
-        """Create SPOTIS method object."""
-        pass
+    # Better alternatives have smaller preference values
+    reverse_ranking = False
 
-    def __call__(self, matrix, weights, types, bounds, *args, **kwargs):
+    def __init__(self, dtype=None):
+        """Create SPOTIS method object.
+
+Parameters
+----------
+    dtype : None or data-type
+        Floating point type of the computations, e.g. `np.float32`.
+        If None, type of the decision matrix is used (float64 for integer matrices).
+"""
+        self.dtype = dtype
+
+    def __call__(self, matrix, weights, types, bounds, *args, out=None, **kwargs):
         """Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
 Parameters
@@ -20,6 +30,8 @@ Parameters
 
     weights : ndarray
         Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+        Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+        in this case preferences are returned with shape (K, n).
 
     types : ndarray
         Array with definitions of criteria types:
@@ -28,6 +40,9 @@ Parameters
     bounds : ndarray
         Each row should contain min and max values for each criterion. Min and max should be different values!
 
+    out : None or ndarray
+        Array for preferences with shape (n,) or (K, n). If None, new array is created.
+
     *args and **kwargs are necessary for methods which reqiure some additional data.
 
 Returns
@@ -35,23 +50,97 @@ Returns
     ndarray
         Preference values for alternatives. Better alternatives have smaller values.
 """
-        SPOTIS._validate_input_data(matrix, weights, types)
+        types = SPOTIS._validate_input_data(matrix, weights, types)
+        matrix, weights = self._as_float(matrix, weights)
+        SPOTIS._validate_bounds(bounds)
+
+        # Determine Ideal Solution Point based on criteria bounds
+        isp = bounds[np.arange(bounds.shape[0]), ((types+1)//2).astype('int')]
+        return SPOTIS._write_out(SPOTIS._spotis(matrix, weights, isp, bounds), out)
+
+    def batch(self, matrices, weights, types, bounds, *args, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`, with criteria weights `weights` and criteria types `types`.
+
+Parameters
+----------
+    matrices : ndarray
+        Stack of decision matrices with shape (B, n, m).
+        Alternatives are in rows and Criteria are in columns of each matrix.
+
+    weights : ndarray
+        Criteria weights for each problem with shape (B, m).
+
+    types : ndarray
+        Array with definitions of criteria types, shared by all problems:
+        1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+    bounds : ndarray
+        Each row should contain min and max values for each criterion, shared by all problems. Min and max should be different values!
+
+Returns
+-------
+    ndarray
+        Preference values with shape (B, n). Better alternatives have smaller values.
+"""
+        types = SPOTIS._validate_batch_input_data(matrices, weights, types)
+        matrices, weights = self._as_float(matrices, weights)
+        SPOTIS._validate_bounds(bounds)
+
+        isp = bounds[np.arange(bounds.shape[0]), ((types+1)//2).astype('int')]
+        return SPOTIS._spotis(matrices, weights, isp, bounds)
+
+    def fit(self, matrix, types, bounds, *args, **kwargs):
+        """Compute normalized distances of alternatives to the Ideal Solution Point, determined by `bounds`.
+See `MCDA_method.fit` for details, `bounds` is the same as in `__call__`.
+"""
+        types = SPOTIS._validate_fit_input_data(matrix, types)
+        matrix = matrix.astype(self._float_dtype(matrix), copy=False)
+        SPOTIS._validate_bounds(bounds)
+        isp = bounds[np.arange(bounds.shape[0]), ((types+1)//2).astype('int')]
+        self._set_fitted(SPOTIS._spotis_fit(matrix, isp, bounds), matrix.shape[1], matrix.dtype)
+        return self
+
+    def score(self, weights, rows=None, *args, **kwargs):
+        """Rank alternatives from the fitted decision matrix, with criteria weights `weights`.
+See `MCDA_method.score` for details.
+"""
+        return SPOTIS._spotis_score(*self._get_fitted(weights), rows)
+
+    def _stream_chunks(self, matrix, weights, types, bounds, *args, chunk_size=65536, **kwargs):
+        # SPOTIS does not need column statistics, so `matrix` is read once
+        types = SPOTIS._validate_input_data(matrix, weights, types)
+        weights = np.asarray(weights, dtype=self._float_dtype(matrix))
+        SPOTIS._validate_bounds(bounds)
+        isp = bounds[np.arange(bounds.shape[0]), ((types+1)//2).astype('int')]
+
+        for i in range(0, matrix.shape[0], chunk_size):
+            yield i, SPOTIS._spotis(matrix[i:i + chunk_size].astype(weights.dtype), weights, isp, bounds)
+
+    @staticmethod
+    def _validate_bounds(bounds):
         if np.any(bounds[:, 0] == bounds[:, 1]):
             eq = np.arange(bounds.shape[0])[bounds[:, 0] == bounds[:, 1]]
             raise ValueError(
                     f'Bounds for criteria {eq} are equal. Consider changing min and max values for this criterion, delete this criterion or use another MCDA method.'
                 )
 
-        # Determine Ideal Solution Point based on criteria bounds
-        isp = bounds[np.arange(bounds.shape[0]), ((types+1)//2).astype('int')]
-        return SPOTIS._spotis(matrix, weights, isp, bounds)
-
     @staticmethod
     def _spotis(matrix, weights, isp, bounds):
-        nmatrix = matrix.astype(float)
+        return SPOTIS._spotis_score(SPOTIS._spotis_fit(matrix, isp, bounds), weights)
+
+    @staticmethod
+    def _spotis_fit(matrix, isp, bounds):
+        dtype = matrix.dtype
         # Normalized distances matrix (d_{ij})
-        nmatrix = np.abs((nmatrix - isp)/
-                         (bounds[:,0] - bounds[:,1]))
+        nmatrix = np.abs((matrix - isp.astype(dtype))/
+                         (bounds[:,0] - bounds[:,1]).astype(dtype))
+        return nmatrix
+
+    @staticmethod
+    def _spotis_score(nmatrix, weights, rows=None):
+        if rows is not None:
+            nmatrix = nmatrix[..., rows, :]
+
         # Distances to ISP (smaller means better alt)
-        raw_scores = np.sum(nmatrix * weights, axis=1)
+        raw_scores = SPOTIS._weighted_sum(nmatrix, weights)
         return raw_scores
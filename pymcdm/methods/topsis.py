@@ -6,17 +6,22 @@ from .mcda_method import MCDA_method
 
 
 class TOPSIS(MCDA_method):
-    def __init__(self, normalization_function=normalizations.minmax_normalization):
+    def __init__(self, normalization_function=normalizations.minmax_normalization, dtype=None):
         """Create TOPSIS method object, using normaliztion `normalization_function`.
 
 Parameters
 ----------
     normalization_function : callable
         Function which should be used to normalize `matrix` columns. It should match signature `foo(x, cost)`, where `x` is a vector which should be normalized and `cost` is a bool variable which says if `x` is a cost or profit criterion.
+
+    dtype : None or data-type
+        Floating point type of the computations, e.g. `np.float32`.
+        If None, type of the decision matrix is used (float64 for integer matrices).
 """
         self.normalization = normalization_function
+        self.dtype = dtype
 
-    def __call__(self, matrix, weights, types, *args, **kwargs):
+    def __call__(self, matrix, weights, types, *args, out=None, workspace=None, **kwargs):
         """Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
 Parameters
@@ -27,11 +32,20 @@ Parameters
 
     weights : ndarray
         Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+        Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+        in this case preferences are returned with shape (K, n).
 
     types : ndarray
         Array with definitions of criteria types:
         1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
 
+    out : None or ndarray
+        Array for preferences with shape (n,) or (K, n). If None, new array is created.
+
+    workspace : None or Workspace
+        Workspace with buffers for large intermediate arrays, which are reused between calls.
+        See `pymcdm.methods.Workspace`.
+
     *args and **kwargs are necessary for methods which reqiure some additional data.
 
 Returns
@@ -39,25 +53,107 @@ Returns
     ndarray
         Preference values for alternatives. Better alternatives have higher values.
 """
-        TOPSIS._validate_input_data(matrix, weights, types)
+        types = TOPSIS._validate_input_data(matrix, weights, types)
+        matrix, weights = self._as_float(matrix, weights)
+        nmatrix = TOPSIS._buffer(workspace, 'nmatrix', matrix.shape, matrix.dtype)
+        if self.normalization is not None:
+            nmatrix = normalizations.normalize_matrix(matrix, self.normalization, types, out=nmatrix)
+        else:
+            nmatrix = normalizations.normalize_matrix(matrix, normalizations.minmax_normalization, types, out=nmatrix)
+        state = TOPSIS._topsis_fit(nmatrix, workspace)
+        return TOPSIS._write_out(TOPSIS._topsis_score(state, weights), out)
+
+    def batch(self, matrices, weights, types, *args, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`, with criteria weights `weights` and criteria types `types`.
+
+Parameters
+----------
+    matrices : ndarray
+        Stack of decision matrices with shape (B, n, m).
+        Alternatives are in rows and Criteria are in columns of each matrix.
+
+    weights : ndarray
+        Criteria weights for each problem with shape (B, m).
+
+    types : ndarray
+        Array with definitions of criteria types, shared by all problems:
+        1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+Returns
+-------
+    ndarray
+        Preference values with shape (B, n). Better alternatives have higher values.
+"""
+        types = TOPSIS._validate_batch_input_data(matrices, weights, types)
+        matrices, weights = self._as_float(matrices, weights)
+        if self.normalization is not None:
+            nmatrices = normalizations.normalize_matrix(matrices, self.normalization, types)
+        else:
+            nmatrices = normalizations.normalize_matrix(matrices, normalizations.minmax_normalization, types)
+        return TOPSIS._topsis(nmatrices, weights)
+
+    def fit(self, matrix, types, *args, **kwargs):
+        """Normalize decision matrix `matrix` and compute distances of alternatives to PIS and NIS for each criterion.
+See `MCDA_method.fit` for details.
+"""
+        types = TOPSIS._validate_fit_input_data(matrix, types)
+        matrix = matrix.astype(self._float_dtype(matrix), copy=False)
         if self.normalization is not None:
             nmatrix = normalizations.normalize_matrix(matrix, self.normalization, types)
         else:
-            nmatrix = normalizations.normalize_matrix(matrix, normalization.minmax_normalization, types)
-        return TOPSIS._topsis(nmatrix, weights)
+            nmatrix = normalizations.normalize_matrix(matrix, normalizations.minmax_normalization, types)
+        self._set_fitted(TOPSIS._topsis_fit(nmatrix), matrix.shape[1], matrix.dtype)
+        return self
+
+    def score(self, weights, rows=None, *args, **kwargs):
+        """Rank alternatives from the fitted decision matrix, with criteria weights `weights`.
+See `MCDA_method.score` for details.
+"""
+        return TOPSIS._topsis_score(*self._get_fitted(weights), rows)
+
+    def _stream_chunks(self, matrix, weights, types, *args, chunk_size=65536, **kwargs):
+        types = TOPSIS._validate_input_data(matrix, weights, types)
+        weights = np.asarray(weights, dtype=self._float_dtype(matrix))
+        normalization = self.normalization
+        if normalization is None:
+            normalization = normalizations.minmax_normalization
+        stats = normalizations._chunked_column_stats(matrix, chunk_size)
+
+        # Normalizations are monotone, so PIS and NIS are among normalized extreme values
+        extremes = np.array([stats['min'], stats['max']])
+        extremes = normalizations._normalize_with_stats(extremes, normalization, types, stats, weights.dtype)
+        pis = np.max(extremes, axis=0)
+        nis = np.min(extremes, axis=0)
+
+        for i in range(0, matrix.shape[0], chunk_size):
+            nmatrix = normalizations._normalize_with_stats(matrix[i:i + chunk_size], normalization, types, stats, weights.dtype)
+            yield i, TOPSIS._topsis_score(((nmatrix - pis) ** 2, (nmatrix - nis) ** 2), weights)
 
     @staticmethod
     def _topsis(nmatrix, weights):
-        # Every row of nmatrix is multiplayed by weights
-        weighted_matrix = nmatrix * weights
+        return TOPSIS._topsis_score(TOPSIS._topsis_fit(nmatrix), weights)
 
-        # Vectors of PIS and NIS
-        pis = np.max(weighted_matrix, axis=0)
-        nis = np.min(weighted_matrix, axis=0)
+    @staticmethod
+    def _topsis_fit(nmatrix, workspace=None):
+        # Vectors of PIS and NIS. Weights are non-negative, so PIS and NIS
+        # of the weighted matrix are weighted PIS and NIS of `nmatrix`
+        pis = np.max(nmatrix, axis=-2, keepdims=True)
+        nis = np.min(nmatrix, axis=-2, keepdims=True)
+
+        # Squared distances to PIS and NIS for each criterion
+        Dp2 = np.subtract(nmatrix, pis, out=TOPSIS._buffer(workspace, 'Dp2', nmatrix.shape, nmatrix.dtype))
+        Dm2 = np.subtract(nmatrix, nis, out=TOPSIS._buffer(workspace, 'Dm2', nmatrix.shape, nmatrix.dtype))
+        return np.square(Dp2, out=Dp2), np.square(Dm2, out=Dm2)
+
+    @staticmethod
+    def _topsis_score(state, weights, rows=None):
+        Dp2, Dm2 = state
+        if rows is not None:
+            Dp2, Dm2 = Dp2[..., rows, :], Dm2[..., rows, :]
 
-        # PIS and NIS are substracted from every row of weighted matrix
-        Dp = np.sqrt(np.sum((weighted_matrix - pis) ** 2, axis=1))
-        Dm = np.sqrt(np.sum((weighted_matrix - nis) ** 2, axis=1))
+        # Distances to PIS and NIS, weights are factored out of the squares
+        Dp = np.sqrt(TOPSIS._weighted_sum(Dp2, weights ** 2))
+        Dm = np.sqrt(TOPSIS._weighted_sum(Dm2, weights ** 2))
 
         return Dm / (Dm + Dp)
 
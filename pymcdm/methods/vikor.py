@@ -6,26 +6,34 @@ from .mcda_method import MCDA_method
 
 def _fake_normalization(x, cost=False):
     if cost:
-        return np.max(x) - x
+        return np.max(x, axis=0) - x
     else:
         return x
 
 
 class VIKOR(MCDA_method):
-    def __init__(self, normalization_function=None):
+    # Better alternatives have smaller preference values
+    reverse_ranking = False
+
+    def __init__(self, normalization_function=None, dtype=None):
         """Create VIKOR method object, using normaliztion `normalization_function`.
 
 Parameters
 ----------
     normalization_function : None or callable
         Function which should be used to normalize `matrix` columns. It should match signature `foo(x, cost)`, where `x` is a vector which should be normalized and `cost` is a bool variable which says if `x` is a cost or profit criterion.
+
+    dtype : None or data-type
+        Floating point type of the computations, e.g. `np.float32`.
+        If None, type of the decision matrix is used (float64 for integer matrices).
 """
+        self.dtype = dtype
         if normalization_function is None:
             self.normalization = _fake_normalization
         else:
             self.normalization = normalization_function
 
-    def __call__(self, matrix, weights, types, *args, v=0.5, return_all=False, **kwargs):
+    def __call__(self, matrix, weights, types, *args, v=0.5, return_all=False, out=None, workspace=None, **kwargs):
         """Rank alternatives from decision matrix `matrix`, with criteria weights `weights` and criteria types `types`.
 
 Parameters
@@ -36,6 +44,8 @@ Parameters
 
     weights : ndarray
         Criteria weights. Sum of the weights should be 1. (e.g. sum(weights) == 1)
+        Matrix with shape (K, m) could be passed to evaluate K weight vectors at once,
+        in this case preferences are returned with shape (K, n).
 
     types : ndarray
         Array with definitions of criteria types:
@@ -47,6 +57,13 @@ Parameters
     return_all : bool
         If True, all three ranking (S, R, Q) would be returned.
 
+    out : None or ndarray
+        Array for Q preferences with shape (n,) or (K, n). If None, new array is created.
+
+    workspace : None or Workspace
+        Workspace with buffers for large intermediate arrays, which are reused between calls.
+        See `pymcdm.methods.Workspace`.
+
     *args and **kwargs are necessary for methods which reqiure some additional data.
 
 Returns
@@ -59,14 +76,121 @@ Returns
     ndarray, ndarray, ndarray
         S, R, Q preference values (see VIKOR algorithm explanation).
 """
-        VIKOR._validate_input_data(matrix, weights, types)
+        types = VIKOR._validate_input_data(matrix, weights, types)
+        matrix, weights = self._as_float(matrix, weights)
+        nmatrix = VIKOR._buffer(workspace, 'nmatrix', matrix.shape, matrix.dtype)
+        nmatrix = normalizations.normalize_matrix(matrix, self.normalization, types, out=nmatrix)
+        S, R, Q = VIKOR._vikor_score(VIKOR._vikor_fit(nmatrix, workspace), weights, v, workspace)
+        Q = VIKOR._write_out(Q, out)
+        if return_all:
+            return S, R, Q
+        else:
+            return Q
+
+    def batch(self, matrices, weights, types, *args, v=0.5, return_all=False, **kwargs):
+        """Rank alternatives in a stack of decision problems `matrices`, with criteria weights `weights` and criteria types `types`.
+
+Parameters
+----------
+    matrices : ndarray
+        Stack of decision matrices with shape (B, n, m).
+        Alternatives are in rows and Criteria are in columns of each matrix.
+
+    weights : ndarray
+        Criteria weights for each problem with shape (B, m).
+
+    types : ndarray
+        Array with definitions of criteria types, shared by all problems:
+        1 if criteria is profit and -1 if criteria is cost for each criteria in `matrices`.
+
+    v : float
+        Weight of the strategy (see VIKOR algorithm explanation).
+
+    return_all : bool
+        If True, all three ranking (S, R, Q) would be returned.
+
+Returns
+-------
+    if `return_all` is False
+    ndarray
+        Q preference values with shape (B, n). Better alternatives have smaller values.
+
+    if `return_all` is True
+    ndarray, ndarray, ndarray
+        S, R, Q preference values with shape (B, n) (see VIKOR algorithm explanation).
+"""
+        types = VIKOR._validate_batch_input_data(matrices, weights, types)
+        matrices, weights = self._as_float(matrices, weights)
+        if self.normalization is _fake_normalization:
+            nmatrices = np.where(types == 1, matrices, np.max(matrices, axis=-2, keepdims=True) - matrices)
+        else:
+            nmatrices = normalizations.normalize_matrix(matrices, self.normalization, types)
+        S, R, Q = VIKOR._vikor(nmatrices, weights, v)
+        if return_all:
+            return S, R, Q
+        else:
+            return Q
+
+    def fit(self, matrix, types, *args, **kwargs):
+        """Normalize decision matrix `matrix` and compute normalized distances of alternatives to the best values.
+See `MCDA_method.fit` for details.
+"""
+        types = VIKOR._validate_fit_input_data(matrix, types)
+        matrix = matrix.astype(self._float_dtype(matrix), copy=False)
         nmatrix = normalizations.normalize_matrix(matrix, self.normalization, types)
-        S, R, Q = VIKOR._vikor(nmatrix, weights, v)
+        self._set_fitted(VIKOR._vikor_fit(nmatrix), matrix.shape[1], matrix.dtype)
+        return self
+
+    def score(self, weights, rows=None, *args, v=0.5, return_all=False, **kwargs):
+        """Rank alternatives from the fitted decision matrix, with criteria weights `weights`.
+See `MCDA_method.score` for details, `v` and `return_all` are the same as in `__call__`.
+"""
+        S, R, Q = VIKOR._vikor_score(*self._get_fitted(weights), v)
+        if rows is not None:
+            S, R, Q = S[..., rows], R[..., rows], Q[..., rows]
         if return_all:
             return S, R, Q
         else:
             return Q
 
+    def _stream_chunks(self, matrix, weights, types, *args, v=0.5, chunk_size=65536, **kwargs):
+        # S and R are scaled by their extremes over all alternatives, which are found in one more pass over `matrix`
+        types = VIKOR._validate_input_data(matrix, weights, types)
+        weights = np.asarray(weights, dtype=self._float_dtype(matrix))
+        stats = normalizations._chunked_column_stats(matrix, chunk_size)
+
+        # Normalizations are monotone, so the best and the worst values are among normalized extreme values
+        extremes = self._normalize_chunk(np.array([stats['min'], stats['max']]), types, stats, weights.dtype)
+        fstar = np.max(extremes, axis=0)
+        fminus = np.min(extremes, axis=0)
+        VIKOR._validate_extremes(fstar, fminus)
+
+        def distances(i):
+            nmatrix = self._normalize_chunk(matrix[i:i + chunk_size], types, stats, weights.dtype)
+            return VIKOR._vikor_distances((fstar - nmatrix) / (fstar - fminus), weights)
+
+        n = matrix.shape[0]
+        bounds = None
+        for i in range(0, n, chunk_size):
+            S, R = distances(i)
+            chunk_bounds = [np.min(S, axis=-1, keepdims=True), np.max(S, axis=-1, keepdims=True),
+                            np.min(R, axis=-1, keepdims=True), np.max(R, axis=-1, keepdims=True)]
+            if bounds is None:
+                bounds = chunk_bounds
+            else:
+                bounds = [np.minimum(bounds[0], chunk_bounds[0]), np.maximum(bounds[1], chunk_bounds[1]),
+                          np.minimum(bounds[2], chunk_bounds[2]), np.maximum(bounds[3], chunk_bounds[3])]
+
+        for i in range(0, n, chunk_size):
+            S, R = distances(i)
+            yield i, VIKOR._vikor_q(S, R, *bounds, v)
+
+    def _normalize_chunk(self, x, types, stats, dtype):
+        if self.normalization is _fake_normalization:
+            x = x.astype(dtype)
+            return np.where(types == 1, x, stats['max'].astype(dtype) - x)
+        return normalizations._normalize_with_stats(x, self.normalization, types, stats, dtype)
+
     @staticmethod
     def _vikor(matrix, weights, v=0.5):
         """
@@ -79,25 +203,48 @@ Arguments:
 Returns:
     S, R, Q: Ranking lists
 """
-        fstar = np.max(matrix, axis=0)
-        fminus = np.min(matrix, axis=0)
+        return VIKOR._vikor_score(VIKOR._vikor_fit(matrix), weights, v)
+
+    @staticmethod
+    def _vikor_fit(matrix, workspace=None):
+        fstar = np.max(matrix, axis=-2, keepdims=True)
+        fminus = np.min(matrix, axis=-2, keepdims=True)
+
+        VIKOR._validate_extremes(fstar, fminus)
 
-        if np.any(fstar == fminus):
-            eq = np.arange(fstar.shape[0])[fstar == fminus]
+        ff = np.subtract(fstar, matrix, out=VIKOR._buffer(workspace, 'ff', matrix.shape, matrix.dtype))
+        ff /= fstar - fminus
+        return ff
+
+    @staticmethod
+    def _validate_extremes(fstar, fminus):
+        equal = (fstar == fminus).reshape(-1, fstar.shape[-1])
+        if np.any(equal):
+            eq = np.arange(fstar.shape[-1])[np.any(equal, axis=0)]
             raise ValueError(
                 f'Criteria with indexes {eq} contains equal values for all alternatives. VIKOR method could not be applied in this case. Consider removing this criteria from the decision matrix or use another MCDA method.'
             )
 
-        weighted_ff = weights * ((fstar - matrix)/(fstar - fminus))
-        S = np.sum(weighted_ff, axis=1)
-        R = np.max(weighted_ff, axis=1)
+    @staticmethod
+    def _vikor_score(ff, weights, v=0.5, workspace=None):
+        S, R = VIKOR._vikor_distances(ff, weights, workspace)
+
+        Sstar = np.min(S, axis=-1, keepdims=True)
+        Sminus = np.max(S, axis=-1, keepdims=True)
+        Rstar = np.min(R, axis=-1, keepdims=True)
+        Rminus = np.max(R, axis=-1, keepdims=True)
 
-        Sstar = np.min(S)
-        Sminus = np.max(S)
-        Rstar = np.min(R)
-        Rminus = np.max(R)
+        return S, R, VIKOR._vikor_q(S, R, Sstar, Sminus, Rstar, Rminus, v)
 
-        Q = v * (S - Sstar)/(Sminus - Sstar)\
-          + (1 - v) * (R - Rstar)/(Rminus - Rstar)
+    @staticmethod
+    def _vikor_distances(ff, weights, workspace=None):
+        S = VIKOR._weighted_sum(ff, weights)
+        weighted = weights[..., np.newaxis, :]
+        weighted_ff = VIKOR._buffer(workspace, 'weighted_ff', np.broadcast_shapes(weighted.shape, ff.shape), ff.dtype)
+        R = np.max(np.multiply(weighted, ff, out=weighted_ff), axis=-1)
+        return S, R
 
-        return S, R, Q
+    @staticmethod
+    def _vikor_q(S, R, Sstar, Sminus, Rstar, Rminus, v=0.5):
+        return v * (S - Sstar)/(Sminus - Sstar)\
+             + (1 - v) * (R - Rstar)/(Rminus - Rstar)
@@ -0,0 +1,53 @@
+# Copyright (c) 2021 Andrii Shekhovtsov
+
+import numpy as np
+
+
+class Workspace:
+    def __init__(self):
+        """Create empty workspace for intermediate arrays of the MCDA methods.
+
+Workspace could be passed to the methods as `workspace` argument. Large intermediate arrays
+(normalized matrices, distances etc.) are then stored in the buffers of the workspace, which are
+reused in the next calls with the decision matrix of the same shape and type, so repeated calls
+do not allocate new large arrays. Buffers are reallocated if the shape or type changes.
+
+Workspace should not be shared between threads which evaluate methods at the same time.
+"""
+        self._buffers = {}
+
+    def get(self, name, shape, dtype='float'):
+        """Return buffer `name` with shape `shape` and type `dtype`.
+
+Parameters
+----------
+    name : str
+        Name of the buffer.
+
+    shape : tuple
+        Shape of the buffer.
+
+    dtype : data-type
+        Type of the buffer elements.
+
+Returns
+-------
+    ndarray
+        Uninitialized buffer. It is the same array as in the previous call with the same arguments.
+"""
+        shape = tuple(shape)
+        dtype = np.dtype(dtype)
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buffer
+        return buffer
+
+    def clear(self):
+        """Release all buffers."""
+        self._buffers.clear()
+
+    @property
+    def nbytes(self):
+        """Total size of the buffers in bytes."""
+        return sum(buffer.nbytes for buffer in self._buffers.values())
@@ -3,6 +3,8 @@
 
 import numpy as np
 
+from . import tracing
+
 __all__ = [
     'minmax_normalization',
     'max_normalization',
@@ -12,39 +14,41 @@ __all__ = [
     'linear_normalization',
     'nonlinear_normalization',
     'enhanced_accuracy_normalization',
-    'normalize_matrix'
+    'normalize_matrix',
+    'Normalizer'
 ]
 
 
 def minmax_normalization(x, cost=False):
-    if np.min(x) == np.max(x): # If all values are equal
-        return np.ones(x.shape)
-
+    xmin = np.min(x, axis=0)
+    xmax = np.max(x, axis=0)
+    equal = xmin == xmax # If all values are equal
+    span = np.where(equal, 1, xmax - xmin)
     if cost:
-        return (np.max(x) - x) / (np.max(x) - np.min(x))
-    return (x - np.min(x)) / (np.max(x) - np.min(x))
+        return np.where(equal, 1., (xmax - x) / span)
+    return np.where(equal, 1., (x - xmin) / span)
 
 
 def max_normalization(x, cost=False):
     if cost:
-        return 1 - x/np.max(x)
-    return x / np.max(x)
+        return 1 - x/np.max(x, axis=0)
+    return x / np.max(x, axis=0)
 
 
 def sum_normalization(x, cost=False):
     if cost:
-        return (1/x) / np.sum(1/x)
-    return x / np.sum(x)
+        return (1/x) / np.sum(1/x, axis=0)
+    return x / np.sum(x, axis=0)
 
 
 def vector_normalization(x, cost=False):
     if cost:
-        return 1 - (x / np.sqrt(sum(x ** 2)))
-    return x / np.sqrt(np.sum(x ** 2))
+        return 1 - (x / np.sqrt(np.sum(x ** 2, axis=0)))
+    return x / np.sqrt(np.sum(x ** 2, axis=0))
 
 
 def logaritmic_normalization(x, cost=False):
-    prod = np.prod(x)
+    prod = np.prod(x, axis=0)
     if cost:
         return (1 - (np.log(x) / np.log(prod))) / (x.shape[0] - 1)
     return np.log(x) / np.log(prod)
@@ -52,23 +56,233 @@ def logaritmic_normalization(x, cost=False):
 
 def linear_normalization(x, cost=False):
     if cost:
-        return np.min(x) / x
-    return x / np.max(x)
+        return np.min(x, axis=0) / x
+    return x / np.max(x, axis=0)
 
 
 def nonlinear_normalization(x, cost=False):
     if cost:
-        return (np.min(x) / x) ** 3
-    return (x / np.max(x)) ** 2
+        return (np.min(x, axis=0) / x) ** 3
+    return (x / np.max(x, axis=0)) ** 2
 
 
 def enhanced_accuracy_normalization(x, cost=False):
     if cost:
-        return 1 - (x - np.min(x)) / np.sum(x - np.min(x))
-    return 1 - (np.max(x) - x) / np.sum(np.max(x) - x)
+        return 1 - (x - np.min(x, axis=0)) / np.sum(x - np.min(x, axis=0), axis=0)
+    return 1 - (np.max(x, axis=0) - x) / np.sum(np.max(x, axis=0) - x, axis=0)
+
+
+def _float_dtype(dtype, x):
+    # Floating point type of the computations: `dtype` if it is given, otherwise
+    # the type of `x`, but integer data is computed in float64
+    if dtype is not None:
+        return np.dtype(dtype)
+    dtype = np.asarray(x).dtype
+    return dtype if np.issubdtype(dtype, np.floating) else np.dtype('float')
+
+
+# Matrix-level versions of the normalizations above, signature is foo(x, cost, out).
+# Columns of `x` (or of each matrix in a stack) are normalized at once, statistics
+# are reduced along axis -2 and `cost` is a boolean mask of the cost criteria.
+# Profit and cost formulas are selected with `where`, so `out` could be `x` itself.
+def _minmax_matrix(x, cost, out):
+    xmin = np.min(x, axis=-2, keepdims=True)
+    xmax = np.max(x, axis=-2, keepdims=True)
+    equal = xmin == xmax # If all values are equal
+    span = np.where(equal, 1, xmax - xmin)
+    np.subtract(x, xmin, out=out, where=~cost)
+    np.subtract(xmax, x, out=out, where=cost)
+    np.divide(out, span, out=out)
+    np.copyto(out, 1., where=equal)
+    return out
+
+
+def _max_matrix(x, cost, out):
+    np.divide(x, np.max(x, axis=-2, keepdims=True), out=out)
+    np.subtract(1, out, out=out, where=cost)
+    return out
+
+
+def _sum_matrix(x, cost, out):
+    # Inverses of cost criteria are normalized as profit criteria
+    np.copyto(out, x, where=~cost)
+    np.divide(1, x, out=out, where=cost)
+    np.divide(out, np.sum(out, axis=-2, keepdims=True), out=out)
+    return out
+
+
+def _vector_matrix(x, cost, out):
+    # Sums of squares are computed with `einsum`, without a temporary matrix of squares
+    norms = np.sqrt(np.einsum('...ij,...ij->...j', x, x))[..., np.newaxis, :]
+    np.divide(x, norms, out=out)
+    np.subtract(1, out, out=out, where=cost)
+    return out
+
+
+def _logaritmic_matrix(x, cost, out):
+    logprod = np.log(np.prod(x, axis=-2, keepdims=True))
+    np.log(x, out=out)
+    np.divide(out, logprod, out=out)
+    np.subtract(1, out, out=out, where=cost)
+    np.divide(out, x.shape[-2] - 1, out=out, where=cost)
+    return out
+
+
+def _linear_matrix(x, cost, out):
+    xmin = np.min(x, axis=-2, keepdims=True)
+    xmax = np.max(x, axis=-2, keepdims=True)
+    np.divide(x, xmax, out=out, where=~cost)
+    np.divide(xmin, x, out=out, where=cost)
+    return out
+
+
+def _nonlinear_matrix(x, cost, out):
+    _linear_matrix(x, cost, out)
+    # Cubes are computed as products, which is much faster than `np.power`.
+    # Squares are taken in blocks of rows, so the temporary array stays small
+    # (`out` could be `x`, so cubes could not be computed from `x` itself)
+    block = max(1, 2 ** 13 // max(out.shape[-1], 1))
+    for s in range(0, out.shape[-2], block):
+        rows = out[..., s:s + block, :]
+        np.multiply(rows, np.square(rows), out=rows, where=cost)
+    np.square(out, out=out, where=~cost)
+    return out
+
+
+def _enhanced_accuracy_matrix(x, cost, out):
+    xmin = np.min(x, axis=-2, keepdims=True)
+    xmax = np.max(x, axis=-2, keepdims=True)
+    np.subtract(xmax, x, out=out, where=~cost)
+    np.subtract(x, xmin, out=out, where=cost)
+    np.divide(out, np.sum(out, axis=-2, keepdims=True), out=out)
+    np.subtract(1, out, out=out)
+    return out
+
+
+_MATRIX_NORMALIZATIONS = {
+    minmax_normalization: _minmax_matrix,
+    max_normalization: _max_matrix,
+    sum_normalization: _sum_matrix,
+    vector_normalization: _vector_matrix,
+    logaritmic_normalization: _logaritmic_matrix,
+    linear_normalization: _linear_matrix,
+    nonlinear_normalization: _nonlinear_matrix,
+    enhanced_accuracy_normalization: _enhanced_accuracy_matrix,
+}
+
+
+def _column_stats(x):
+    # One-pass sufficient statistics of the columns of `x`. They are
+    # mergeable (see `_merge_column_stats`), so they could be gathered from
+    # row chunks of a matrix which does not fit in memory.
+    x = np.asarray(x, dtype='float')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'n': x.shape[0],
+            'min': np.min(x, axis=0),
+            'max': np.max(x, axis=0),
+            'sum': np.sum(x, axis=0),
+            'sumsq': np.sum(x ** 2, axis=0),
+            'suminv': np.sum(1 / x, axis=0),
+            'sumlog': np.sum(np.log(x), axis=0),
+        }
+
+
+def _merge_column_stats(a, b):
+    merged = {k: a[k] + b[k] for k in a}
+    merged['min'] = np.minimum(a['min'], b['min'])
+    merged['max'] = np.maximum(a['max'], b['max'])
+    return merged
+
+
+def _chunked_column_stats(matrix, chunk_size):
+    stats = _column_stats(matrix[:chunk_size])
+    for i in range(chunk_size, matrix.shape[0], chunk_size):
+        stats = _merge_column_stats(stats, _column_stats(matrix[i:i + chunk_size]))
+    return stats
+
+
+# Normalizations expressed with column statistics of the whole matrix,
+# signature is foo(x, cost, stats) where `x` could be any row chunk.
+def _minmax_from_stats(x, cost, s):
+    equal = s['min'] == s['max']
+    span = np.where(equal, 1, s['max'] - s['min'])
+    if cost:
+        return np.where(equal, 1., (s['max'] - x) / span)
+    return np.where(equal, 1., (x - s['min']) / span)
+
+
+def _max_from_stats(x, cost, s):
+    if cost:
+        return 1 - x / s['max']
+    return x / s['max']
+
+
+def _sum_from_stats(x, cost, s):
+    if cost:
+        return (1 / x) / s['suminv']
+    return x / s['sum']
 
 
-def normalize_matrix(matrix, method, criteria_types):
+def _vector_from_stats(x, cost, s):
+    if cost:
+        return 1 - x / np.sqrt(s['sumsq'])
+    return x / np.sqrt(s['sumsq'])
+
+
+def _logaritmic_from_stats(x, cost, s):
+    # Logarithm of the product is the sum of logarithms
+    if cost:
+        return (1 - np.log(x) / s['sumlog']) / (s['n'] - 1)
+    return np.log(x) / s['sumlog']
+
+
+def _linear_from_stats(x, cost, s):
+    if cost:
+        return s['min'] / x
+    return x / s['max']
+
+
+def _nonlinear_from_stats(x, cost, s):
+    if cost:
+        return (s['min'] / x) ** 3
+    return (x / s['max']) ** 2
+
+
+def _enhanced_accuracy_from_stats(x, cost, s):
+    if cost:
+        return 1 - (x - s['min']) / (s['sum'] - s['n'] * s['min'])
+    return 1 - (s['max'] - x) / (s['n'] * s['max'] - s['sum'])
+
+
+_FROM_STATS = {
+    minmax_normalization: _minmax_from_stats,
+    max_normalization: _max_from_stats,
+    sum_normalization: _sum_from_stats,
+    vector_normalization: _vector_from_stats,
+    logaritmic_normalization: _logaritmic_from_stats,
+    linear_normalization: _linear_from_stats,
+    nonlinear_normalization: _nonlinear_from_stats,
+    enhanced_accuracy_normalization: _enhanced_accuracy_from_stats,
+}
+
+
+def _normalize_with_stats(x, method, criteria_types, stats, dtype='float'):
+    # Normalize chunk `x` of the matrix, which columns are described by `stats`
+    if method not in _FROM_STATS:
+        raise ValueError(f'Normalization {getattr(method, "__name__", method)} could not be calculated from column statistics. Use one of the normalizations from pymcdm.normalizations.')
+    x = np.asarray(x, dtype=dtype)
+    nx = np.empty(x.shape, dtype=dtype)
+    profit = np.asarray(criteria_types) == 1
+    for mask, cost in ((profit, False), (~profit, True)):
+        if np.any(mask):
+            s = {k: v if np.ndim(v) == 0 else v[mask] for k, v in stats.items()}
+            nx[:, mask] = _FROM_STATS[method](x[:, mask], cost, s)
+    return nx
+
+
+@tracing.traced('normalize')
+def normalize_matrix(matrix, method, criteria_types, dtype=None, out=None):
     """Normalize each column in `matrix`, using `normalization` function according `criteria_types`.
 
 Parameters
@@ -76,40 +290,186 @@ Parameters
     matrix : ndarray
         Decision matrix representation.
         The rows are considered as alternatives and the columns are considered as criteria.
+        A stack of decision matrices with shape (B, n, m) is also accepted, each matrix is normalized independently.
 
     normalization : callable
         Function which should be used for normalize `matrix` columns.
         It should match signature `foo(x, cost)`, where `x` is a vector which would be normalized and `cost` is a bool variable which says if `x` is a cost or profit criteria.
+        Normalizations from this module are applied to all columns at once, other functions are applied to each column.
 
     criteria_types : None or ndarray
         Describes criteria types.
         1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
         If None all criteria are considered as profit
 
+    dtype : None or data-type
+        Floating point type of the normalized matrix, e.g. `np.float32`.
+        If None, type of `matrix` is used for floating point matrices and float64 otherwise.
+
+    out : None or ndarray
+        Array with the same shape as `matrix` for the normalized matrix, its type is used instead of `dtype`.
+        It could be `matrix` itself to normalize it in place.
+
 Returns
 -------
     ndarray
-        Normalized copy of the input matrix.
+        Normalized copy of the input matrix (or `out`).
 
 Raises
 ------
     ValueError
         If `criteria_types` and `matrix` has different number of criteria.
 """
-    if criteria_types is None:
-        nmatrix = matrix.astype('float')
-        for i in range(matrix.shape[1]):
-            nmatrix[:,i] = method(matrix[:,i], cost=False)
-        return nmatrix
-
-    if matrix.shape[1] != len(criteria_types):
-        raise ValueError(f'Matrix has {matrix.shape[1]} criteria and criteria_types has {len(criteria_types)}. This values must be equal.')
-
-    nmatrix = matrix.astype('float')
-    for i, type in enumerate(criteria_types):
-        if type == 1: # If profit
-            nmatrix[:,i] = method(matrix[:,i], cost=False)
+    if criteria_types is not None and matrix.shape[-1] != len(criteria_types):
+        raise ValueError(f'Matrix has {matrix.shape[-1]} criteria and criteria_types has {len(criteria_types)}. This values must be equal.')
+
+    if out is None:
+        out = np.empty(matrix.shape, dtype=_float_dtype(dtype, matrix))
+
+    # Normalizations from this module are applied to all columns at once
+    if method in _MATRIX_NORMALIZATIONS:
+        x = matrix.astype(out.dtype, copy=False)
+        if criteria_types is None:
+            cost = np.zeros(matrix.shape[-1], dtype=bool)
         else:
-            nmatrix[:,i] = method(matrix[:,i], cost=True)
-    return nmatrix
+            cost = np.asarray(criteria_types) != 1
+        return _MATRIX_NORMALIZATIONS[method](x, cost, out)
+
+    if matrix.ndim == 3:
+        for m, nm in zip(matrix, out):
+            normalize_matrix(m, method, criteria_types, out=nm)
+        return out
+
+    # Other functions are applied to each column, in the place of the converted copy
+    np.copyto(out, matrix)
+    for i in range(matrix.shape[1]):
+        cost = criteria_types is not None and criteria_types[i] != 1
+        out[:,i] = method(out[:,i], cost=cost)
+    return out
+
+
+class Normalizer:
+    def __init__(self, normalization, criteria_types=None):
+        """Create normalizer, which normalizes columns of new alternatives with respect to the reference population.
+
+Reference population is described by one-pass statistics of the columns (number of alternatives, min, max,
+sum, sum of squares, sum of reciprocals and sum of logarithms), which are gathered from chunks of rows
+with `partial_fit`. Statistics of normalizers fitted on different parts of the data (e.g. in other processes)
+could be combined with `merge`.
+
+Parameters
+----------
+    normalization : callable
+        One of the normalization functions from this module, e.g. `minmax_normalization`.
+
+    criteria_types : None or ndarray
+        Describes criteria types.
+        1 if criteria is profit and -1 if criteria is cost for each criteria.
+        If None all criteria are considered as profit
+
+Raises
+------
+    ValueError
+        If `normalization` could not be calculated from column statistics.
+"""
+        if normalization not in _FROM_STATS:
+            raise ValueError(f'Normalization {getattr(normalization, "__name__", normalization)} could not be calculated from column statistics. Use one of the normalizations from pymcdm.normalizations.')
+        self.normalization = normalization
+        self.criteria_types = criteria_types
+        self.stats = None
+
+    def partial_fit(self, chunk):
+        """Update statistics of the reference population with alternatives from `chunk`.
+
+Parameters
+----------
+    chunk : ndarray
+        Alternatives in rows and criteria in columns.
+
+Returns
+-------
+    Normalizer
+        The normalizer itself.
+"""
+        chunk = np.asarray(chunk)
+        self._validate(chunk)
+        stats = _column_stats(chunk)
+        self.stats = stats if self.stats is None else _merge_column_stats(self.stats, stats)
+        return self
+
+    def fit(self, matrix, chunk_size=65536):
+        """Replace statistics of the reference population with statistics of `matrix`, which is read in row chunks.
+
+Parameters
+----------
+    matrix : ndarray
+        Alternatives in rows and criteria in columns, e.g. `np.memmap`.
+
+    chunk_size : int
+        Number of rows processed at once.
+
+Returns
+-------
+    Normalizer
+        The normalizer itself.
+"""
+        self._validate(matrix)
+        self.stats = _chunked_column_stats(matrix, chunk_size)
+        return self
+
+    def transform(self, chunk, dtype=None):
+        """Normalize alternatives from `chunk` with respect to the reference population.
+
+Parameters
+----------
+    chunk : ndarray
+        Alternatives in rows and criteria in columns.
+
+    dtype : None or data-type
+        Floating point type of the normalized alternatives.
+        If None, type of `chunk` is used for floating point data and float64 otherwise.
+
+Returns
+-------
+    ndarray
+        Normalized alternatives.
+"""
+        if self.stats is None:
+            raise ValueError('Normalizer is not fitted. Call `partial_fit(chunk)` before `transform(chunk)`.')
+        chunk = np.asarray(chunk)
+        self._validate(chunk)
+        types = self.criteria_types
+        if types is None:
+            types = np.ones(chunk.shape[1])
+        return _normalize_with_stats(chunk, self.normalization, types, self.stats, _float_dtype(dtype, chunk))
+
+    def merge(self, other):
+        """Add statistics of the reference population of `other` normalizer to this one.
+
+Parameters
+----------
+    other : Normalizer
+        Normalizer with the same normalization, fitted on other alternatives.
+
+Returns
+-------
+    Normalizer
+        The normalizer itself.
+"""
+        if other.normalization is not self.normalization:
+            raise ValueError('Only normalizers with the same normalization could be merged.')
+        if other.stats is not None:
+            self._validate_criteria(np.shape(other.stats['min'])[0])
+            self.stats = other.stats if self.stats is None else _merge_column_stats(self.stats, other.stats)
+        return self
+
+    def _validate(self, chunk):
+        if chunk.ndim != 2:
+            raise ValueError(f'Chunk should have 2 dimensions, but has {chunk.ndim}.')
+        self._validate_criteria(chunk.shape[1])
 
+    def _validate_criteria(self, m):
+        if self.criteria_types is not None and m != len(self.criteria_types):
+            raise ValueError(f'Matrix has {m} criteria and criteria_types has {len(self.criteria_types)}. This values must be equal.')
+        if self.stats is not None and m != np.shape(self.stats['min'])[0]:
+            raise ValueError(f'Matrix has {m} criteria and the normalizer was fitted with {np.shape(self.stats["min"])[0]}.')
@@ -0,0 +1,181 @@
+# Copyright (c) 2021 Andrii Shekhovtsov
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+__all__ = [
+    'sample_weights',
+    'smaa'
+]
+
+
+def sample_weights(m, size, bounds=None, rng=None):
+    """Sample weight vectors uniformly from the simplex (weights are non-negative and sum to 1).
+
+    Parameters
+    ----------
+        m : int
+            Number of criteria.
+
+        size : int
+            Number of weight vectors to sample.
+
+        bounds : None or ndarray
+            Each row should contain min and max weight for each criterion.
+            Vectors outside these intervals are rejected, so the sample is uniform
+            on the part of the simplex within the intervals.
+            If None the whole simplex is sampled.
+
+        rng : None, int or numpy.random.Generator
+            Random generator or seed for it.
+
+    Returns
+    -------
+        ndarray
+            Matrix with shape (size, m), one weight vector in each row.
+
+    Raises
+    ------
+        ValueError
+            If no weight vector fulfills `bounds`.
+    """
+    rng = np.random.default_rng(rng)
+    if bounds is None:
+        return _sample_simplex(rng, size, m)
+
+    bounds = np.asarray(bounds, dtype='float')
+    if bounds.shape != (m, 2):
+        raise ValueError(f'Weights bounds should have shape {(m, 2)}, but have shape {bounds.shape}.')
+    if np.sum(bounds[:, 0]) > 1 or np.sum(bounds[:, 1]) < 1 or np.any(bounds[:, 0] > bounds[:, 1]):
+        raise ValueError('Weights bounds are not feasible, there is no weight vector which sums to 1 within them.')
+
+    weights = np.empty((size, m))
+    filled = 0
+    tries = 0
+    while filled < size:
+        candidates = _sample_simplex(rng, max(size - filled, 1000), m)
+        inside = np.all((candidates >= bounds[:, 0]) & (candidates <= bounds[:, 1]), axis=1)
+        accepted = candidates[inside][:size - filled]
+        weights[filled:filled + accepted.shape[0]] = accepted
+        filled += accepted.shape[0]
+
+        tries = tries + 1 if accepted.shape[0] == 0 else 0
+        if tries >= 100:
+            raise ValueError('Weights bounds are too narrow, no weight vector within them was sampled.')
+    return weights
+
+
+def smaa(method, matrix, types, *args, samples=10000, weights_bounds=None,
+         chunk_size=1000, workers=None, seed=None, **kwargs):
+    """Stochastic Multicriteria Acceptability Analysis of alternatives from `matrix` with `method`.
+
+    Weights are sampled uniformly from the simplex (or from the intervals `weights_bounds`)
+    and alternatives are ranked with each weight vector. Samples are evaluated in chunks
+    of `chunk_size` weight vectors, so memory usage does not depend on `samples`.
+
+    Parameters
+    ----------
+        method : MCDA_method
+            Object of the MCDA method, e.g. `TOPSIS()`.
+
+        matrix : ndarray
+            Decision matrix / alternatives data.
+            Alternatives are in rows and Criteria are in columns.
+
+        types : ndarray
+            Array with definitions of criteria types:
+            1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
+
+        samples : int
+            Number of weight vectors to sample.
+
+        weights_bounds : None or ndarray
+            Each row should contain min and max weight for each criterion. See `sample_weights`.
+
+        chunk_size : int
+            Number of weight vectors evaluated at once.
+
+        workers : None or int
+            Number of processes used for evaluation. If None, samples are evaluated in the current process.
+
+        seed : None or int
+            Seed for the random generator. Each chunk of samples gets its own random stream
+            spawned from the seed, so results do not depend on the number of workers.
+
+        *args and **kwargs are passed to the `method.fit`, **kwargs are passed to the `method.score` as well.
+
+    Returns
+    -------
+        ndarray
+            Rank acceptability indices with shape (n, n). Value in row `i` and column `r`
+            is the share of weights for which alternative `i` has position `r + 1` in the ranking.
+
+        ndarray
+            Central weight vectors with shape (n, m), average weights which make alternative `i` the best one.
+            Rows for alternatives which are never the best one are filled with nan.
+
+        ndarray
+            Confidence factors with shape (n,), 1 if alternative is the best one with its central weight vector and 0 otherwise.
+    """
+    method.fit(matrix, types, *args, **kwargs)
+    n, m = matrix.shape
+    ascending = not method.reverse_ranking
+
+    # Every chunk gets own random stream, chunks are shared between workers
+    chunks = [min(chunk_size, samples - i) for i in range(0, samples, chunk_size)]
+    streams = np.random.SeedSequence(seed).spawn(len(chunks))
+    n_tasks = min(workers or 1, len(chunks))
+    tasks = [(method, n, m, chunks[i::n_tasks], streams[i::n_tasks], weights_bounds, ascending, kwargs)
+             for i in range(n_tasks)]
+
+    if workers is None:
+        results = [_smaa_task(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_smaa_task, *zip(*tasks)))
+
+    counts = sum(r[0] for r in results)
+    wsums = sum(r[1] for r in results)
+
+    acceptability = counts / samples
+    with np.errstate(invalid='ignore'):
+        central_weights = wsums / counts[:, :1]
+
+    # Evaluate every alternative with its own central weight vector
+    confidence = np.zeros(n)
+    best = counts[:, 0] > 0
+    if np.any(best):
+        pref = method.score(central_weights[best], **kwargs)
+        ranks = _ranks(pref, ascending)
+        confidence[best] = ranks[np.arange(ranks.shape[0]), np.flatnonzero(best)] == 0
+    return acceptability, central_weights, confidence
+
+
+def _sample_simplex(rng, size, m):
+    # Normalized exponential variables are uniformly distributed on the simplex
+    e = rng.exponential(size=(size, m))
+    return e / np.sum(e, axis=1, keepdims=True)
+
+
+def _ranks(pref, ascending):
+    # Positions (from 0) of alternatives in each row, ties are broken by order
+    order = np.argsort(pref if ascending else -pref, axis=1, kind='stable')
+    ranks = np.empty(order.shape, dtype=int)
+    np.put_along_axis(ranks, order, np.arange(order.shape[1]), axis=1)
+    return ranks
+
+
+def _smaa_task(method, n, m, chunks, streams, weights_bounds, ascending, kwargs):
+    counts = np.zeros((n, n))
+    wsums = np.zeros((n, m))
+    for size, stream in zip(chunks, streams):
+        weights = sample_weights(m, size, weights_bounds, np.random.default_rng(stream))
+        ranks = _ranks(method.score(weights, **kwargs), ascending)
+
+        # Number of times each alternative takes each position
+        counts += np.bincount((np.arange(n) * n + ranks).ravel(), minlength=n * n).reshape(n, n)
+
+        # Sums of weights which make each alternative the best one
+        wsums += (ranks == 0).T @ weights
+    return counts, wsums
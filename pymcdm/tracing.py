@@ -0,0 +1,302 @@
+# Copyright (c) 2021 Andrii Shekhovtsov
+
+"""Tracing of the stages of MCDA methods.
+
+Instrumented functions report named spans:
+    'validate'  - validation of the input data of the methods,
+    'normalize' - `normalizations.normalize_matrix`,
+    'weight'    - weighted sums of criteria values,
+    'aggregate' - evaluation of a method (`__call__`, `batch`, `fit`, `score`, `stream`),
+    'rank'      - `helpers.rankdata`, `top_k`, `rank_of` and the same methods of MCDA methods.
+
+Spans are nested, e.g. 'normalize' span of TOPSIS is a child of its 'aggregate' span.
+Instrumented functions are replaced with measuring wrappers only while there are handlers,
+so tracing adds no overhead when it is disabled.
+
+Examples
+--------
+>>> with tracing.trace() as collector:
+...     TOPSIS()(matrix, weights, types)
+>>> collector.summary()['normalize']['total']
+>>> collector.export('trace.json')
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+import functools
+import inspect
+import sys
+import threading
+import time
+
+import numpy as np
+
+__all__ = [
+    'Span',
+    'Collector',
+    'add_handler',
+    'remove_handler',
+    'trace',
+    'traced'
+]
+
+# Callbacks called with each finished span, tracing is enabled if it is not empty
+_handlers = []
+# Stage names of the instrumented functions and their wrappers
+_instrumented = {}
+_wrappers = {}
+_lock = threading.RLock()
+_local = threading.local()
+
+
+class Span:
+    """Measurements of one call of an instrumented function.
+
+    Attributes
+    ----------
+        name : str
+            Name of the stage, e.g. 'normalize'.
+
+        function : str
+            Qualified name of the instrumented function, e.g. 'TOPSIS.__call__'.
+
+        parent : Span or None
+            Span of the enclosing stage, None for top-level spans.
+
+        start : float
+            Start time, value of `time.perf_counter()`.
+
+        duration : float
+            Wall-clock time of the call in seconds.
+
+        self_time : float
+            Duration without time of the child spans.
+
+        shapes : list
+            Shapes of the array arguments.
+
+        nbytes : int
+            Size in bytes of the arrays returned by the function.
+
+        allocated : int or None
+            Change of the memory traced by `tracemalloc` during the call,
+            None if `tracemalloc` is not tracing.
+    """
+    __slots__ = ('name', 'function', 'parent', 'start', 'duration', 'self_time',
+                 'shapes', 'nbytes', 'allocated', '_children_time')
+
+    def __init__(self, name, function, parent, shapes):
+        self.name = name
+        self.function = function
+        self.parent = parent
+        self.shapes = shapes
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.self_time = 0.0
+        self.nbytes = 0
+        self.allocated = None
+        self._children_time = 0.0
+
+    @property
+    def depth(self):
+        return 0 if self.parent is None else self.parent.depth + 1
+
+    def __repr__(self):
+        return (f'Span({self.name!r}, {self.function!r}, duration={self.duration:.6f}, '
+                f'shapes={self.shapes}, nbytes={self.nbytes})')
+
+
+def add_handler(handler):
+    """Call `handler(span)` for each finished span, until it is removed with `remove_handler`."""
+    with _lock:
+        _handlers.append(handler)
+        if len(_handlers) == 1:
+            _install(True)
+
+
+def remove_handler(handler):
+    """Stop calling `handler` added with `add_handler`."""
+    with _lock:
+        _handlers.remove(handler)
+        if not _handlers:
+            _install(False)
+
+
+@contextmanager
+def trace(handler=None):
+    """Context manager which enables tracing with `handler` inside its block.
+
+    Parameters
+    ----------
+        handler : None or callable
+            Callback called with each finished `Span`. If None, new `Collector` is used.
+
+    Returns
+    -------
+        Context manager which yields the handler.
+    """
+    if handler is None:
+        handler = Collector()
+    add_handler(handler)
+    try:
+        yield handler
+    finally:
+        remove_handler(handler)
+
+
+def traced(name):
+    """Decorator which reports calls of the function as spans named `name`.
+
+    The function is returned unchanged, it is replaced with the measuring wrapper in its
+    module or class while tracing is enabled. Functions which are not accessible by their
+    qualified names (e.g. local functions) are not traced.
+    """
+    def decorator(function):
+        with _lock:
+            _instrumented[function] = name
+            if _handlers:
+                # Defined while tracing is enabled, e.g. module is imported inside `trace` block
+                return _wrapper(function)
+        return function
+    return decorator
+
+
+def _install(enable, functions=None):
+    # Put wrappers (or the original functions) in place of the instrumented functions
+    for function in functions or list(_instrumented):
+        owner = sys.modules.get(function.__module__)
+        *path, attr = function.__qualname__.split('.')
+        for part in path:
+            owner = getattr(owner, part, None)
+        if owner is None or '<locals>' in path:
+            continue
+        current = inspect.getattr_static(owner, attr, None)
+        if (current.__func__ if isinstance(current, staticmethod) else current) not in (function, _wrappers.get(function)):
+            continue
+
+        replacement = _wrapper(function) if enable else function
+        setattr(owner, attr, staticmethod(replacement) if isinstance(current, staticmethod) else replacement)
+
+
+def _wrapper(function):
+    if function not in _wrappers:
+        _wrappers[function] = _wrap(_instrumented[function], function)
+    return _wrappers[function]
+
+
+def _wrap(name, function):
+    # Imported only when tracing is enabled, to keep the import of the package short
+    import tracemalloc
+    qualname = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        shapes = [a.shape for a in args if isinstance(a, np.ndarray)]
+        span = Span(name, qualname, stack[-1] if stack else None, shapes)
+        memory = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        stack.append(span)
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            stack.pop()
+            span.duration = time.perf_counter() - span.start
+            span.self_time = span.duration - span._children_time
+            if span.parent is not None:
+                span.parent._children_time += span.duration
+        if memory is not None and tracemalloc.is_tracing():
+            span.allocated = tracemalloc.get_traced_memory()[0] - memory
+        results = result if isinstance(result, tuple) else (result,)
+        span.nbytes = sum(r.nbytes for r in results if isinstance(r, np.ndarray))
+        for handler in list(_handlers):
+            handler(span)
+        return result
+    return wrapper
+
+
+class Collector:
+    def __init__(self, by='name'):
+        """Handler which aggregates spans by stage.
+
+    Parameters
+    ----------
+        by : str
+            'name' to aggregate spans by the name of the stage or 'function'
+            to aggregate them by the name of the stage and the instrumented function.
+    """
+        if by not in ('name', 'function'):
+            raise ValueError(f"Spans could be aggregated by 'name' or 'function', not {by!r}.")
+        self.by = by
+        self._lock = threading.Lock()
+        self._records = defaultdict(list)
+
+    def __call__(self, span):
+        key = span.name if self.by == 'name' else f'{span.name}: {span.function}'
+        with self._lock:
+            self._records[key].append((span.duration, span.self_time, span.nbytes))
+
+    def clear(self):
+        """Remove all collected spans."""
+        with self._lock:
+            self._records.clear()
+
+    def summary(self):
+        """Statistics of durations of the collected spans.
+
+    Returns
+    -------
+        dict
+            For each stage: number of spans ('count'), total, mean, minimal, maximal and
+            median duration and 90th and 99th percentile of durations in seconds,
+            total self time ('self_total') and total size of returned arrays in bytes ('nbytes').
+    """
+        summary = {}
+        for key, records in self._snapshot().items():
+            duration, self_time, nbytes = np.array(records).T
+            summary[key] = {
+                'count': len(records),
+                'total': float(np.sum(duration)),
+                'mean': float(np.mean(duration)),
+                'min': float(np.min(duration)),
+                'max': float(np.max(duration)),
+                'p50': float(np.percentile(duration, 50)),
+                'p90': float(np.percentile(duration, 90)),
+                'p99': float(np.percentile(duration, 99)),
+                'self_total': float(np.sum(self_time)),
+                'nbytes': int(np.sum(nbytes)),
+            }
+        return summary
+
+    def histograms(self, bins=20):
+        """Histograms of durations of the collected spans, with logarithmically spaced bins.
+
+    Parameters
+    ----------
+        bins : int
+            Number of bins of each histogram.
+
+    Returns
+    -------
+        dict
+            For each stage: 'edges' of the bins in seconds (`bins` + 1 values) and 'counts' of the spans in bins.
+    """
+        histograms = {}
+        for key, records in self._snapshot().items():
+            duration = np.maximum(np.array(records)[:, 0], 1e-9)
+            low, high = np.log10(np.min(duration)), np.log10(np.max(duration))
+            edges = np.logspace(low, max(high, low + 1e-6), bins + 1)
+            counts, edges = np.histogram(duration, bins=edges)
+            histograms[key] = {'edges': edges.tolist(), 'counts': counts.tolist()}
+        return histograms
+
+    def export(self, path, bins=20):
+        """Save summary and histograms of the collected spans to JSON file `path`."""
+        import json
+        with open(path, 'w') as f:
+            json.dump({'summary': self.summary(), 'histograms': self.histograms(bins)}, f, indent=1)
+
+    def _snapshot(self):
+        with self._lock:
+            return {key: list(records) for key, records in self._records.items()}
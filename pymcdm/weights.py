@@ -1,10 +1,10 @@
 # Copyright (c) 2020 Andrii Shekhovtsov
 # Copyright (c) 2021 Bartłomiej Kizielewicz
 
+import inspect
+
 import numpy as np
-from .normalizations import minmax_normalization, sum_normalization, linear_normalization, normalize_matrix
-from .correlations import correlation_matrix, pearson
-from scipy.linalg import null_space
+from .normalizations import minmax_normalization, sum_normalization, linear_normalization, normalize_matrix, _float_dtype
 
 __all__ = [
     'equal_weights',
@@ -16,18 +16,221 @@ __all__ = [
     'idocriw_weights',
     'angle_weights',
     'gini_weights',
-    'variance_weights'
+    'variance_weights',
+    'multiple_weights',
+    'StreamingWeights',
+    'streaming_weights'
 ]
 
 
-def _fake_normalization(x, cost=False):
-    if cost:
-        return np.min(x) / x
-    else:
-        return x
+class _Data:
+    """Decision matrix (or stack of matrices) with intermediate results of the weighting methods.
+
+    Each intermediate result (e.g. normalized matrix or weights of the other method) is
+    calculated by function which takes `_Data` object, once for all methods which need it.
+    """
+
+    def __init__(self, matrix, types, dtype):
+        self.raw = matrix
+        self.types = None if types is None else np.asarray(types)
+        self.dtype = _float_dtype(dtype, matrix)
+        self._shared = {}
+
+    def shared(self, function):
+        if function not in self._shared:
+            self._shared[function] = function(self)
+        return self._shared[function]
+
+
+def _unit_sum(weights):
+    return weights / np.sum(weights, axis=-1, keepdims=True)
+
+
+def _float_matrix(data):
+    return data.raw.astype(data.dtype, copy=False)
+
+
+def _sum_normalized(data):
+    return normalize_matrix(data.raw, sum_normalization, None, data.dtype)
+
+
+def _minmax_normalized(data):
+    return normalize_matrix(data.raw, minmax_normalization, None, data.dtype)
+
+
+def _merec_normalized(data):
+    return normalize_matrix(data.raw, linear_normalization, -data.types, data.dtype)
+
+
+def _cilos_normalized(data):
+    # Cost criteria are converted to profit as min(x) / x, then all criteria are sum normalized
+    nmatrix = data.raw.astype(data.dtype)
+    cost = data.types != 1
+    np.divide(np.min(nmatrix, axis=-2, keepdims=True), nmatrix, out=nmatrix, where=cost)
+    return normalize_matrix(nmatrix, sum_normalization, None, out=nmatrix)
+
 
+def _equal(data):
+    m = data.raw.shape[-1]
+    return np.full(data.raw.shape[:-2] + (m,), 1 / m, dtype=data.dtype)
 
-def equal_weights(matrix, *args, **kwargs):
+
+def _entropy(data):
+    nmatrix = data.shared(_sum_normalized)
+    n = nmatrix.shape[-2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        entropies = -np.sum(nmatrix * np.log(nmatrix), axis=-2)
+    # Entropy of criteria with zero values is 0
+    entropies[np.any(nmatrix == 0, axis=-2)] = 0
+    entropies /= np.log(n)
+    return _unit_sum(1 - entropies)
+
+
+def _standard_deviation(data):
+    std = np.std(data.shared(_float_matrix), axis=-2, ddof=1)
+    return _unit_sum(std)
+
+
+def _merec(data):
+    nmatrix = data.shared(_merec_normalized)
+    m = nmatrix.shape[-1]
+    logs = np.abs(np.log(nmatrix))
+    total = np.sum(logs, axis=-1, keepdims=True)
+    S = np.log(1 + (1/m * total))
+
+    # Removal of criterion j only removes its term from the sum, so performances of
+    # alternatives without each criterion are calculated in place of the logarithms
+    S_prim = np.subtract(total, logs, out=logs)
+    S_prim *= 1/m
+    S_prim += 1
+    np.log(S_prim, out=S_prim)
+    E = np.sum(np.abs(np.subtract(S_prim, S, out=S_prim), out=S_prim), axis=-2)
+    return _unit_sum(E)
+
+
+def _critic(data):
+    nmatrix = data.shared(_minmax_normalized)
+    n = nmatrix.shape[-2]
+    std = np.std(nmatrix, axis=-2, ddof=1, keepdims=True)
+    # Pearson correlations of all pairs of criteria as a product of the standardized matrix
+    z = (nmatrix - np.mean(nmatrix, axis=-2, keepdims=True)) / std
+    coef = np.matmul(np.swapaxes(z, -1, -2), z) / (n - 1)
+    C = std[..., 0, :] * np.sum(1 - coef, axis=-2)
+    return _unit_sum(C)
+
+
+def _cilos_closed_groups(losses, group):
+    m = losses.shape[1]
+    # Criterion j loses importance to criterion i if the best alternative of i is worse than the
+    # best one in j. Graph of these losses goes through the best alternatives (nodes m, m + 1, ...):
+    # criterion j -> best alternative a if j loses importance to its criteria, a -> its criteria
+    a, j = np.nonzero(losses)
+    rows = np.concatenate([j, m + group])
+    cols = np.concatenate([m + a, np.arange(m)])
+
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import connected_components
+    n_nodes = m + losses.shape[0]
+    graph = csr_matrix((np.ones(len(rows), dtype=bool), (rows, cols)), shape=(n_nodes, n_nodes))
+    count, labels = connected_components(graph, directed=True, connection='strong')
+    # Groups of criteria which lose no importance outside are closed classes of the graph
+    leaving = labels[rows] != labels[cols]
+    closed = np.ones(count, dtype=bool)
+    closed[labels[rows[leaving]]] = False
+    return [np.flatnonzero(labels[:m] == label) for label in np.flatnonzero(closed)]
+
+
+def _cilos_vector(nmatrix):
+    n, m = nmatrix.shape
+    best = np.argmax(nmatrix, axis=0)
+    d = nmatrix[best, np.arange(m)]
+    K, group = np.unique(best, return_inverse=True)
+    groups = _cilos_closed_groups(nmatrix[K] < d, group)
+    if len(groups) != 1:
+        raise ValueError(f'CILOS weights are not unique, criteria form {len(groups)} groups which lose no importance '
+                         'to criteria outside the group (e.g. the same alternative is the best in all criteria).')
+
+    # Only criteria from the closed group have non-zero weights
+    C = groups[0]
+    q = np.zeros(m)
+    if len(C) == 1:
+        q[C] = 1
+        return q
+
+    # Weights q are solution of F q = 0, F = P - diag(P.sum(axis=0)), P_ij = (d_j - x[b_i, j]) / d_j,
+    # where b_j is the best alternative in criterion j and d_j = x[b_j, j]. With sum(q) = 1 and
+    # z = x[K] @ (q / d) for the k distinct best alternatives K it is reduced to the k x k system
+    # (I + G) z = c, G = x[K] @ W, c = x[K] @ w, W_ja = w_j if b_j = K[a], w = 1 / (s * d), s = P.sum(axis=0),
+    # then q_j = (1 - z[b_j]) / s_j. It is solved with GMRES, using only products with x[K]
+    d = d[C]
+    K, group = np.unique(best[C], return_inverse=True)
+    x = nmatrix[np.ix_(K, C)].astype(np.float64)
+    s = len(C) - np.bincount(group, minlength=len(K)) @ x / d
+    w = 1 / (s * d)
+
+    from scipy.linalg import solve
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.linalg import LinearOperator, gmres
+    k = len(K)
+    W = csr_matrix((w, (np.arange(len(C)), group)), shape=(len(C), k))
+    c = x @ w
+    system = LinearOperator((k, k), matvec=lambda z: z + x @ (W @ z), dtype=np.float64)
+    # Relative tolerance is called `tol` before SciPy 1.12
+    tolerance = 'rtol' if 'rtol' in inspect.signature(gmres).parameters else 'tol'
+    z, info = gmres(system, c, atol=0, restart=min(k, 50), **{tolerance: 1e-12})
+    if info != 0:
+        # GMRES did not converge, the system is solved directly
+        z = solve(np.eye(k) + x @ W, c)
+    q[C] = (1 - z[group]) / s
+    return q
+
+
+def _cilos(data):
+    nmatrix = data.shared(_cilos_normalized)
+    n, m = nmatrix.shape[-2:]
+    matrices = nmatrix.reshape(-1, n, m)
+    q = np.empty((len(matrices), m), dtype=nmatrix.dtype)
+    for i, matrix in enumerate(matrices):
+        try:
+            q[i] = _cilos_vector(matrix)
+        except ValueError as e:
+            if nmatrix.ndim == 2:
+                raise
+            raise ValueError(f'Matrix {i} in the stack: {e}') from None
+    return _unit_sum(q.reshape(nmatrix.shape[:-2] + (m,)))
+
+
+def _idocriw(data):
+    qW = data.shared(_cilos) * data.shared(_entropy)
+    return _unit_sum(qW)
+
+
+def _angle(data):
+    nmatrix = data.shared(_sum_normalized)
+    n, m = nmatrix.shape[-2:]
+    # Angles between each criterion and the vector with all values equal to 1/m
+    norms = np.sqrt(np.sum(nmatrix ** 2, axis=-2))
+    un = np.arccos(np.sum(nmatrix / m, axis=-2) / (norms * (n ** 0.5 / m)))
+    return _unit_sum(un)
+
+
+def _gini(data):
+    matrix = data.shared(_float_matrix)
+    n = matrix.shape[-2]
+    # Gini coefficient sum(|x_i - x_j|) / (2 n^2 mean(x)) of each column. For sorted values
+    # sum(|x_i - x_j|) = 2 * sum((2k - n + 1) x_k) (0-based k), so it needs only sorting
+    sorted_matrix = np.sort(matrix, axis=-2)
+    coef = (2 * np.arange(n) - n + 1).astype(matrix.dtype)
+    weights = (coef @ sorted_matrix) / (n * np.sum(matrix, axis=-2))
+    return _unit_sum(weights)
+
+
+def _variance(data):
+    var = np.var(data.shared(_minmax_normalized), axis=-2, ddof=1)
+    return _unit_sum(var)
+
+
+def equal_weights(matrix, *args, dtype=None, **kwargs):
     """Calculate equal weights for given `matrix`.
 
 Parameters
@@ -35,17 +238,21 @@ Parameters
     matrix : ndarray
         Decision matrix / alternatives data.
         Alternatives are in rows and Criteria are in columns.
+        A stack of decision matrices with shape (B, n, m) is also accepted.
+
+    dtype : None or data-type
+        Floating point type of the computations, e.g. `np.float32`.
+        If None, type of `matrix` is used (float64 for integer matrices).
 
 Returns
 -------
     ndarray
-        Vector of weights.
+        Vector of weights, or weights of each matrix with shape (B, m) for a stack of matrices.
 """
-    N = matrix.shape[1]
-    return np.ones(N) / N
+    return _equal(_Data(matrix, None, dtype))
 
 
-def entropy_weights(matrix, *args, **kwargs):
+def entropy_weights(matrix, *args, dtype=None, **kwargs):
     """Calculate weights for given `matrix` using entropy method.
 
     Parameters
@@ -53,28 +260,20 @@ def entropy_weights(matrix, *args, **kwargs):
         matrix : ndarray
             Decision matrix / alternatives data.
             Alternatives are in rows and Criteria are in columns.
+            A stack of decision matrices with shape (B, n, m) is also accepted.
+        dtype : None or data-type
+            Floating point type of the computations, e.g. `np.float32`.
+            If None, type of `matrix` is used (float64 for integer matrices).
 
     Returns
     -------
         ndarray
-            Vector of weights.
+            Vector of weights, or weights of each matrix with shape (B, m) for a stack of matrices.
     """
-    m, n = matrix.shape
-    nmatrix = normalize_matrix(matrix, sum_normalization, None)
-    entropies = np.empty(n)
-    # Iterate over all criteria
-    for i, col in enumerate(nmatrix.T):
-        if np.any(col == 0):
-            entropies[i] = 0
-        else:
-            entropies[i] = -np.sum(col * np.log(col))
-    entropies = entropies / np.log(m)
-
-    E = 1 - entropies
-    return E / np.sum(E)
-
-
-def standard_deviation_weights(matrix, *args, **kwargs):
+    return _entropy(_Data(matrix, None, dtype))
+
+
+def standard_deviation_weights(matrix, *args, dtype=None, **kwargs):
     """Calculate weights for given `matrix` using std method.
 
     Parameters
@@ -82,17 +281,20 @@ def standard_deviation_weights(matrix, *args, **kwargs):
         matrix : ndarray
             Decision matrix / alternatives data.
             Alternatives are in rows and Criteria are in columns.
+            A stack of decision matrices with shape (B, n, m) is also accepted.
+        dtype : None or data-type
+            Floating point type of the computations, e.g. `np.float32`.
+            If None, type of `matrix` is used (float64 for integer matrices).
 
     Returns
     -------
         ndarray
-            Vector of weights.
+            Vector of weights, or weights of each matrix with shape (B, m) for a stack of matrices.
     """
-    std = np.std(matrix, axis=0, ddof=1)
-    return std / np.sum(std)
+    return _standard_deviation(_Data(matrix, None, dtype))
 
 
-def merec_weights(matrix, types, *args, **kwargs):
+def merec_weights(matrix, types, *args, dtype=None, **kwargs):
     """Calculate weights for given `matrix` using MEREC method.
 
     Parameters
@@ -100,27 +302,23 @@ def merec_weights(matrix, types, *args, **kwargs):
         matrix : ndarray
             Decision matrix / alternatives data.
             Alternatives are in rows and Criteria are in columns.
+            A stack of decision matrices with shape (B, n, m) is also accepted.
         types : ndarray
             Array with definitions of criteria types:
             1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
+        dtype : None or data-type
+            Floating point type of the computations, e.g. `np.float32`.
+            If None, type of `matrix` is used (float64 for integer matrices).
 
     Returns
     -------
         ndarray
-            Vector of weights.
+            Vector of weights, or weights of each matrix with shape (B, m) for a stack of matrices.
     """
-    n, m = matrix.shape
-    nmatrix = normalize_matrix(matrix, linear_normalization, -types)
-    S = np.log(1 + (1/m * np.sum(np.abs(np.log(nmatrix)), axis=1)))
-    S_prim = np.zeros(nmatrix.shape)
-    for j in range(m):
-        ex_nmatrix = np.delete(nmatrix, j, axis=1)
-        S_prim[:, j] = np.log(1 + (1/m * np.sum(np.abs(np.log(ex_nmatrix)), axis=1)))
-    E = np.sum(np.abs(S_prim.T - S), axis=1)
-    return E / np.sum(E)
-
-
-def critic_weights(matrix, *args, **kwargs):
+    return _merec(_Data(matrix, types, dtype))
+
+
+def critic_weights(matrix, *args, dtype=None, **kwargs):
     """Calculate weights for given `matrix` using CRITIC method.
 
     Parameters
@@ -128,20 +326,20 @@ def critic_weights(matrix, *args, **kwargs):
         matrix : ndarray
             Decision matrix / alternatives data.
             Alternatives are in rows and Criteria are in columns.
+            A stack of decision matrices with shape (B, n, m) is also accepted.
+        dtype : None or data-type
+            Floating point type of the computations, e.g. `np.float32`.
+            If None, type of `matrix` is used (float64 for integer matrices).
 
     Returns
     -------
         ndarray
-            Vector of weights.
+            Vector of weights, or weights of each matrix with shape (B, m) for a stack of matrices.
     """
-    nmatrix = normalize_matrix(matrix, minmax_normalization, None)
-    std = np.std(nmatrix, axis=0, ddof=1)
-    coef = correlation_matrix(nmatrix, pearson, True)
-    C = std * np.sum(1 - coef, axis=0)
-    return C / np.sum(C)
+    return _critic(_Data(matrix, None, dtype))
 
 
-def cilos_weights(matrix, types, *args, **kwargs):
+def cilos_weights(matrix, types, *args, dtype=None, **kwargs):
     """Calculate weights for given `matrix` using CILOS method.
 
     Parameters
@@ -149,25 +347,29 @@ def cilos_weights(matrix, types, *args, **kwargs):
         matrix : ndarray
             Decision matrix / alternatives data.
             Alternatives are in rows and Criteria are in columns.
+            A stack of decision matrices with shape (B, n, m) is also accepted.
         types : ndarray
             Array with definitions of criteria types:
             1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
+        dtype : None or data-type
+            Floating point type of the computations, e.g. `np.float32`.
+            If None, type of `matrix` is used (float64 for integer matrices).
 
     Returns
     -------
         ndarray
-            Vector of weights.
+            Vector of weights, or weights of each matrix with shape (B, m) for a stack of matrices.
+
+    Raises
+    ------
+        ValueError
+            If weights are not unique, i.e. criteria form several groups which lose no importance
+            to criteria outside the group (e.g. the same alternative is the best in all criteria).
     """
-    nmatrix = normalize_matrix(matrix, _fake_normalization, types)
-    nmatrix = normalize_matrix(nmatrix, sum_normalization, None)
-    A = nmatrix[np.argmax(nmatrix, axis=0)]
-    P = (np.diag(A) - A) / np.diag(A)
-    F = P - np.diag(np.sum(P, axis=0))
-    q = null_space(F)
-    return (q / np.sum(q)).flatten()
+    return _cilos(_Data(matrix, types, dtype))
 
 
-def idocriw_weights(matrix, types, *args, **kwargs):
+def idocriw_weights(matrix, types, *args, dtype=None, **kwargs):
     """Calculate weights for given `matrix` using IDOCRIW method.
 
     Parameters
@@ -175,21 +377,29 @@ def idocriw_weights(matrix, types, *args, **kwargs):
         matrix : ndarray
             Decision matrix / alternatives data.
             Alternatives are in rows and Criteria are in columns.
+            A stack of decision matrices with shape (B, n, m) is also accepted.
         types : ndarray
             Array with definitions of criteria types:
             1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
+        dtype : None or data-type
+            Floating point type of the computations, e.g. `np.float32`.
+            If None, type of `matrix` is used (float64 for integer matrices).
 
     Returns
     -------
         ndarray
-            Vector of weights.
+            Vector of weights, or weights of each matrix with shape (B, m) for a stack of matrices.
+
+    Raises
+    ------
+        ValueError
+            If weights are not unique, i.e. criteria form several groups which lose no importance
+            to criteria outside the group (e.g. the same alternative is the best in all criteria).
     """
-    W = entropy_weights(matrix)
-    q = cilos_weights(matrix, types)
-    return (q * W) / np.sum(q * W, axis=0)
+    return _idocriw(_Data(matrix, types, dtype))
 
 
-def angle_weights(matrix, *args, **kwargs):
+def angle_weights(matrix, *args, dtype=None, **kwargs):
     """Calculate weights for given `matrix` using angle method.
 
     Parameters
@@ -197,22 +407,20 @@ def angle_weights(matrix, *args, **kwargs):
         matrix : ndarray
             Decision matrix / alternatives data.
             Alternatives are in rows and Criteria are in columns.
+            A stack of decision matrices with shape (B, n, m) is also accepted.
+        dtype : None or data-type
+            Floating point type of the computations, e.g. `np.float32`.
+            If None, type of `matrix` is used (float64 for integer matrices).
 
     Returns
     -------
         ndarray
-            Vector of weights.
+            Vector of weights, or weights of each matrix with shape (B, m) for a stack of matrices.
     """
-    nmatrix = normalize_matrix(matrix, sum_normalization, None)
-    n, m = nmatrix.shape
-    un = np.zeros(m)
-    add_col = np.ones(n) * 1 / m
-    for i, vec in enumerate(nmatrix.T):
-        un[i] = np.arccos(np.sum(vec / m) / (np.sqrt(np.sum(vec ** 2)) * np.sqrt(np.sum(add_col ** 2))))
-    return un / np.sum(un)
+    return _angle(_Data(matrix, None, dtype))
 
 
-def gini_weights(matrix, *args, **kwargs):
+def gini_weights(matrix, *args, dtype=None, **kwargs):
     """Calculate weights for given `matrix` using gini method.
 
     Parameters
@@ -220,23 +428,20 @@ def gini_weights(matrix, *args, **kwargs):
         matrix : ndarray
             Decision matrix / alternatives data.
             Alternatives are in rows and Criteria are in columns.
+            A stack of decision matrices with shape (B, n, m) is also accepted.
+        dtype : None or data-type
+            Floating point type of the computations, e.g. `np.float32`.
+            If None, type of `matrix` is used (float64 for integer matrices).
 
     Returns
     -------
         ndarray
-            Vector of weights.
+            Vector of weights, or weights of each matrix with shape (B, m) for a stack of matrices.
     """
-    n, m = matrix.shape
-    weights = np.zeros(m)
-    for i in range(m):
-        values = np.zeros(n)
-        for j in range(n):
-            values[j] = np.sum(np.abs(matrix[j, i] - matrix[:, i]) / (2 * n ** 2 * (np.sum(matrix[:, i]) / n)))
-        weights[i] = np.sum(values)
-    return weights / np.sum(weights)
+    return _gini(_Data(matrix, None, dtype))
 
 
-def variance_weights(matrix, *args, **kwargs):
+def variance_weights(matrix, *args, dtype=None, **kwargs):
     """Calculate weights for given `matrix` using std method.
 
     Parameters
@@ -244,12 +449,314 @@ def variance_weights(matrix, *args, **kwargs):
         matrix : ndarray
             Decision matrix / alternatives data.
             Alternatives are in rows and Criteria are in columns.
+            A stack of decision matrices with shape (B, n, m) is also accepted.
+        dtype : None or data-type
+            Floating point type of the computations, e.g. `np.float32`.
+            If None, type of `matrix` is used (float64 for integer matrices).
 
     Returns
     -------
         ndarray
-            Vector of weights.
+            Vector of weights, or weights of each matrix with shape (B, m) for a stack of matrices.
+    """
+    return _variance(_Data(matrix, None, dtype))
+
+
+_KERNELS = {
+    equal_weights: (_equal, False),
+    entropy_weights: (_entropy, False),
+    standard_deviation_weights: (_standard_deviation, False),
+    merec_weights: (_merec, True),
+    critic_weights: (_critic, False),
+    cilos_weights: (_cilos, True),
+    idocriw_weights: (_idocriw, True),
+    angle_weights: (_angle, False),
+    gini_weights: (_gini, False),
+    variance_weights: (_variance, False),
+}
+
+
+def multiple_weights(matrix, methods, types=None, dtype=None):
+    """Calculate weights for given `matrix` with several weighting methods.
+
+    Intermediate results are shared between the methods: e.g. sum normalized matrix is
+    calculated once for entropy and angle methods, min-max normalized matrix once for CRITIC
+    and variance methods, and IDOCRIW reuses entropy and CILOS weights.
+
+    Parameters
+    ----------
+        matrix : ndarray
+            Decision matrix / alternatives data.
+            Alternatives are in rows and Criteria are in columns.
+            A stack of decision matrices with shape (B, n, m) is also accepted.
+        methods : iterable of callable
+            Weighting functions from this module, e.g. `[entropy_weights, angle_weights]`.
+        types : None or ndarray
+            Array with definitions of criteria types:
+            1 if criteria is profit and -1 if criteria is cost for each criteria in `matrix`.
+            Required by MEREC, CILOS and IDOCRIW methods.
+        dtype : None or data-type
+            Floating point type of the computations, e.g. `np.float32`.
+            If None, type of `matrix` is used (float64 for integer matrices).
+
+    Returns
+    -------
+        dict
+            Weights calculated by each method, by function name.
+
+    Raises
+    ------
+        ValueError
+            If method is not a weighting function from this module or `types` are required and not given.
+    """
+    data = _Data(matrix, types, dtype)
+    weights = {}
+    for method in methods:
+        if method not in _KERNELS:
+            raise ValueError(f'{method!r} is not a weighting function from pymcdm.weights.')
+        kernel, needs_types = _KERNELS[method]
+        if needs_types and types is None:
+            raise ValueError(f'{method.__name__} requires criteria types.')
+        weights[method.__name__] = data.shared(kernel)
+    return weights
+
+
+def _moment_stats(x, comoments):
+    # One-pass sufficient statistics of the columns of the row chunk `x`, which are
+    # mergeable (see `_merge_moment_stats`). Moments are kept as means and sums of
+    # squared deviations (and their products for CRITIC) to avoid cancellation.
+    x = np.asarray(x, dtype='float')
+    mean = np.mean(x, axis=0)
+    dev = x - mean
+    zero = x == 0
+    stats = {
+        'n': x.shape[0],
+        'min': np.min(x, axis=0),
+        'max': np.max(x, axis=0),
+        'sum': np.sum(x, axis=0),
+        'sumsq': np.sum(x ** 2, axis=0),
+        'sumxlogx': np.sum(x * np.log(np.where(zero, 1, x)), axis=0),
+        'zeros': np.sum(zero, axis=0),
+        'mean': mean,
+        'm2': np.sum(dev ** 2, axis=0),
+    }
+    if comoments:
+        stats['comoments'] = dev.T @ dev
+    return stats
+
+
+def _merge_moment_stats(a, b):
+    # Pairwise update of the moments (Chan et al.)
+    n = a['n'] + b['n']
+    delta = b['mean'] - a['mean']
+    merged = {k: a[k] + b[k] for k in ('n', 'sum', 'sumsq', 'sumxlogx', 'zeros', 'm2')}
+    merged['min'] = np.minimum(a['min'], b['min'])
+    merged['max'] = np.maximum(a['max'], b['max'])
+    merged['mean'] = a['mean'] + delta * (b['n'] / n)
+    merged['m2'] += delta ** 2 * (a['n'] * b['n'] / n)
+    if 'comoments' in a and 'comoments' in b:
+        merged['comoments'] = a['comoments'] + b['comoments'] + np.outer(delta, delta) * (a['n'] * b['n'] / n)
+    return merged
+
+
+def _minmax_span(s):
+    # Spans of min-max normalized columns, columns with all values equal are normalized to ones
+    equal = s['min'] == s['max']
+    return np.where(equal, 1, s['max'] - s['min']), equal
+
+
+def _entropy_from_stats(s):
+    # Entropy of sum normalized column p = x / S is log(S) - sum(x log(x)) / S
+    entropies = np.log(s['sum']) - s['sumxlogx'] / s['sum']
+    entropies[s['zeros'] > 0] = 0
+    entropies /= np.log(s['n'])
+    return _unit_sum(1 - entropies)
+
+
+def _standard_deviation_from_stats(s):
+    return _unit_sum(np.sqrt(s['m2'] / (s['n'] - 1)))
+
+
+def _variance_from_stats(s):
+    span, equal = _minmax_span(s)
+    var = np.where(equal, 0, s['m2'] / (s['n'] - 1) / span ** 2)
+    return _unit_sum(var)
+
+
+def _critic_from_stats(s):
+    # Min-max normalization only shifts and scales the columns, so correlations are the same as of the raw data
+    span, equal = _minmax_span(s)
+    std = np.where(equal, 0, np.sqrt(s['m2'] / (s['n'] - 1)) / span)
+    coef = s['comoments'] / np.sqrt(np.outer(s['m2'], s['m2']))
+    C = std * np.sum(1 - coef, axis=0)
+    return _unit_sum(C)
+
+
+def _angle_from_stats(s):
+    n, m = s['n'], len(s['sum'])
+    norms = np.sqrt(s['sumsq'] / s['sum'] ** 2)
+    un = np.arccos((s['sum'] / s['sum'] / m) / (norms * (n ** 0.5 / m)))
+    return _unit_sum(un)
+
+
+_FROM_STATS = {
+    entropy_weights: _entropy_from_stats,
+    standard_deviation_weights: _standard_deviation_from_stats,
+    variance_weights: _variance_from_stats,
+    critic_weights: _critic_from_stats,
+    angle_weights: _angle_from_stats,
+}
+
+
+class StreamingWeights:
+    def __init__(self, methods=None):
+        """Create object which calculates objective weights from one-pass statistics of the decision matrix.
+
+        Statistics of the columns (number of alternatives, min, max, sum, sum of squares, sum of x log(x),
+        number of zeros, mean and sum of squared deviations) are gathered from chunks of rows with
+        `partial_fit`, so weights of a matrix which does not fit in memory are calculated in one pass.
+        Statistics gathered from different parts of the data (e.g. in other processes) could be combined
+        with `merge`. Statistics are gathered in float64.
+
+        Parameters
+        ----------
+            methods : None or iterable of callable
+                Weighting functions which would be calculated: `entropy_weights`, `standard_deviation_weights`,
+                `variance_weights`, `critic_weights` or `angle_weights`. If None all of them are used.
+                Co-moment matrix of criteria (m x m) is gathered only for `critic_weights`.
+
+        Raises
+        ------
+            ValueError
+                If weights of some method could not be calculated from the statistics.
+        """
+        methods = list(_FROM_STATS) if methods is None else list(methods)
+        for method in methods:
+            if method not in _FROM_STATS:
+                raise ValueError(f'Weights {getattr(method, "__name__", method)} could not be calculated from column statistics. '
+                                 f'Use one of: {", ".join(f.__name__ for f in _FROM_STATS)}.')
+        self.methods = methods
+        self.stats = None
+        self.dtype = None
+
+    def partial_fit(self, chunk):
+        """Update statistics with alternatives from `chunk`.
+
+        Parameters
+        ----------
+            chunk : ndarray
+                Alternatives in rows and criteria in columns.
+
+        Returns
+        -------
+            StreamingWeights
+                The object itself.
+        """
+        chunk = np.asarray(chunk)
+        self._validate(chunk)
+        stats = _moment_stats(chunk, critic_weights in self.methods)
+        self.stats = stats if self.stats is None else _merge_moment_stats(self.stats, stats)
+        self._update_dtype(_float_dtype(None, chunk))
+        return self
+
+    def fit(self, matrix, chunk_size=65536):
+        """Replace statistics with statistics of `matrix`, which is read in row chunks.
+
+        Parameters
+        ----------
+            matrix : ndarray
+                Alternatives in rows and criteria in columns, e.g. `np.memmap`.
+            chunk_size : int
+                Number of rows processed at once.
+
+        Returns
+        -------
+            StreamingWeights
+                The object itself.
+        """
+        self.stats = None
+        self.dtype = None
+        for i in range(0, matrix.shape[0], chunk_size):
+            self.partial_fit(matrix[i:i + chunk_size])
+        return self
+
+    def merge(self, other):
+        """Add statistics of `other` object to this one.
+
+        Parameters
+        ----------
+            other : StreamingWeights
+                Object fitted on other alternatives with the same criteria.
+
+        Returns
+        -------
+            StreamingWeights
+                The object itself.
+        """
+        if other.stats is not None:
+            self._validate_criteria(len(other.stats['sum']))
+            if critic_weights in self.methods and 'comoments' not in other.stats:
+                raise ValueError('Statistics for critic_weights could be merged only with other statistics for critic_weights.')
+            self.stats = other.stats if self.stats is None else _merge_moment_stats(self.stats, other.stats)
+            self._update_dtype(other.dtype)
+        return self
+
+    def weights(self, method, dtype=None):
+        """Calculate weights of all alternatives seen so far with `method`.
+
+        Parameters
+        ----------
+            method : callable
+                One of the weighting functions given at creation, e.g. `entropy_weights`.
+            dtype : None or data-type
+                Floating point type of the weights, e.g. `np.float32`.
+                If None, type of the data is used (float64 for integer matrices).
+
+        Returns
+        -------
+            ndarray
+                Vector of weights, the same as `method` calculated for the whole matrix.
+        """
+        if self.stats is None:
+            raise ValueError('StreamingWeights is not fitted. Call `partial_fit(chunk)` before `weights(method)`.')
+        if method not in self.methods:
+            raise ValueError(f'Statistics for {getattr(method, "__name__", method)} were not gathered.')
+        return _FROM_STATS[method](self.stats).astype(self.dtype if dtype is None else dtype, copy=False)
+
+    def _update_dtype(self, dtype):
+        self.dtype = dtype if self.dtype is None else np.promote_types(self.dtype, dtype)
+
+    def _validate(self, chunk):
+        if chunk.ndim != 2:
+            raise ValueError(f'Chunk should have 2 dimensions, but has {chunk.ndim}.')
+        self._validate_criteria(chunk.shape[1])
+
+    def _validate_criteria(self, m):
+        if self.stats is not None and m != len(self.stats['sum']):
+            raise ValueError(f'Matrix has {m} criteria and the statistics were gathered for {len(self.stats["sum"])}.')
+
+
+def streaming_weights(matrix, methods=None, chunk_size=65536, dtype=None):
+    """Calculate weights for given `matrix` with several weighting methods, in one pass over row chunks.
+
+    Parameters
+    ----------
+        matrix : ndarray
+            Decision matrix / alternatives data, e.g. `np.memmap` which does not fit in memory.
+            Alternatives are in rows and Criteria are in columns.
+        methods : None or iterable of callable
+            Weighting functions: `entropy_weights`, `standard_deviation_weights`, `variance_weights`,
+            `critic_weights` or `angle_weights`. If None all of them are used.
+        chunk_size : int
+            Number of rows processed at once.
+        dtype : None or data-type
+            Floating point type of the weights, e.g. `np.float32`.
+            If None, type of `matrix` is used (float64 for integer matrices).
+
+    Returns
+    -------
+        dict
+            Weights calculated by each method, by function name.
     """
-    nmatrix = normalize_matrix(matrix, minmax_normalization, None)
-    var = np.var(nmatrix, axis=0, ddof=1)
-    return var / np.sum(var)
\ No newline at end of file
+    streaming = StreamingWeights(methods).fit(matrix, chunk_size)
+    return {method.__name__: streaming.weights(method, dtype) for method in streaming.methods}
@@ -22,6 +22,9 @@ setuptools.setup(
     install_requires=[
         'numpy',
         'scipy'
-    ]
+    ],
+    extras_require={
+        'jit': ['numba']
+    }
 )
 